@@ -11,6 +11,7 @@ import sys
 import asyncio
 import json
 import tempfile
+import zipfile
 from pathlib import Path
 
 # Add the project root to the Python path
@@ -124,6 +125,62 @@ async def test_enhanced_tools_async_support():
         if os.path.exists(tmp_path):
             os.unlink(tmp_path)
 
+async def test_live_get_text_plain():
+    """Test get_text's plain-text path on Flat OPC content from a live document."""
+    print("🧪 Testing Live get_text Plain-Text Path...")
+    
+    # Build the Flat OPC package the Add-in would send for a two-paragraph document
+    with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as tmp_file:
+        tmp_path = tmp_file.name
+    
+    session_manager = get_session_manager()
+    original_send = session_manager.send_live_request
+    try:
+        doc = Document()
+        doc.add_paragraph("First live paragraph")
+        para = doc.add_paragraph("Second ")
+        para.add_run("live").bold = True
+        para.add_run("\tparagraph")
+        doc.save(tmp_path)
+        
+        with zipfile.ZipFile(tmp_path) as zf:
+            document_xml = zf.read("word/document.xml").decode("utf-8")
+        document_xml = document_xml.split("?>", 1)[1] if document_xml.startswith("<?xml") else document_xml
+        flat_opc = (
+            '<pkg:package xmlns:pkg="http://schemas.microsoft.com/office/2006/xmlPackage">'
+            '<pkg:part pkg:name="/word/document.xml" pkg:contentType='
+            '"application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml">'
+            f'<pkg:xmlData>{document_xml}</pkg:xmlData></pkg:part></pkg:package>'
+        )
+        
+        result = session_manager.open_document("live_text_doc", tmp_path)
+        assert "Successfully opened" in result, f"Failed to open document: {result}"
+        session_manager.register_live_connection("live_text_doc", object())
+        
+        # Answer the Add-in request without a real WebSocket
+        async def fake_send_live_request(document_id, command, **kwargs):
+            assert command == "get_full_content", f"Unexpected live command: {command}"
+            return {"content": flat_opc}
+        session_manager.send_live_request = fake_send_live_request
+        
+        result = await get_text(document_id="live_text_doc", scope="all")
+        expected = "\n".join(p.text for p in Document(tmp_path).paragraphs)
+        assert result == expected, f"Live plain text mismatch: {result!r} != {expected!r}"
+        
+        print("✅ Live get_text returns the paragraph text of Flat OPC content")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Live get_text test failed: {e}")
+        return False
+        
+    finally:
+        session_manager.send_live_request = original_send
+        if session_manager.get_document("live_text_doc"):
+            session_manager.close_document("live_text_doc")
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
 def test_websocket_imports():
     """Test that WebSocket-related imports work."""
     print("🧪 Testing WebSocket Imports...")
@@ -184,6 +241,7 @@ async def run_all_tests():
         ("Session Manager Live Capabilities", test_session_manager_live_capabilities),
         ("DocumentHandle Extensions", test_document_handle_extensions),
         ("Enhanced Tools Async Support", test_enhanced_tools_async_support),
+        ("Live get_text Plain-Text Path", test_live_get_text_plain),
         ("WebSocket Imports", test_websocket_imports),
         ("Word Add-in Structure", test_word_addin_structure),
     ]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Regression script for merging documents that carry comments.
+Merges sources with comment markers through merge_documents and checks that every
+comment anchor in the merged body still points at exactly one comment in the merged
+package, instead of at a comment from another source.
+"""
+
+import asyncio
+import os
+import re
+import shutil
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from docx import Document
+
+# Add the project directory to Python path
+project_dir = Path(__file__).parent
+sys.path.insert(0, str(project_dir))
+
+from word_document_server.tools.document_tools import merge_documents
+
+COMMENT_REF = re.compile(r'<w:commentReference w:id="(\d+)"')
+COMMENT_DEF = re.compile(r'<w:comment w:id="(\d+)"')
+
+
+def create_commented_document(filename, label):
+    """Create a one-paragraph document with a comment on its text."""
+    doc = Document()
+    paragraph = doc.add_paragraph(f"{label} paragraph with a comment")
+    doc.add_comment(paragraph.runs, text=f"Comment on {label}", author="Reviewer", initials="R")
+    doc.add_paragraph(f"{label} closing paragraph")
+    doc.save(filename)
+
+
+def check_comment_anchors(filename):
+    """Return a list of problems with the comment anchors of a document."""
+    with zipfile.ZipFile(filename) as zf:
+        document_xml = zf.read('word/document.xml').decode('utf-8')
+        names = zf.namelist()
+        comments_xml = zf.read('word/comments.xml').decode('utf-8') if 'word/comments.xml' in names else ''
+
+    problems = []
+    refs = COMMENT_REF.findall(document_xml)
+    defined = set(COMMENT_DEF.findall(comments_xml))
+    duplicates = sorted({r for r in refs if refs.count(r) > 1})
+    if duplicates:
+        problems.append(f"comment ids referenced more than once: {duplicates}")
+    dangling = sorted(set(refs) - defined)
+    if dangling:
+        problems.append(f"comment ids with no comment in the package: {dangling}")
+    return problems
+
+
+def run_case(workdir, name, sources):
+    """Merge the given sources and report whether the comment anchors survived intact."""
+    target = os.path.join(workdir, f"{name}_merged.docx")
+    result = asyncio.run(merge_documents(target, sources))
+    print(f"{name}: {result}")
+
+    problems = check_comment_anchors(target)
+    texts = [p.text for p in Document(target).paragraphs if p.text]
+    print(f"  Paragraphs: {texts}")
+    for problem in problems:
+        print(f"  FAIL: {problem}")
+    if not problems:
+        print("  OK: every comment anchor resolves to a single comment")
+    return not problems
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="merge_comments_")
+    try:
+        first = os.path.join(workdir, "first.docx")
+        second = os.path.join(workdir, "second.docx")
+        create_commented_document(first, "First")
+        create_commented_document(second, "Second")
+
+        # A byte-identical copy shares the comments part, so only the markers in
+        # the body can tell the zip-level merge to stand down
+        copy = os.path.join(workdir, "copy.docx")
+        shutil.copyfile(first, copy)
+
+        results = [
+            run_case(workdir, "identical_sources", [first, copy]),
+            run_case(workdir, "different_comments", [first, second]),
+        ]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    if all(results):
+        print("ALL MERGE COMMENT CHECKS PASSED")
+    else:
+        print("MERGE COMMENT CHECKS FAILED")
+    print("=" * 60)
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,104 @@
 """
 Document protection functionality for Word Document Server.
 """
+import io
 import os
 import json
+import hmac
 import hashlib
 import datetime
-from typing import Dict, List, Tuple, Optional, Any
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Tuple, Optional, Any, Mapping, NamedTuple
+
+from docx.oxml.ns import qn
+
+try:
+    import orjson
+except ImportError:  # Optional faster JSON codec; the stdlib json module is used otherwise
+    orjson = None
+
+try:
+    from blake3 import blake3
+except ImportError:  # Optional faster hash; hashlib's blake2b is used otherwise
+    blake3 = None
+
+# Algorithm used for new content hashes; it is stored next to each hash so that
+# verification uses the matching one. Hashes without it are legacy SHA-256.
+CONTENT_HASH_ALGORITHM = "blake3" if blake3 is not None else "blake2b"
+LEGACY_CONTENT_HASH_ALGORITHM = "sha256"
+
+class ProtectionPaths(NamedTuple):
+    """Locations of a document and the sidecar files kept next to it."""
+    docx: str
+    metadata: str  # <name>.protection, written by add_protection_info
+    protection: str  # <name>.docx.protection, restricted editing data
+    signature: str  # <name>.docx.signature
+    backup: str  # rollback copy during password operations
+    temp: str  # decrypted output before it replaces the document
+
+
+def protection_paths(doc_path: str) -> ProtectionPaths:
+    """
+    Get the paths of all protection files belonging to a document.
+    
+    Args:
+        doc_path: Path to the document
+        
+    Returns:
+        ProtectionPaths for the document
+    """
+    base_path, _ = os.path.splitext(doc_path)
+    return ProtectionPaths(
+        docx=doc_path,
+        metadata=f"{base_path}.protection",
+        protection=f"{doc_path}.protection",
+        signature=f"{doc_path}.signature",
+        backup=f"{doc_path}.backup",
+        temp=f"{doc_path}.temp",
+    )
+
+
+@lru_cache(maxsize=256)
+def _load_sidecar(path: str, mtime_ns: int, size: int) -> Mapping[str, Any]:
+    """Parse a metadata sidecar; the stat values only key the cache."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return MappingProxyType(orjson.loads(data) if orjson is not None else json.loads(data))
+
+
+def load_protection_metadata(path: str) -> Mapping[str, Any]:
+    """
+    Read a .protection or .signature metadata file.
+    
+    Parsed files are cached on their modification time and size; the returned
+    mapping is shared between callers and read-only.
+    
+    Args:
+        path: Path to the metadata file
+        
+    Returns:
+        Read-only mapping of the file's JSON object
+    """
+    st = os.stat(path)
+    return _load_sidecar(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def write_protection_metadata(path: str, data: Dict[str, Any]) -> None:
+    """
+    Write a .protection or .signature metadata file as compact JSON.
+    
+    Args:
+        path: Path to the metadata file
+        data: JSON-serializable metadata
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data)
+    else:
+        payload = json.dumps(data, separators=(',', ':')).encode()
+    with open(path, 'wb') as f:
+        f.write(payload)
 
 
 def add_protection_info(doc_path: str, protection_type: str, password_hash: str, 
@@ -26,9 +119,7 @@ def add_protection_info(doc_path: str, protection_type: str, password_hash: str,
     Returns:
         True if protection info was successfully added, False otherwise
     """
-    # Create metadata filename based on document path
-    base_path, _ = os.path.splitext(doc_path)
-    metadata_path = f"{base_path}.protection"
+    metadata_path = protection_paths(doc_path).metadata
     
     # Prepare protection data
     protection_data = {
@@ -45,8 +136,7 @@ def add_protection_info(doc_path: str, protection_type: str, password_hash: str,
     
     # Write protection info to metadata file
     try:
-        with open(metadata_path, 'w') as f:
-            json.dump(protection_data, f, indent=2)
+        write_protection_metadata(metadata_path, protection_data)
         
         # Apply actual document encryption if raw_password is provided
         if protection_type == "password" and raw_password:
@@ -75,8 +165,7 @@ def add_protection_info(doc_path: str, protection_type: str, password_hash: str,
                 
                 # Update metadata to note that true encryption was applied
                 protection_data["true_encryption"] = True
-                with open(metadata_path, 'w') as f:
-                    json.dump(protection_data, f, indent=2)
+                write_protection_metadata(metadata_path, protection_data)
                     
             except Exception as e:
                 print(f"Encryption error: {str(e)}")
@@ -101,8 +190,7 @@ def verify_document_protection(doc_path: str, password: Optional[str] = None) ->
     Returns:
         Tuple of (is_protected_and_verified, message)
     """
-    base_path, _ = os.path.splitext(doc_path)
-    metadata_path = f"{base_path}.protection"
+    metadata_path = protection_paths(doc_path).metadata
     
     # Check if protection metadata exists
     if not os.path.exists(metadata_path):
@@ -110,13 +198,12 @@ def verify_document_protection(doc_path: str, password: Optional[str] = None) ->
     
     try:
         # Read protection data
-        with open(metadata_path, 'r') as f:
-            protection_data = json.load(f)
+        protection_data = load_protection_metadata(metadata_path)
         
         # If password is provided, verify it
         if password:
             password_hash = hashlib.sha256(password.encode()).hexdigest()
-            if password_hash != protection_data.get("password_hash"):
+            if not hashes_match(protection_data.get("password_hash"), password_hash):
                 return False, "Incorrect password"
         
         # Return protection type
@@ -138,8 +225,7 @@ def is_section_editable(doc_path: str, section_name: str) -> bool:
     Returns:
         True if section is editable, False otherwise
     """
-    base_path, _ = os.path.splitext(doc_path)
-    metadata_path = f"{base_path}.protection"
+    metadata_path = protection_paths(doc_path).metadata
     
     # Check if protection metadata exists
     if not os.path.exists(metadata_path):
@@ -148,8 +234,7 @@ def is_section_editable(doc_path: str, section_name: str) -> bool:
     
     try:
         # Read protection data
-        with open(metadata_path, 'r') as f:
-            protection_data = json.load(f)
+        protection_data = load_protection_metadata(metadata_path)
         
         # Check protection type
         if protection_data.get("type") != "restricted":
@@ -165,6 +250,98 @@ def is_section_editable(doc_path: str, section_name: str) -> bool:
         return False
 
 
+def _content_hasher(algorithm: str):
+    """Return a new hash object for a content hash algorithm name."""
+    if algorithm == "blake3":
+        if blake3 is None:
+            raise ValueError("blake3 content hashes require the blake3 package")
+        return blake3()
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=32)
+    if algorithm == "sha256":
+        return hashlib.sha256()
+    raise ValueError(f"Unsupported content hash algorithm: {algorithm}")
+
+
+def hashes_match(stored: Any, current: str) -> bool:
+    """
+    Compare a stored hex digest with a freshly computed one in constant time.
+    
+    Args:
+        stored: Digest read from protection metadata (may be missing or malformed)
+        current: Digest computed now
+        
+    Returns:
+        True if both digests are equal
+    """
+    if not isinstance(stored, str):
+        return False
+    return hmac.compare_digest(stored.encode(), current.encode())
+
+
+def hash_document_content(doc, algorithm: str = CONTENT_HASH_ALGORITHM) -> str:
+    """
+    Compute the content hash of a document's body paragraphs.
+    
+    The paragraph texts are read straight from the body's w:p elements
+    (CT_P.text, the same text Paragraph.text gives) and fed to the hasher one at a time, separated by
+    newlines, which gives the same digest as hashing the newline-joined text
+    without building that string.
+    
+    Args:
+        doc: Document object
+        algorithm: Hash algorithm name ('blake3', 'blake2b' or 'sha256')
+        
+    Returns:
+        Hex digest of the paragraph text
+    """
+    h = _content_hasher(algorithm)
+    for i, p in enumerate(doc.element.body.iterchildren(qn('w:p'))):
+        if i:
+            h.update(b"\n")
+        h.update(p.text.encode())
+    return h.hexdigest()
+
+
+# Content hashes of document files, keyed on a digest of the file's raw
+# bytes so a file is only reparsed when its bytes actually change
+_FILE_HASHES: "OrderedDict[Tuple[bytes, str], str]" = OrderedDict()
+_FILE_HASHES_SIZE = 64
+
+
+def hash_file_content(doc_path: str, algorithm: str = CONTENT_HASH_ALGORITHM) -> str:
+    """
+    Compute the content hash of a document file.
+    
+    The file is read in full on every call and results are cached on a digest
+    of its raw bytes, so verifying an unchanged document again does not
+    reparse it, while any change to the file - whatever its size or
+    modification time - is hashed afresh.
+    
+    Args:
+        doc_path: Path to the document
+        algorithm: Hash algorithm name ('blake3', 'blake2b' or 'sha256')
+        
+    Returns:
+        Hex digest of the paragraph text
+    """
+    from docx import Document
+    
+    with open(doc_path, 'rb') as f:
+        raw = f.read()
+    key = (hashlib.blake2b(raw).digest(), algorithm)
+    digest = _FILE_HASHES.get(key)
+    if digest is not None:
+        _FILE_HASHES.move_to_end(key)
+        return digest
+    
+    digest = hash_document_content(Document(io.BytesIO(raw)), algorithm)
+    _FILE_HASHES[key] = digest
+    if len(_FILE_HASHES) > _FILE_HASHES_SIZE:
+        _FILE_HASHES.popitem(last=False)
+    return digest
+
+
 def create_signature_info(doc, signer_name: str, reason: Optional[str] = None) -> Dict[str, Any]:
     """
     Create signature information for a document.
@@ -187,9 +364,8 @@ def create_signature_info(doc, signer_name: str, reason: Optional[str] = None) -
         signature_info["reason"] = reason
     
     # Generate a simple signature hash based on document content and metadata
-    text_content = "\n".join([p.text for p in doc.paragraphs])
-    content_hash = hashlib.sha256(text_content.encode()).hexdigest()
-    signature_info["content_hash"] = content_hash
+    signature_info["algo"] = CONTENT_HASH_ALGORITHM
+    signature_info["content_hash"] = hash_document_content(doc)
     
     return signature_info
 
@@ -204,18 +380,14 @@ def verify_signature(doc_path: str) -> Tuple[bool, str]:
     Returns:
         Tuple of (is_valid, message)
     """
-    from docx import Document
-    
-    base_path, _ = os.path.splitext(doc_path)
-    metadata_path = f"{base_path}.protection"
+    metadata_path = protection_paths(doc_path).metadata
     
     if not os.path.exists(metadata_path):
         return False, "Document is not signed"
     
     try:
         # Read protection data
-        with open(metadata_path, 'r') as f:
-            protection_data = json.load(f)
+        protection_data = load_protection_metadata(metadata_path)
         
         if protection_data.get("type") != "signature":
             return False, f"Document is protected with {protection_data.get('type')} protection, not a signature"
@@ -228,12 +400,11 @@ def verify_signature(doc_path: str) -> Tuple[bool, str]:
             return False, "Invalid signature: missing content hash"
         
         # Calculate current content hash
-        doc = Document(doc_path)
-        text_content = "\n".join([p.text for p in doc.paragraphs])
-        current_hash = hashlib.sha256(text_content.encode()).hexdigest()
+        algorithm = signature_info.get("algo", LEGACY_CONTENT_HASH_ALGORITHM)
+        current_hash = hash_file_content(doc_path, algorithm)
         
         # Compare hashes
-        if current_hash != original_hash:
+        if not hashes_match(original_hash, current_hash):
             return False, f"Document has been modified since it was signed by {signature_info.get('signer')}"
         
         return True, f"Document signature is valid. Signed by {signature_info.get('signer')} on {signature_info.get('timestamp')}"
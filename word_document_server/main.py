@@ -57,6 +57,7 @@ def register_tools():
     
     # Enhanced comment management (replaces extract_comments with full lifecycle management)
     mcp.tool()(review_tools.manage_comments)
+    mcp.tool()(review_tools.manage_comments_batch)
     
     # ========== CONSOLIDATED DOCUMENT TOOLS (NEW) ==========
     # Unified document utilities (replaces 3 individual tools)
@@ -8,10 +8,27 @@ import os
 import asyncio
 import json
 import uuid
-from typing import Dict, Optional, List, Any
+from collections import OrderedDict
+from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, List, Any, Tuple
 from dataclasses import dataclass, field
 from docx import Document
-from word_document_server.utils.file_utils import ensure_docx_extension
+from word_document_server.utils.document_utils import W_P
+from word_document_server.utils.file_utils import ensure_docx_extension, track_writeable, untrack_writeable
+
+
+def _cache_size_from_env(default: int = 32) -> int:
+    """Read WORD_DOCUMENT_CACHE_SIZE, falling back to the default on a bad value."""
+    try:
+        size = int(os.environ.get("WORD_DOCUMENT_CACHE_SIZE", default))
+    except ValueError:
+        return default
+    return size if size >= 0 else default
+
+
+# Number of parsed documents kept for reopening unchanged files
+DOCUMENT_CACHE_SIZE = _cache_size_from_env()
 
 
 @dataclass
@@ -57,6 +74,100 @@ class DocumentSessionManager:
     def __init__(self):
         self._documents: Dict[str, DocumentHandle] = {}
         self._active_document_id: Optional[str] = None
+        # Parsed documents by real path, with the mtime_ns and size they were read at.
+        # These parses are never handed out; each handle gets its own copy, so
+        # edits made through one handle cannot leak into another or the cache
+        self._document_cache: "OrderedDict[str, Tuple[Document, int, int]]" = OrderedDict()
+    
+    def _load_document(self, file_path: str, st: os.stat_result) -> Document:
+        """
+        Parse a document, reusing the cached parse while the file is unchanged.
+        
+        Args:
+            file_path: Path to the Word document file
+            st: Current os.stat() result for file_path
+            
+        Returns:
+            A private copy of the parsed Document
+        """
+        doc = self._cached_document(file_path, st)
+        if doc is None:
+            doc = Document(file_path)
+            self._cache_document(file_path, st, doc)
+        return deepcopy(doc)
+    
+    def _cached_document(self, file_path: str, st: os.stat_result) -> Optional[Document]:
+        """Return the cached parse of file_path if the file is unchanged since, else None."""
+        key = os.path.realpath(file_path)
+        cached = self._document_cache.get(key)
+        if cached is not None and cached[1] == st.st_mtime_ns and cached[2] == st.st_size:
+            self._document_cache.move_to_end(key)
+            return cached[0]
+        return None
+    
+    def _cache_document(self, file_path: str, st: os.stat_result, doc: Document) -> None:
+        """Store a fresh parse of file_path, evicting the least recently used entries."""
+        key = os.path.realpath(file_path)
+        self._document_cache[key] = (doc, st.st_mtime_ns, st.st_size)
+        self._document_cache.move_to_end(key)
+        while len(self._document_cache) > DOCUMENT_CACHE_SIZE:
+            self._document_cache.popitem(last=False)
+    
+    def _register_document(self, document_id: str, file_path: str, doc: Document, st: os.stat_result) -> None:
+        """Add an opened document to the session."""
+        # Create document handle with metadata; paragraph and section counts
+        # are filled in by list_open_documents when first needed
+        metadata = {
+            "opened_at": str(st.st_mtime),
+            "file_size": st.st_size
+        }
+        
+        handle = DocumentHandle(
+            document_id=document_id,
+            file_path=file_path,
+            document=doc,
+            metadata=metadata
+        )
+        
+        # Store in session
+        self._documents[document_id] = handle
+        track_writeable(file_path)
+        
+        # Set as active if it's the first document
+        if self._active_document_id is None:
+            self._active_document_id = document_id
+    
+    def _retain_closed_document(self, handle: DocumentHandle) -> None:
+        """Keep a closed document's cached parse as the most recently used entry.
+        
+        The cached parse is never the handle's own (possibly edited) copy, so it
+        is clean by construction; it is kept only while it still matches the
+        file on disk and evicted otherwise.
+        """
+        key = os.path.realpath(handle.file_path)
+        if key not in self._document_cache:
+            return
+        try:
+            st = os.stat(key)
+        except OSError:
+            st = None
+        if st is not None and self._cached_document(key, st) is not None:
+            return
+        del self._document_cache[key]
+    
+    @staticmethod
+    def _ensure_document_counts(handle: DocumentHandle) -> None:
+        """Fill in a handle's paragraph and section counts if not yet known."""
+        metadata = handle.metadata
+        if "paragraph_count" not in metadata:
+            doc = handle.document
+            # Body-level paragraphs, as counted by doc.paragraphs
+            metadata["paragraph_count"] = sum(1 for _ in doc.element.body.iterchildren(W_P))
+            metadata["section_count"] = len(doc.sections)
+    
+    def invalidate_cached_document(self, file_path: str) -> None:
+        """Drop the cached parse of a file, e.g. after its session document was replaced."""
+        self._document_cache.pop(os.path.realpath(file_path), None)
     
     def open_document(self, document_id: str, file_path: str) -> str:
         """
@@ -81,46 +192,100 @@ class DocumentSessionManager:
             file_path = ensure_docx_extension(file_path)
             
             # Check if file exists
-            if not os.path.exists(file_path):
+            try:
+                st = os.stat(file_path)
+            except OSError:
                 return f"Error: Document file '{file_path}' does not exist"
             
             # Check if document_id already in use
             if document_id in self._documents:
                 return f"Error: Document ID '{document_id}' is already in use. Use close_document() first or choose a different ID."
             
-            # Try to open the document
+            # Try to open the document; reopening an unchanged file reuses its parse
             try:
-                doc = Document(file_path)
+                doc = self._load_document(file_path, st)
             except Exception as e:
                 return f"Error: Failed to open document '{file_path}': {str(e)}"
             
-            # Create document handle with metadata
-            metadata = {
-                "opened_at": str(os.path.getmtime(file_path)),
-                "paragraph_count": len(doc.paragraphs),
-                "section_count": len(doc.sections),
-                "file_size": os.path.getsize(file_path)
-            }
-            
-            handle = DocumentHandle(
-                document_id=document_id,
-                file_path=file_path,
-                document=doc,
-                metadata=metadata
-            )
-            
-            # Store in session
-            self._documents[document_id] = handle
-            
-            # Set as active if it's the first document
-            if self._active_document_id is None:
-                self._active_document_id = document_id
-                
+            self._register_document(document_id, file_path, doc, st)
             return f"Successfully opened document '{document_id}' from '{file_path}'"
             
         except Exception as e:
             return f"Error opening document: {str(e)}"
     
+    def open_documents(self, documents: Dict[str, str]) -> str:
+        """
+        Open several Word documents at once, parsing them in parallel.
+        
+        Either every document is opened or, if any of them fails validation or
+        parsing, none is and the session is left unchanged.
+        
+        Args:
+            documents: Mapping of document_id to file path
+            
+        Returns:
+            Success/error message string
+        """
+        try:
+            if not documents:
+                return "Error: documents mapping cannot be empty"
+            
+            # Validate everything before parsing anything
+            targets = []
+            for document_id, file_path in documents.items():
+                if not document_id or not document_id.strip():
+                    return "Error: document_id cannot be empty"
+                if not file_path or not file_path.strip():
+                    return f"Error: file_path cannot be empty for document_id '{document_id}'"
+                if document_id in self._documents:
+                    return f"Error: Document ID '{document_id}' is already in use. Use close_document() first or choose a different ID."
+                
+                file_path = ensure_docx_extension(file_path)
+                try:
+                    st = os.stat(file_path)
+                except OSError:
+                    return f"Error: Document file '{file_path}' does not exist"
+                targets.append((document_id, file_path, st))
+            
+            # Parse the files that have no usable cached parse, each path once
+            docs = {}
+            to_parse = {}
+            for document_id, file_path, st in targets:
+                key = os.path.realpath(file_path)
+                if key not in docs and key not in to_parse:
+                    doc = self._cached_document(file_path, st)
+                    if doc is None:
+                        to_parse[key] = (file_path, st)
+                    else:
+                        docs[key] = doc
+            
+            if to_parse:
+                with ThreadPoolExecutor(max_workers=min(8, len(to_parse))) as pool:
+                    futures = {
+                        key: pool.submit(Document, file_path)
+                        for key, (file_path, st) in to_parse.items()
+                    }
+                    for key, future in futures.items():
+                        file_path, st = to_parse[key]
+                        try:
+                            docs[key] = future.result()
+                        except Exception as e:
+                            return f"Error: Failed to open document '{file_path}': {str(e)}"
+                
+                for key, (file_path, st) in to_parse.items():
+                    self._cache_document(file_path, st, docs[key])
+            
+            # Copying a parse is cheaper than reparsing, and gives every
+            # handle its own tree even when two ids share a path
+            for document_id, file_path, st in targets:
+                self._register_document(document_id, file_path, deepcopy(docs[os.path.realpath(file_path)]), st)
+            
+            opened = "\n".join(f"  '{document_id}' from '{file_path}'" for document_id, file_path, _ in targets)
+            return f"Successfully opened {len(targets)} documents:\n{opened}"
+            
+        except Exception as e:
+            return f"Error opening documents: {str(e)}"
+    
     def close_document(self, document_id: str) -> str:
         """
         Close a document and remove it from the session.
@@ -138,8 +303,10 @@ class DocumentSessionManager:
             # Get handle before removing
             handle = self._documents[document_id]
             
-            # Remove from session
+            # Remove from session; the parse stays cached for a later reopen
             del self._documents[document_id]
+            self._retain_closed_document(handle)
+            untrack_writeable(handle.file_path)
             
             # Update active document if needed
             if self._active_document_id == document_id:
@@ -162,17 +329,23 @@ class DocumentSessionManager:
             if not self._documents:
                 return "No documents currently open"
             
-            result = f"Open documents ({len(self._documents)}):\n\n"
+            # Sizes come from the stat taken at open time, so listing needs no
+            # file system access
+            entries = [f"Open documents ({len(self._documents)}):"]
             
             for doc_id, handle in self._documents.items():
                 is_active = " (ACTIVE)" if doc_id == self._active_document_id else ""
-                result += f"ID: {doc_id}{is_active}\n"
-                result += f"  Path: {handle.file_path}\n"
-                result += f"  Paragraphs: {handle.metadata.get('paragraph_count', 'Unknown')}\n"
-                result += f"  Sections: {handle.metadata.get('section_count', 'Unknown')}\n"
-                result += f"  File size: {handle.metadata.get('file_size', 'Unknown')} bytes\n\n"
-            
-            return result.rstrip()
+                self._ensure_document_counts(handle)
+                metadata = handle.metadata
+                entries.append(
+                    f"ID: {doc_id}{is_active}\n"
+                    f"  Path: {handle.file_path}\n"
+                    f"  Paragraphs: {metadata.get('paragraph_count', 'Unknown')}\n"
+                    f"  Sections: {metadata.get('section_count', 'Unknown')}\n"
+                    f"  File size: {metadata.get('file_size', 'Unknown')} bytes"
+                )
+            
+            return "\n\n".join(entries)
             
         except Exception as e:
             return f"Error listing documents: {str(e)}"
@@ -257,6 +430,9 @@ class DocumentSessionManager:
             Success message with count
         """
         count = len(self._documents)
+        for handle in self._documents.values():
+            self._retain_closed_document(handle)
+            untrack_writeable(handle.file_path)
         self._documents.clear()
         self._active_document_id = None
         return f"Closed {count} documents"
@@ -37,6 +37,7 @@ from word_document_server.tools.content_tools import (
 from word_document_server.tools.review_tools import (
     manage_track_changes,  # Replaces: accept_all_changes, reject_all_changes  
     manage_comments,  # Enhanced: Complete comment lifecycle management (replaces extract_comments)
+    manage_comments_batch,
     extract_track_changes,
     generate_review_summary
 )
@@ -68,6 +69,7 @@ from word_document_server.tools.extended_document_tools import (
 from word_document_server.tools.session_tools import (
     session_manager,  # Consolidated (replaces 5 tools)
     open_document,
+    open_documents_batch,
     close_document,
     list_open_documents,
     set_active_document,
@@ -82,7 +84,7 @@ CONSOLIDATED_TOOLS = [
     'format_document',  # Replaces 2 formatting tools
     
     # 6 Unified Tools (already consolidated)
-    'get_text', 'manage_track_changes', 'manage_comments', 'add_note', 'add_text_content', 
+    'get_text', 'manage_track_changes', 'manage_comments', 'manage_comments_batch', 'add_note', 'add_text_content', 
     'get_sections', 'manage_protection',
     
     # 7 Essential Document Tools  
@@ -94,7 +96,7 @@ CONSOLIDATED_TOOLS = [
     'add_digital_signature', 'verify_document',
     
     # Legacy tools (for backward compatibility - not registered in main.py)
-    'open_document', 'close_document', 'list_open_documents', 'set_active_document', 'close_all_documents',
+    'open_document', 'open_documents_batch', 'close_document', 'list_open_documents', 'set_active_document', 'close_all_documents',
     'get_document_info', 'get_document_outline', 'list_available_documents',
     'format_specific_words', 'format_research_paper_terms'
 ]
@@ -5,16 +5,58 @@ These tools add various types of content to Word documents,
 including headings, paragraphs, tables, images, and page breaks.
 """
 import os
+import re
+from bisect import bisect_right
+from copy import deepcopy
+from functools import lru_cache
+from itertools import accumulate
 from typing import List, Optional, Dict, Any
 from docx import Document
+from docx.text.paragraph import Paragraph
 from docx.text.run import Run
-from docx.shared import Inches, Pt
+from docx.shared import Inches, Pt, RGBColor
+
+try:
+    import ahocorasick
+except ImportError:  # Optional accelerator for multi-word search; regex is used otherwise
+    ahocorasick = None
 
 from word_document_server.utils.file_utils import check_file_writeable, ensure_docx_extension, validate_docx_path
-from word_document_server.utils.document_utils import find_and_replace_text
+from word_document_server.utils.document_utils import W_T, coalesce_runs, find_and_replace_text
 from word_document_server.utils.session_utils import resolve_document_path
 from word_document_server.core.styles import ensure_heading_style, ensure_table_style
 
+# Named colors accepted by the formatting helpers
+_COLOR_MAP = {
+    'red': RGBColor(255, 0, 0),
+    'blue': RGBColor(0, 0, 255),
+    'green': RGBColor(0, 128, 0),
+    'yellow': RGBColor(255, 255, 0),
+    'black': RGBColor(0, 0, 0),
+    'gray': RGBColor(128, 128, 128),
+    'white': RGBColor(255, 255, 255),
+    'purple': RGBColor(128, 0, 128),
+    'orange': RGBColor(255, 165, 0),
+    'brown': RGBColor(165, 42, 42),
+    'pink': RGBColor(255, 192, 203),
+    'cyan': RGBColor(0, 255, 255),
+    'magenta': RGBColor(255, 0, 255),
+    'lime': RGBColor(0, 255, 0),
+    'navy': RGBColor(0, 0, 128),
+    'maroon': RGBColor(128, 0, 0),
+    'olive': RGBColor(128, 128, 0),
+    'teal': RGBColor(0, 128, 128)
+}
+_HEX_COLOR_RE = re.compile(r'#([0-9a-fA-F]{6})')
+_BLACK = RGBColor(0, 0, 0)
+
+# Run text characters python-docx derives from <w:tab>, <w:br>, <w:noBreakHyphen>
+# etc. rather than from <w:t>
+_SYNTHESIZED_RUN_CHARS = '\t\n-'
+
+# ASCII-only lowercase table for the bytes search path in _find_word_spans
+_ASCII_LOWER = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', b'abcdefghijklmnopqrstuvwxyz')
+
 
 async def add_text_content(
     document_id: str = None,
@@ -314,19 +356,13 @@ async def add_text_content(
         if position == "before":
             # Move element to before specified paragraph
             target_paragraph = doc.paragraphs[insert_before_paragraph]
-            target_paragraph._element.getparent().insert(
-                list(target_paragraph._element.getparent()).index(target_paragraph._element),
-                created_element._element
-            )
+            target_paragraph._element.addprevious(created_element._element)
             success_message += f" before paragraph {insert_before_paragraph}"
         
         elif position == "after":
             # Move element to after specified paragraph
             target_paragraph = doc.paragraphs[insert_after_paragraph]
-            target_paragraph._element.getparent().insert(
-                list(target_paragraph._element.getparent()).index(target_paragraph._element) + 1,
-                created_element._element
-            )
+            target_paragraph._element.addnext(created_element._element)
             success_message += f" after paragraph {insert_after_paragraph}"
         
         elif position == "beginning" and content_type == "paragraph":
@@ -551,19 +587,10 @@ async def enhanced_search_and_replace(document_id: str = None, filename: str = N
                 doc = Document(io.BytesIO(ooxml_content.get("content").encode('utf-8')))
                 
                 # Perform replacement using existing logic
-                count = _enhanced_replace_in_paragraphs(doc.paragraphs, find_text, replace_text, 
-                                                      apply_formatting, bold, italic, underline, 
-                                                      color, font_size, font_name, match_case, 
-                                                      whole_words_only, use_regex)
-                
-                # Search in tables
-                for table in doc.tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            count += _enhanced_replace_in_paragraphs(cell.paragraphs, find_text, replace_text,
-                                                                   apply_formatting, bold, italic, underline,
-                                                                   color, font_size, font_name, match_case, 
-                                                                   whole_words_only, use_regex)
+                count = _search_and_replace_in_document(doc, find_text, replace_text, 
+                                                        apply_formatting, bold, italic, underline, 
+                                                        color, font_size, font_name, match_case, 
+                                                        whole_words_only, use_regex)
                 
                 if count > 0:
                     # Save modified content back to live document
@@ -603,30 +630,19 @@ async def enhanced_search_and_replace(document_id: str = None, filename: str = N
         # Validate regex pattern if using regex
         if use_regex:
             try:
-                import re
-                re.compile(find_text)
+                _compiled(find_text, match_case, whole_words_only, use_regex)
             except re.error as e:
                 return f"Invalid regex pattern '{find_text}': {str(e)}"
         
         try:
-            doc = Document(filename)
-            
-            count = _enhanced_replace_in_paragraphs(doc.paragraphs, find_text, replace_text, 
-                                                  apply_formatting, bold, italic, underline, 
-                                                  color, font_size, font_name, match_case, 
-                                                  whole_words_only, use_regex)
-            
-            # Search in tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        count += _enhanced_replace_in_paragraphs(cell.paragraphs, find_text, replace_text,
-                                                               apply_formatting, bold, italic, underline,
-                                                               color, font_size, font_name, match_case, 
-                                                               whole_words_only, use_regex)
+            with FormatSession(filename) as session:
+                count = _search_and_replace_in_document(session.doc, find_text, replace_text, 
+                                                        apply_formatting, bold, italic, underline, 
+                                                        color, font_size, font_name, match_case, 
+                                                        whole_words_only, use_regex)
+                session.modified = count > 0
             
             if count > 0:
-                doc.save(filename)
                 search_type = "regex pattern" if use_regex else "text"
                 case_info = "" if match_case else " (case-insensitive)"
                 word_info = " (whole words only)" if whole_words_only else ""
@@ -648,192 +664,369 @@ async def enhanced_search_and_replace(document_id: str = None, filename: str = N
 
 
 
+@lru_cache(maxsize=512)
+def _compiled(find_text, match_case, whole_words_only, use_regex=False):
+    """Build (and cache) the compiled search pattern for a find request.
+    
+    Raises re.error for invalid regex patterns.
+    """
+    flags = re.IGNORECASE if not match_case else 0
+    if use_regex:
+        pattern = find_text
+    else:
+        # Escape special regex characters for literal matching
+        pattern = re.escape(find_text)
+        if whole_words_only:
+            pattern = r'\b' + pattern + r'\b'
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=64)
+def _compiled_alternation(words, match_case, whole_words_only):
+    """Build (and cache) one pattern matching any of words, plus its dispatch table.
+    
+    Each word is wrapped in its own capturing group, so a match is dispatched
+    back to the word's position in words with ``dispatch[match.lastindex]``
+    (a tuple index instead of parsing a group name). Longer words are tried
+    first so a word is never shadowed by one of its own prefixes.
+    
+    Returns:
+        Tuple of (compiled pattern, dispatch tuple indexed by group number)
+    """
+    flags = re.IGNORECASE if not match_case else 0
+    order = sorted(range(len(words)), key=lambda i: len(words[i]), reverse=True)
+    pattern = "|".join(f"({re.escape(words[i])})" for i in order)
+    if whole_words_only:
+        pattern = r'\b(?:' + pattern + r')\b'
+    return re.compile(pattern, flags), (None, *order)
+
+
+@lru_cache(maxsize=64)
+def _word_automaton(words, match_case):
+    """Build (and cache) an Aho-Corasick automaton over words.
+    
+    Values are (index, length) pairs, where index is the word's position in words.
+    """
+    automaton = ahocorasick.Automaton()
+    for i, word in enumerate(words):
+        if word:
+            automaton.add_word(word if match_case else word.lower(), (i, len(word)))
+    automaton.make_automaton()
+    return automaton
+
+
+def _is_word_boundary(text, pos):
+    """Return True if a regex \\b would match at pos in text."""
+    before = pos > 0 and (text[pos - 1].isalnum() or text[pos - 1] == '_')
+    after = pos < len(text) and (text[pos].isalnum() or text[pos] == '_')
+    return before != after
+
+
+@lru_cache(maxsize=64)
+def _ascii_word_needles(words, match_case):
+    """Encode words for the bytes search path, or return None if any is non-ASCII.
+    
+    Returns a tuple of (index, needle) pairs, lowercased when match_case is False.
+    """
+    if not all(word.isascii() for word in words):
+        return None
+    return tuple((i, word.encode('ascii') if match_case else word.lower().encode('ascii'))
+                 for i, word in enumerate(words) if word)
+
+
+def _select_word_spans(candidates):
+    """Resolve (start, -length, word_index) candidates to leftmost-longest spans."""
+    spans = []
+    last_end = 0
+    for start, neg_length, i in sorted(candidates):
+        if start >= last_end:
+            last_end = start - neg_length
+            spans.append((start, last_end, i))
+    return spans
+
+
+def _find_word_spans(text, words, match_case, whole_words_only):
+    """Find non-overlapping occurrences of any of words in text.
+    
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, scanning the
+    text once regardless of the number of words. Without it, ASCII text and
+    words are searched with bytes.find over a translate()-lowercased buffer,
+    and anything else falls back to the cached alternation pattern. All paths
+    agree on results: leftmost match first, longest word when several start at
+    the same position.
+    
+    Returns:
+        List of (start, end, word_index) tuples in text order
+    """
+    if ahocorasick is not None and any(words):
+        haystack = text if match_case else text.lower()
+        # Lowercasing can change length for a few non-ASCII characters, which
+        # would break offsets; let the regex path handle those paragraphs
+        if len(haystack) == len(text):
+            candidates = []
+            for end_idx, (i, length) in _word_automaton(words, match_case).iter(haystack):
+                start = end_idx + 1 - length
+                if whole_words_only and not (_is_word_boundary(text, start)
+                                             and _is_word_boundary(text, end_idx + 1)):
+                    continue
+                candidates.append((start, -length, i))
+            return _select_word_spans(candidates)
+    
+    needles = _ascii_word_needles(words, match_case) if text.isascii() else None
+    if needles:
+        haystack = text.encode('ascii')
+        if not match_case:
+            haystack = haystack.translate(_ASCII_LOWER)
+        candidates = []
+        for i, needle in needles:
+            length = len(needle)
+            pos = haystack.find(needle)
+            while pos != -1:
+                if not whole_words_only or (_is_word_boundary(text, pos)
+                                            and _is_word_boundary(text, pos + length)):
+                    candidates.append((pos, -length, i))
+                pos = haystack.find(needle, pos + 1)
+        return _select_word_spans(candidates)
+    
+    regex, dispatch = _compiled_alternation(words, match_case, whole_words_only)
+    return [(m.start(), m.end(), dispatch[m.lastindex]) for m in regex.finditer(text)]
+
+
+def _search_and_replace_in_document(doc, find_text, replace_text, apply_formatting,
+                                    bold, italic, underline, color, font_size, font_name,
+                                    match_case, whole_words_only, use_regex=False):
+    """Run _enhanced_replace_in_paragraphs over an already loaded document.
+    
+    Covers body and table cell paragraphs; loading and saving is left to the
+    caller so several edits can share one load/save cycle.
+    """
+    return _enhanced_replace_in_paragraphs(_iter_document_paragraphs(doc), find_text, replace_text,
+                                           apply_formatting, bold, italic, underline, color,
+                                           font_size, font_name, match_case, whole_words_only,
+                                           use_regex)
+
+
 def _enhanced_replace_in_paragraphs(paragraphs, find_text, replace_text, apply_formatting,
                                    bold, italic, underline, color, font_size, font_name,
                                    match_case, whole_words_only, use_regex=False):
     """Helper function to replace text in paragraphs with optional formatting and regex support.
     
-    This implementation fixes the positioning bugs by properly inserting runs at their
-    correct positions instead of always appending to the end of the paragraph.
+    Each paragraph is handled in two phases: all match spans are collected first,
+    then applied from last to first. Matches are mapped onto runs with a binary
+    search over cumulative run lengths, and because later spans are rewritten
+    before earlier ones the lengths computed up front stay valid for the whole batch.
     Supports both literal text matching and regex pattern matching.
     """
-    import re
-    from docx.shared import Pt, RGBColor
+    try:
+        regex = _compiled(find_text, match_case, whole_words_only, use_regex)
+    except re.error:
+        return 0  # Invalid regex patterns match nothing
     
-    count = 0
+    formatting = None
+    if apply_formatting:
+        formatting = dict(bold=bold, italic=italic, underline=underline, color=color,
+                          font_size=font_size, font_name=font_name)
     
+    # A case-sensitive literal search replacing text with itself only formats:
+    # keep the matched text and let _apply_spans take the format-only path
+    if not use_regex and match_case and replace_text == find_text:
+        replace_text = None
+    
+    # Literal searches can cheaply skip paragraphs that cannot contain a match
+    needle = None
+    if not use_regex:
+        needle = find_text if match_case else find_text.casefold()
+    
+    count = 0
     for para in paragraphs:
-        para_text = para.text
-        
-        # Create search pattern based on options
-        if use_regex:
-            try:
-                pattern = find_text
-                flags = re.IGNORECASE if not match_case else 0
-            except re.error:
-                continue  # Skip invalid regex patterns
-        else:
-            # Escape special regex characters for literal matching
-            escaped_text = re.escape(find_text)
-            if whole_words_only:
-                pattern = r'\b' + escaped_text + r'\b'
-            else:
-                pattern = escaped_text
-            flags = re.IGNORECASE if not match_case else 0
-        
-        # Find all matches in the paragraph text
-        try:
-            matches = list(re.finditer(pattern, para_text, flags))
-        except re.error:
-            continue  # Skip if pattern compilation fails
-            
-        if not matches:
+        if needle is not None and not _may_contain(para.text, (needle,), match_case):
             continue
-            
-        count += len(matches)
-        
-        # Process matches from right to left to avoid position shifting during replacement
-        for match in reversed(matches):
-            start_pos = match.start()
-            end_pos = match.end()
-            
+        count += _replace_in_paragraph(para, regex, replace_text, use_regex, formatting)
+    return count
+
+
+def _may_contain(text, needles, match_case):
+    """Cheap substring pre-filter run before the regex/automaton scan.
+    
+    needles must already be casefolded when match_case is False. Casefolding is
+    at least as permissive as re.IGNORECASE, so a False result means the
+    paragraph cannot match.
+    """
+    haystack = text if match_case else text.casefold()
+    return any(needle in haystack for needle in needles)
+
+
+def _replace_in_paragraph(para, regex, replace_text, use_regex, formatting):
+    """Replace every match of regex in a single paragraph.
+    
+    Args:
+        para: python-docx Paragraph to edit in place
+        regex: Compiled search pattern
+        replace_text: Replacement text, or None to keep the matched text and only format it
+        use_regex: Expand group references in replace_text for each match
+        formatting: _apply_formatting_to_run keyword arguments, or None
+    
+    Returns:
+        Number of matches found in the paragraph
+    """
+    runs = para.runs
+    if not runs:
+        return 0
+    run_texts = [run.text for run in runs]
+    
+    # Phase 1: collect every match span in the paragraph
+    spans = []
+    for match in regex.finditer("".join(run_texts)):
+        if replace_text is None:
+            actual_replace_text = None
+        elif use_regex:
             # For regex, get the actual replacement text (may include group substitutions)
-            if use_regex:
-                actual_replace_text = match.expand(replace_text)
-            else:
-                actual_replace_text = replace_text
-            
-            # NEW APPROACH: Instead of modifying existing runs and appending new ones,
-            # we rebuild the runs in the correct order by collecting all run segments
-            # and then reconstructing the paragraph properly.
-            
-            # Collect all run segments with their formatting and positions
-            run_segments = []
-            current_pos = 0
-            
-            for run_idx, run in enumerate(para.runs):
-                run_length = len(run.text)
-                run_start = current_pos
-                run_end = current_pos + run_length
-                
-                # Determine how this run overlaps with the match
-                if run_end <= start_pos:
-                    # Run is completely before the match - keep as is
-                    if run.text:  # Only add non-empty runs
-                        run_segments.append({
-                            'text': run.text,
-                            'formatting': _extract_run_formatting(run),
-                            'type': 'keep'
-                        })
-                elif run_start >= end_pos:
-                    # Run is completely after the match - keep as is
-                    if run.text:  # Only add non-empty runs
-                        run_segments.append({
-                            'text': run.text,
-                            'formatting': _extract_run_formatting(run),
-                            'type': 'keep'
-                        })
-                else:
-                    # Run overlaps with the match - need to split it
-                    
-                    # Part before the match
-                    if run_start < start_pos:
-                        before_text = run.text[:start_pos - run_start]
-                        if before_text:
-                            run_segments.append({
-                                'text': before_text,
-                                'formatting': _extract_run_formatting(run),
-                                'type': 'keep'
-                            })
-                    
-                    # The match replacement (only add once, when we encounter the first overlapping run)
-                    if not any(seg.get('type') == 'replacement' for seg in run_segments):
-                        replacement_formatting = _extract_run_formatting(run)
-                        if apply_formatting:
-                            # Apply new formatting on top of existing
-                            replacement_formatting.update({
-                                'bold': bold if bold is not None else replacement_formatting.get('bold'),
-                                'italic': italic if italic is not None else replacement_formatting.get('italic'),
-                                'underline': underline if underline is not None else replacement_formatting.get('underline'),
-                                'color': color if color else replacement_formatting.get('color'),
-                                'font_size': font_size if font_size else replacement_formatting.get('font_size'),
-                                'font_name': font_name if font_name else replacement_formatting.get('font_name')
-                            })
-                        
-                        run_segments.append({
-                            'text': actual_replace_text,
-                            'formatting': replacement_formatting,
-                            'type': 'replacement'
-                        })
-                    
-                    # Part after the match
-                    if run_end > end_pos:
-                        after_text = run.text[end_pos - run_start:]
-                        if after_text:
-                            run_segments.append({
-                                'text': after_text,
-                                'formatting': _extract_run_formatting(run),
-                                'type': 'keep'
-                            })
-                
-                current_pos += run_length
-            
-            # Clear all existing runs
-            for _ in range(len(para.runs)):
-                para.runs[0]._element.getparent().remove(para.runs[0]._element)
-            
-            # Rebuild the paragraph with the correct run segments in order
-            for segment in run_segments:
-                if segment['text']:  # Only add non-empty segments
-                    new_run = para.add_run(segment['text'])
-                    _apply_run_formatting(new_run, segment['formatting'])
+            actual_replace_text = match.expand(replace_text)
+        else:
+            actual_replace_text = replace_text
+        spans.append((match.start(), match.end(), actual_replace_text, formatting))
     
-    return count
+    if spans:
+        _apply_spans(para, runs, run_texts, spans)
+    return len(spans)
 
 
-def _extract_run_formatting(run):
-    """Extract formatting properties from a run."""
-    formatting = {}
-    try:
-        formatting['bold'] = run.bold
-        formatting['italic'] = run.italic
-        formatting['underline'] = run.underline
-        if run.font.name:
-            formatting['font_name'] = run.font.name
-        if run.font.size:
-            formatting['font_size'] = run.font.size.pt if run.font.size else None
-        if run.font.color.rgb:
-            formatting['color'] = str(run.font.color.rgb)
-    except Exception:
-        # If any formatting extraction fails, return basic formatting
-        pass
-    return formatting
+def _apply_spans(para, runs, run_texts, spans):
+    """Rewrite the collected (start, end, text, formatting) spans of a paragraph.
+    
+    A text of None keeps the existing text and only applies formatting.
+    
+    runs and run_texts are snapshots taken once before the spans were collected;
+    they are reused for every span instead of re-reading para.runs / run.text,
+    and run_texts is kept in step with the edits.
+    """
+    # Cumulative run end offsets: run i covers [prefix[i-1], prefix[i])
+    prefix = list(accumulate(len(text) for text in run_texts))
+    
+    # Phase 2: apply from right to left so prefix stays valid for earlier spans
+    for start_pos, end_pos, new_text, formatting in reversed(spans):
+        if start_pos == end_pos:
+            continue  # Zero-width regex matches have nothing to replace
+        if new_text is not None:
+            _replace_span_in_runs(runs, run_texts, prefix, start_pos, end_pos, new_text, formatting)
+        elif formatting:
+            _format_span_in_runs(runs, run_texts, prefix, start_pos, end_pos, formatting)
+    
+    # Splitting leaves neighbouring runs that often share formatting again (e.g.
+    # after repeated formatting passes); merge them so run counts stay bounded
+    coalesce_runs(para._p)
 
 
-def _apply_run_formatting(run, formatting):
-    """Apply formatting properties to a run."""
-    try:
-        if 'bold' in formatting and formatting['bold'] is not None:
-            run.bold = formatting['bold']
-        if 'italic' in formatting and formatting['italic'] is not None:
-            run.italic = formatting['italic']
-        if 'underline' in formatting and formatting['underline'] is not None:
-            run.underline = formatting['underline']
-        if 'font_name' in formatting and formatting['font_name']:
-            run.font.name = formatting['font_name']
-        if 'font_size' in formatting and formatting['font_size']:
-            from docx.shared import Pt
-            run.font.size = Pt(formatting['font_size'])
-        if 'color' in formatting and formatting['color']:
-            _apply_color_to_run(run, formatting['color'])
-    except Exception:
-        # Silently continue if formatting fails
-        pass
+def _locate_span(prefix, start_pos, end_pos):
+    """Map the non-empty span [start_pos, end_pos) onto runs.
+    
+    prefix holds cumulative run end offsets (run i covers [prefix[i-1], prefix[i])).
+    Empty runs at a boundary are skipped, so the returned runs always contain
+    the span's first and last characters.
+    
+    Returns:
+        Tuple of (start_idx, start_offset, end_idx, end_offset), offsets being
+        relative to the start of their run
+    """
+    start_idx = bisect_right(prefix, start_pos)
+    end_idx = bisect_right(prefix, end_pos - 1)
+    start_offset = start_pos - prefix[start_idx - 1] if start_idx else start_pos
+    end_offset = end_pos - prefix[end_idx - 1] if end_idx else end_pos
+    return start_idx, start_offset, end_idx, end_offset
 
 
+def _replace_span_in_runs(runs, run_texts, prefix, start_pos, end_pos, new_text, formatting=None):
+    """Replace the paragraph text span [start_pos, end_pos) with new_text.
+    
+    The replacement run inherits the formatting of the run the match starts in,
+    text before the match stays in that run and text after the match stays with
+    the formatting of the run the match ends in. Runs fully covered by the match
+    are removed. Existing runs are reused where possible so at most two new runs
+    are created per match.
+    
+    Only runs at or after the start run are touched, and run_texts[start_idx]
+    is updated to what remains of the start run, so the snapshots stay valid for
+    spans that lie earlier in the paragraph.
+    """
+    start_idx, start_run_offset, end_idx, end_run_offset = _locate_span(prefix, start_pos, end_pos)
+    start_run = runs[start_idx]
+    end_run = runs[end_idx]
+    
+    before_text = run_texts[start_idx][:start_run_offset]
+    after_text = run_texts[end_idx][end_run_offset:]
+    
+    if start_idx == end_idx:
+        # Text after the match needs its own run carrying the original formatting
+        if after_text:
+            after_r = deepcopy(start_run._r)
+            start_run._r.addnext(after_r)
+            Run(after_r, start_run._parent).text = after_text
+    else:
+        # Runs fully covered by the match (including the end run when nothing
+        # follows the match) are detached from the shared <w:p> element in one
+        # loop; only the boundary run's text is rewritten
+        p = start_run._r.getparent()
+        covered_end = end_idx if after_text else end_idx + 1
+        for run in runs[start_idx + 1:covered_end]:
+            p.remove(run._r)
+        if after_text:
+            end_run.text = after_text
+    
+    if before_text:
+        replacement_r = deepcopy(start_run._r)
+        start_run._r.addnext(replacement_r)
+        start_run.text = before_text
+        run_texts[start_idx] = before_text
+        replacement_run = Run(replacement_r, start_run._parent)
+    else:
+        # Nothing precedes the match in this run, so it becomes the replacement run
+        replacement_run = start_run
+    
+    replacement_run.text = new_text
+    if formatting:
+        _apply_formatting_to_run(replacement_run, **formatting)
 
 
-def _apply_formatting_to_run(run, bold, italic, underline, color, font_size, font_name):
+def _format_span_in_runs(runs, run_texts, prefix, start_pos, end_pos, formatting):
+    """Apply formatting to the paragraph text span [start_pos, end_pos) in place.
+    
+    Format-only counterpart of _replace_span_in_runs: runs are split only where
+    the span starts or ends mid-run, text is never rewritten inside the span and
+    no runs are removed. The same snapshot rules apply.
+    """
+    start_idx, start_run_offset, end_idx, end_run_offset = _locate_span(prefix, start_pos, end_pos)
+    start_run = runs[start_idx]
+    end_run = runs[end_idx]
+    
+    # Split off text after the span first, so a start split below clones an
+    # already trimmed run
+    start_text = run_texts[start_idx]
+    end_text = run_texts[end_idx]
+    if end_run_offset < len(end_text):
+        after_r = deepcopy(end_run._r)
+        end_run._r.addnext(after_r)
+        Run(after_r, end_run._parent).text = end_text[end_run_offset:]
+        end_run.text = end_text[:end_run_offset]
+        if start_idx == end_idx:
+            start_text = end_text[:end_run_offset]
+    
+    if start_run_offset:
+        span_r = deepcopy(start_run._r)
+        start_run._r.addnext(span_r)
+        first_run = Run(span_r, start_run._parent)
+        first_run.text = start_text[start_run_offset:]
+        start_run.text = start_text[:start_run_offset]
+        run_texts[start_idx] = start_text[:start_run_offset]
+    else:
+        first_run = start_run
+    
+    _apply_formatting_to_run(first_run, **formatting)
+    for run in runs[start_idx + 1:end_idx + 1]:
+        _apply_formatting_to_run(run, **formatting)
+
+
+def _apply_formatting_to_run(run, bold=None, italic=None, underline=None, color=None,
+                             font_size=None, font_name=None):
     """Apply formatting to a run with error handling."""
     try:
         if bold is not None:
@@ -845,7 +1038,6 @@ def _apply_formatting_to_run(run, bold, italic, underline, color, font_size, fon
         if color:
             _apply_color_to_run(run, color)
         if font_size:
-            from docx.shared import Pt
             run.font.size = Pt(font_size)
         if font_name:
             run.font.name = font_name
@@ -871,48 +1063,125 @@ def _copy_run_formatting(source_run, target_run):
 
 
 def _apply_color_to_run(run, color):
-    """Apply color to a run with error handling."""
-    from docx.shared import RGBColor
-    
-    # Define common RGB colors
-    color_map = {
-        'red': RGBColor(255, 0, 0),
-        'blue': RGBColor(0, 0, 255),
-        'green': RGBColor(0, 128, 0),
-        'yellow': RGBColor(255, 255, 0),
-        'black': RGBColor(0, 0, 0),
-        'gray': RGBColor(128, 128, 128),
-        'white': RGBColor(255, 255, 255),
-        'purple': RGBColor(128, 0, 128),
-        'orange': RGBColor(255, 165, 0),
-        'brown': RGBColor(165, 42, 42),
-        'pink': RGBColor(255, 192, 203),
-        'cyan': RGBColor(0, 255, 255),
-        'magenta': RGBColor(255, 0, 255),
-        'lime': RGBColor(0, 255, 0),
-        'navy': RGBColor(0, 0, 128),
-        'maroon': RGBColor(128, 0, 0),
-        'olive': RGBColor(128, 128, 0),
-        'teal': RGBColor(0, 128, 128)
-    }
+    """Apply a named or "#RRGGBB" color to a run, falling back to black.
     
-    try:
-        if color.lower() in color_map:
-            run.font.color.rgb = color_map[color.lower()]
+    Hex colors are validated by _HEX_COLOR_RE before parsing, so the hot path
+    needs no exception handling.
+    """
+    rgb = _COLOR_MAP.get(color.lower()) if color else None
+    if rgb is None and color:
+        match = _HEX_COLOR_RE.fullmatch(color)
+        if match:
+            rgb = RGBColor(*bytes.fromhex(match.group(1)))
+    run.font.color.rgb = rgb or _BLACK
+
+
+def _iter_paragraph_elements(doc):
+    """Return the <w:p> elements of the body and of table cells in document order.
+    
+    Nested tables are included, and a cell spanned by a merge is visited once.
+    """
+    return doc.element.body.xpath('./w:p | .//w:tc/w:p')
+
+
+def _iter_document_paragraphs(doc):
+    """Yield Paragraph wrappers for _iter_paragraph_elements, one at a time."""
+    body = doc._body
+    for p in _iter_paragraph_elements(doc):
+        yield Paragraph(p, body)
+
+
+def _format_words_bulk(doc, word_specs, match_case=True, whole_words_only=True):
+    """Apply per-word formatting to an open document in a single paragraph pass.
+    
+    All words are searched together (see _find_word_spans), so each paragraph is
+    scanned once regardless of how many words are being formatted. Where words
+    overlap, the longest word starting at a position wins.
+    
+    Args:
+        doc: Open python-docx Document, modified in place
+        word_specs: Sequence of (word, formatting) pairs, where formatting holds
+            _apply_formatting_to_run keyword arguments
+        match_case: Whether to match case
+        whole_words_only: Whether to match whole words only
+    
+    Returns:
+        Dict mapping each word to the number of occurrences formatted
+    """
+    counts = {word: 0 for word, _ in word_specs}
+    if not word_specs:
+        return counts
+    words = tuple(word for word, _ in word_specs)
+    needles = words if match_case else tuple(word.casefold() for word in words)
+    # The raw <w:t> text is enough for the pre-filter unless a needle contains a
+    # character python-docx synthesizes from other run children
+    raw_text_filter = not any(ch in needle for needle in needles for ch in _SYNTHESIZED_RUN_CHARS)
+    body = doc._body
+    
+    for p in _iter_paragraph_elements(doc):
+        # Most paragraphs contain none of the words; skip them before building
+        # any python-docx wrappers
+        if raw_text_filter:
+            text = "".join(t.text or "" for t in p.iter(W_T))
         else:
-            # Try to parse as hex color (e.g., "#FF0000")
-            if color.startswith('#') and len(color) == 7:
-                hex_color = color[1:]
-                r = int(hex_color[0:2], 16)
-                g = int(hex_color[2:4], 16)
-                b = int(hex_color[4:6], 16)
-                run.font.color.rgb = RGBColor(r, g, b)
-            else:
-                # Default to black if color not recognized
-                run.font.color.rgb = RGBColor(0, 0, 0)
-    except Exception:
-        # Fallback to black
-        run.font.color.rgb = RGBColor(0, 0, 0)
+            text = Paragraph(p, body).text
+        if not _may_contain(text, needles, match_case):
+            continue
+        para = Paragraph(p, body)
+        runs = para.runs
+        if not runs:
+            continue
+        run_texts = [run.text for run in runs]
+        para_text = "".join(run_texts)
+        
+        spans = []
+        for start, end, i in _find_word_spans(para_text, words, match_case, whole_words_only):
+            word, formatting = word_specs[i]
+            counts[word] += 1
+            spans.append((start, end, None, formatting))
+        
+        if spans:
+            _apply_spans(para, runs, run_texts, spans)
+    
+    return counts
+
+
+def _check_format_target(filename):
+    """Return an error message if filename cannot be formatted in place, else None."""
+    if not os.path.exists(filename):
+        return f"Document {filename} does not exist"
+    
+    is_writeable, error_message = check_file_writeable(filename)
+    if not is_writeable:
+        return f"Cannot modify document: {error_message}. Consider creating a copy first."
+    
+    return None
+
+
+class FormatSession:
+    """Open a document once for a batch of edits and save it at most once.
+    
+    Set ``modified`` after changing ``doc``; the document is saved on a clean
+    exit only if it was modified, and never when the block raises.
+    
+    Example:
+        with FormatSession(filename) as session:
+            counts = _format_words_bulk(session.doc, word_specs)
+            session.modified = any(counts.values())
+    """
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.doc = Document(filename)
+        self.modified = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None and self.modified:
+            self.doc.save(self.filename)
+        return False
 
 
 def format_specific_words(filename: str, word_list: List[str], 
@@ -923,8 +1192,11 @@ def format_specific_words(filename: str, word_list: List[str],
                                font_size: Optional[int] = None,
                                font_name: Optional[str] = None,
                                match_case: bool = True,
-                               whole_words_only: bool = True) -> str:
-    """Format specific words throughout the document using enhanced search and replace.
+                               whole_words_only: bool = True,
+                               doc=None) -> str:
+    """Format specific words throughout the document.
+    
+    The document is loaded and saved once for the whole word list.
     
     Args:
         filename: Path to the Word document (resolved path from session management)
@@ -937,51 +1209,63 @@ def format_specific_words(filename: str, word_list: List[str],
         font_name: Font name/family
         match_case: Whether to match case (default True)
         whole_words_only: Whether to match whole words only (default True)
+        doc: Already open Document (e.g. FormatSession.doc); when given the
+            document is formatted in memory and neither loaded nor saved here
     """
-    total_count = 0
-    results = []
+    formatting = dict(bold=bold, italic=italic, underline=underline, color=color,
+                      font_size=font_size, font_name=font_name)
+    word_specs = [(word, formatting) for word in word_list]
+    
+    if doc is not None:
+        counts = _format_words_bulk(doc, word_specs, match_case, whole_words_only)
+    else:
+        error_msg = _check_format_target(filename)
+        if error_msg:
+            return error_msg
+        try:
+            with FormatSession(filename) as session:
+                counts = _format_words_bulk(session.doc, word_specs, match_case, whole_words_only)
+                session.modified = any(counts.values())
+        except Exception as e:
+            return f"Failed to format words in file: {str(e)}"
     
+    results = []
     for word in word_list:
-        # Use enhanced search and replace with same text for find and replace
-        # Pass filename directly since it's already resolved from session management
-        result = enhanced_search_and_replace(
-            filename=filename,  # Already resolved filename
-            find_text=word,
-            replace_text=word,  # Same text, just apply formatting
-            apply_formatting=True,
-            bold=bold,
-            italic=italic,
-            underline=underline,
-            color=color,
-            font_size=font_size,
-            font_name=font_name,
-            match_case=match_case,
-            whole_words_only=whole_words_only
-        )
-        results.append(f"'{word}': {result}")
+        if counts[word]:
+            results.append(f"'{word}': Formatted {counts[word]} occurrence(s)")
+        else:
+            results.append(f"'{word}': No occurrences found")
     
     return "\n".join(results)
 
 
+# Research paper term groups and the formatting applied to each group
+_RESEARCH_TERM_GROUPS = [
+    # Drug names in blue and bold
+    (["dolutegravir", "meloxicam", "dexamethasone", "DTG", "MLX", "DEX"], dict(bold=True, color="blue")),
+    # Polymer terms in green
+    (["polycaprolactone", "PCL", "mesophase", "crystallinity"], dict(color="green")),
+    # Statistical terms in red and italic
+    (["p < 0.05", "significant", "correlation", "ANOVA"], dict(italic=True, color="red")),
+    # Temperature values in orange
+    (["25°C", "50°C"], dict(color="orange")),
+]
+
 
 def format_research_paper_terms(filename: str) -> str:
     """Format common research terms in a PCL paper with appropriate styling - Academic research helper."""
+    word_specs = [(term, formatting) for terms, formatting in _RESEARCH_TERM_GROUPS for term in terms]
     
-    # Format drug names in blue and bold
-    drug_names = ["dolutegravir", "meloxicam", "dexamethasone", "DTG", "MLX", "DEX"]
-    format_specific_words(filename, drug_names, bold=True, color="blue")
-    
-    # Format polymer terms in green
-    polymer_terms = ["polycaprolactone", "PCL", "mesophase", "crystallinity"]
-    format_specific_words(filename, polymer_terms, color="green")
-    
-    # Format statistical terms in red and italic
-    stats_terms = ["p < 0.05", "significant", "correlation", "ANOVA"]
-    format_specific_words(filename, stats_terms, italic=True, color="red")
+    error_msg = _check_format_target(filename)
+    if error_msg:
+        return error_msg
     
-    # Format temperature values in orange
-    temp_terms = ["25°C", "50°C"]
-    format_specific_words(filename, temp_terms, color="orange")
+    try:
+        with FormatSession(filename) as session:
+            counts = _format_words_bulk(session.doc, word_specs)
+            session.modified = any(counts.values())
+    except Exception as e:
+        return f"Failed to format research paper terms: {str(e)}"
     
     return "Research paper terms formatted successfully!"
 
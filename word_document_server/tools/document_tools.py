@@ -1,14 +1,39 @@
 """
 Document creation and manipulation tools for Word Document Server.
 """
+import asyncio
+import io
 import os
+import re
 import json
-from typing import Dict, List, Optional, Any
+import zipfile
+from bisect import bisect_right
+from copy import deepcopy
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, List, Optional, Any, Tuple
 from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.exceptions import PackageNotFoundError
+from docx.opc.packuri import PackURI
+from docx.opc.part import Part
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, nsmap, qn
+from docx.text.paragraph import Paragraph
+from lxml import etree
+
+try:
+    import orjson
+except ImportError:  # Optional faster JSON encoder; the stdlib json module is used otherwise
+    orjson = None
 
 from word_document_server.utils.file_utils import check_file_writeable, ensure_docx_extension, create_document_copy
-from word_document_server.utils.document_utils import get_document_properties, extract_document_text, get_document_structure
-from word_document_server.utils.extended_document_utils import get_paragraph_text, find_text
+from word_document_server.utils.document_utils import (
+    W_P, W_R, W_RPR, coalesce_runs, get_document_properties, get_document_structure, load_cached_document,
+    load_live_document, live_document_element, parse_live_ooxml
+)
+from word_document_server.utils.extended_document_utils import find_text, iter_paragraph_texts
 from word_document_server.core.styles import ensure_heading_style, ensure_table_style
 
 
@@ -54,6 +79,11 @@ async def get_document_info(filename: str) -> str:
     Args:
         filename: Path to the Word document
     """
+    return _get_document_info_impl(filename)
+
+
+def _get_document_info_impl(filename: str) -> str:
+    """Synchronous body of get_document_info."""
     filename = ensure_docx_extension(filename)
     
     if not os.path.exists(filename):
@@ -61,11 +91,495 @@ async def get_document_info(filename: str) -> str:
     
     try:
         properties = get_document_properties(filename)
-        return json.dumps(properties, indent=2)
+        return _dumps(properties)
     except Exception as e:
         return f"Failed to get document info: {str(e)}"
 
 
+
+def _dumps(obj) -> str:
+    """Serialize a tool result as indented JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def _iter_search_matches(para_texts, search_term, match_case, whole_word):
+    """Yield (paragraph_index, start, end) for each match of search_term, in order.
+
+    The paragraphs are searched as one newline-joined buffer, so the whole
+    document is a single find/finditer scan instead of one per paragraph.
+    Offsets are relative to the paragraph; matches spanning a paragraph
+    break are skipped.
+    """
+    para_starts = [0, *accumulate(len(text) + 1 for text in para_texts)]
+    full_text = "\n".join(para_texts)
+    
+    if whole_word or not match_case:
+        # re.IGNORECASE keeps offsets aligned with full_text, which a
+        # lower()-ed copy does not guarantee for every character
+        pattern = _search_pattern(search_term, match_case, whole_word)
+        spans = (m.span() for m in pattern.finditer(full_text))
+    else:
+        spans = _find_spans(full_text, search_term)
+    
+    for start, end in spans:
+        para_idx = bisect_right(para_starts, start) - 1
+        if end < para_starts[para_idx + 1]:
+            yield para_idx, start - para_starts[para_idx], end - para_starts[para_idx]
+
+
+@lru_cache(maxsize=128)
+def _search_pattern(search_term, match_case, whole_word):
+    """Compile (once per distinct query) the regex used for get_text searches."""
+    pattern = re.escape(search_term)
+    if whole_word:
+        pattern = r'\b' + pattern + r'\b'
+    return re.compile(pattern, 0 if match_case else re.IGNORECASE)
+
+
+def _find_spans(text, sub):
+    """Yield non-overlapping (start, end) spans of sub in text using str.find."""
+    pos = text.find(sub)
+    while pos != -1:
+        end = pos + len(sub)
+        yield pos, end
+        pos = text.find(sub, end)
+
+
+def _str_if_set(value) -> Optional[str]:
+    return str(value) if value else None
+
+
+def _font_attr(name: str):
+    return lambda run, font: getattr(font, name)
+
+
+def _rfonts_attr(attr: str):
+    def get(run, font):
+        rPr = run._r.rPr
+        rFonts = rPr.rFonts if rPr is not None else None
+        return rFonts.get(qn(attr)) if rFonts is not None else None
+    return get
+
+
+def _paragraph_format_str(name: str):
+    return lambda paragraph, paragraph_format: _str_if_set(getattr(paragraph_format, name))
+
+
+def _paragraph_format_attr(name: str):
+    return lambda paragraph, paragraph_format: getattr(paragraph_format, name)
+
+
+# Run formatting fields, in output order: name -> getter(run, run.font)
+_RUN_FIELDS = {
+    "bold": lambda run, font: run.bold,
+    "italic": lambda run, font: run.italic,
+    "underline": lambda run, font: run.underline,
+    "font_name": _font_attr("name"),
+    "font_size": lambda run, font: _str_if_set(font.size),
+    "font_color": lambda run, font: _str_if_set(font.color.rgb),
+    "highlight_color": lambda run, font: _str_if_set(font.highlight_color),
+    "strike": _font_attr("strike"),
+    "double_strike": _font_attr("double_strike"),
+    "superscript": _font_attr("superscript"),
+    "subscript": _font_attr("subscript"),
+    "small_caps": _font_attr("small_caps"),
+    "all_caps": _font_attr("all_caps"),
+    "font_color_theme": lambda run, font: _str_if_set(font.color.theme_color),
+    "font_color_brightness": lambda run, font: getattr(font.color, 'brightness', None),
+    "emboss": _font_attr("emboss"),
+    "imprint": _font_attr("imprint"),
+    "outline": _font_attr("outline"),
+    "shadow": _font_attr("shadow"),
+    "snap_to_grid": _font_attr("snap_to_grid"),
+    "spec_vanish": _font_attr("spec_vanish"),
+    "web_hidden": _font_attr("web_hidden"),
+    "cs_bold": _font_attr("cs_bold"),
+    "cs_italic": _font_attr("cs_italic"),
+    "east_asia_font": _rfonts_attr("w:eastAsia"),
+    "complex_script_font": _rfonts_attr("w:cs"),
+}
+
+# Paragraph formatting fields, in output order: name -> getter(paragraph, paragraph_format)
+_PARAGRAPH_FIELDS = {
+    "style": lambda paragraph, paragraph_format: paragraph.style.name if paragraph.style else None,
+    "alignment": lambda paragraph, paragraph_format: _str_if_set(paragraph.alignment),
+    "left_indent": _paragraph_format_str("left_indent"),
+    "right_indent": _paragraph_format_str("right_indent"),
+    "first_line_indent": _paragraph_format_str("first_line_indent"),
+    "space_before": _paragraph_format_str("space_before"),
+    "space_after": _paragraph_format_str("space_after"),
+    "line_spacing": _paragraph_format_str("line_spacing"),
+    "keep_together": _paragraph_format_attr("keep_together"),
+    "keep_with_next": _paragraph_format_attr("keep_with_next"),
+    "page_break_before": _paragraph_format_attr("page_break_before"),
+    "widow_control": _paragraph_format_attr("widow_control"),
+    "line_spacing_rule": _paragraph_format_str("line_spacing_rule"),
+    "tab_stops": lambda paragraph, paragraph_format: [
+        {"position": str(tab.position), "alignment": str(tab.alignment), "leader": str(tab.leader)}
+        for tab in paragraph_format.tab_stops
+    ],
+}
+
+# formatting_detail presets as (run fields, paragraph fields)
+_FORMATTING_PRESETS = {
+    "basic": (
+        ("bold", "italic", "underline"),
+        ("style", "alignment"),
+    ),
+    "detailed": (
+        ("bold", "italic", "underline", "font_name", "font_size", "font_color", "highlight_color",
+         "strike", "double_strike", "superscript", "subscript", "small_caps", "all_caps"),
+        ("style", "alignment", "left_indent", "right_indent", "first_line_indent",
+         "space_before", "space_after", "line_spacing"),
+    ),
+    "comprehensive": (
+        tuple(_RUN_FIELDS),
+        tuple(_PARAGRAPH_FIELDS),
+    ),
+}
+
+
+def _select_fields(fields: List[str]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Split requested field names into (run fields, paragraph fields), in output order."""
+    requested = set(fields)
+    return (tuple(name for name in _RUN_FIELDS if name in requested),
+            tuple(name for name in _PARAGRAPH_FIELDS if name in requested))
+
+
+@dataclass
+class _TextQuery:
+    """Parameters of one get_text call, plus its per-call formatting caches."""
+    filename: str
+    live: bool
+    paragraph_index: Optional[int]
+    search_term: Optional[str]
+    start_paragraph: Optional[int]
+    end_paragraph: Optional[int]
+    formatting_detail: str
+    run_fields: Tuple[str, ...]
+    paragraph_fields: Tuple[str, ...]
+    max_results: int
+    match_case: bool
+    whole_word: bool
+    # Runs and paragraphs with identical rPr/pPr XML share a formatting dict;
+    # the returned dicts are only serialized, never modified
+    run_formats: Dict[Any, Dict[str, Any]] = field(default_factory=dict)
+    paragraph_formats: Dict[Any, Dict[str, Any]] = field(default_factory=dict)
+
+
+def _extract_run_formatting(run, query: _TextQuery, text: Optional[str] = None) -> Dict[str, Any]:
+    """Extract formatting information from a run (text may be passed if already read)."""
+    rPr = run._r.rPr
+    key = etree.tostring(rPr) if rPr is not None else None
+    cached = query.run_formats.get(key)
+    if cached is None:
+        cached = query.run_formats[key] = _run_formatting(run, query.run_fields)
+    return {"text": run.text if text is None else text, **cached}
+
+
+def _text_run_formatting(paragraph, query: _TextQuery) -> List[Dict[str, Any]]:
+    """Formatting of the paragraph's runs that contain non-whitespace text."""
+    runs = []
+    for run in paragraph.runs:
+        text = run.text
+        if text and not text.isspace():
+            runs.append(_extract_run_formatting(run, query, text))
+    return runs
+
+
+def _run_formatting(run, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    font = run.font
+    values = ((name, _RUN_FIELDS[name](run, font)) for name in fields)
+    # Leave out unset values for cleaner output
+    return {k: v for k, v in values if v is not None}
+
+
+def _extract_paragraph_formatting(paragraph, query: _TextQuery) -> Dict[str, Any]:
+    """Extract formatting information from a paragraph."""
+    pPr = paragraph._p.pPr
+    key = etree.tostring(pPr) if pPr is not None else None
+    cached = query.paragraph_formats.get(key)
+    if cached is None:
+        cached = query.paragraph_formats[key] = _paragraph_formatting(paragraph, query.paragraph_fields)
+    return cached
+
+
+def _paragraph_formatting(paragraph, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    paragraph_format = paragraph.paragraph_format
+    values = ((name, _PARAGRAPH_FIELDS[name](paragraph, paragraph_format)) for name in fields)
+    # Leave out unset values for cleaner output
+    return {k: v for k, v in values if v is not None}
+
+
+def _check_paragraph_index(paragraph_count: int, paragraph_index: int) -> str:
+    """Return an error message if paragraph_index is out of range, else ""."""
+    if paragraph_index >= paragraph_count:
+        return f"Invalid paragraph index: {paragraph_index}. Document has {paragraph_count} paragraphs (0-{paragraph_count-1})"
+    return ""
+
+
+def _check_paragraph_range(paragraph_count: int, start_paragraph: int, end_paragraph: int) -> str:
+    """Return an error message if the paragraph range is invalid, else ""."""
+    if start_paragraph >= paragraph_count:
+        return f"Invalid start_paragraph: {start_paragraph}. Document has {paragraph_count} paragraphs (0-{paragraph_count-1})"
+    
+    if end_paragraph >= paragraph_count:
+        return f"Invalid end_paragraph: {end_paragraph}. Document has {paragraph_count} paragraphs (0-{paragraph_count-1})"
+    
+    if start_paragraph > end_paragraph:
+        return f"Invalid range: start_paragraph ({start_paragraph}) must be <= end_paragraph ({end_paragraph})"
+    return ""
+
+
+def _all_text(doc, query: _TextQuery) -> str:
+    """scope="all" as plain text."""
+    if query.live:
+        # Read body paragraph text straight from the XML rather than
+        # through python-docx's Paragraph/Run proxies
+        return "\n".join(p.text for p in doc.element.body.iterchildren(W_P))
+    
+    # Files are streamed; as in extract_document_text, table cell text follows the body text
+    body, cells = [], []
+    for location, text in iter_paragraph_texts(query.filename):
+        (body if isinstance(location, int) else cells).append(text)
+    return "\n".join(body + cells)
+
+
+def _all_text_formatted(doc, query: _TextQuery) -> str:
+    """scope="all" as JSON with formatting."""
+    paragraphs = []
+    text_parts = []
+    
+    for i, paragraph in enumerate(doc.paragraphs):
+        text = paragraph._p.text
+        paragraphs.append({
+            "index": i,
+            "text": text,
+            "paragraph_formatting": _extract_paragraph_formatting(paragraph, query),
+            "runs": _text_run_formatting(paragraph, query)
+        })
+        text_parts.append(text)
+        text_parts.append("\n")
+    
+    result = {
+        "document_text": "".join(text_parts),
+        "paragraphs": paragraphs,
+        "formatting_detail": query.formatting_detail
+    }
+    
+    return _dumps(result)
+
+
+def _paragraph_text(doc, query: _TextQuery) -> str:
+    """scope="paragraph" as JSON with text and style."""
+    p_elements = doc.element.body.p_lst
+    error = _check_paragraph_index(len(p_elements), query.paragraph_index)
+    if error:
+        return error
+    
+    paragraph = Paragraph(p_elements[query.paragraph_index], doc._body)
+    style = paragraph.style
+    result = {
+        "index": query.paragraph_index,
+        "text": paragraph.text,
+        "style": style.name if style else "Normal",
+        "is_heading": style.name.startswith("Heading") if style else False
+    }
+    return _dumps(result)
+
+
+def _paragraph_text_formatted(doc, query: _TextQuery) -> str:
+    """scope="paragraph" as JSON with formatting."""
+    p_elements = doc.element.body.p_lst
+    error = _check_paragraph_index(len(p_elements), query.paragraph_index)
+    if error:
+        return error
+    
+    paragraph = Paragraph(p_elements[query.paragraph_index], doc._body)
+    result = {
+        "paragraph_index": query.paragraph_index,
+        "text": paragraph.text,
+        "paragraph_formatting": _extract_paragraph_formatting(paragraph, query),
+        "runs": _text_run_formatting(paragraph, query),
+        "formatting_detail": query.formatting_detail
+    }
+    
+    
+    return _dumps(result)
+
+
+def _search_text(doc, query: _TextQuery) -> str:
+    """scope="search" as JSON occurrences without formatting."""
+    if query.live:
+        # Live documents have no file for find_text, so search the loaded XML
+        occurrences = []
+        para_texts = [p.text for p in doc.element.body.iterchildren(W_P)]
+        
+        for para_idx, pos, end_pos in _iter_search_matches(para_texts, query.search_term,
+                                                           query.match_case, query.whole_word):
+            if len(occurrences) >= query.max_results:
+                break
+            
+            para_text = para_texts[para_idx]
+            context_start = max(0, pos - 50)
+            context_end = min(len(para_text), end_pos + 50)
+            
+            occurrences.append({
+                "paragraph_index": para_idx,
+                "character_position": pos,
+                "matched_text": para_text[pos:end_pos],
+                "context": para_text[context_start:context_end]
+            })
+        
+        result = {
+            "query": query.search_term,
+            "total_count": len(occurrences),
+            "occurrences": occurrences,
+            "source": "live_document"
+        }
+    else:
+        result = find_text(query.filename, query.search_term, query.match_case, query.whole_word)
+    
+    # Limit results if max_results is specified
+    if "occurrences" in result and len(result["occurrences"]) > query.max_results:
+        result["occurrences"] = result["occurrences"][:query.max_results]
+        result["total_count"] = len(result["occurrences"])
+        result["truncated"] = True
+    return _dumps(result)
+
+
+def _search_text_formatted(doc, query: _TextQuery) -> str:
+    """scope="search" as JSON occurrences with paragraph and run formatting."""
+    occurrences = []
+    paragraphs = doc.paragraphs
+    para_texts = [p._p.text for p in paragraphs]
+    last_para_idx = None
+    
+    for para_idx, pos, end_pos in _iter_search_matches(para_texts, query.search_term,
+                                                       query.match_case, query.whole_word):
+        paragraph = paragraphs[para_idx]
+        para_text = para_texts[para_idx]
+        
+        # Run offsets and paragraph formatting, built on the paragraph's first match
+        if para_idx != last_para_idx:
+            last_para_idx = para_idx
+            runs = paragraph.runs
+            offsets = list(accumulate((len(run.text) for run in runs), initial=0))
+            paragraph_formatting = _extract_paragraph_formatting(paragraph, query)
+        
+        # Extract context and formatting
+        context_start = max(0, pos - 50)
+        context_end = min(len(para_text), end_pos + 50)
+        context = para_text[context_start:context_end]
+        
+        # Find which run contains this text and extract its formatting
+        run_formatting = {}
+        if pos < offsets[-1]:
+            containing_run = runs[bisect_right(offsets, pos) - 1]
+            run_formatting = _extract_run_formatting(containing_run, query)
+        
+        occurrence = {
+            "paragraph_index": para_idx,
+            "character_position": pos,
+            "matched_text": para_text[pos:end_pos],
+            "context": context,
+            "paragraph_formatting": paragraph_formatting,
+            "run_formatting": run_formatting
+        }
+        
+        occurrences.append(occurrence)
+        
+        if len(occurrences) >= query.max_results:
+            break
+    
+    result = {
+        "query": query.search_term,
+        "match_case": query.match_case,
+        "whole_word": query.whole_word,
+        "formatting_detail": query.formatting_detail,
+        "total_count": len(occurrences),
+        "truncated": len(occurrences) >= query.max_results,
+        "occurrences": occurrences
+    }
+    
+    return _dumps(result)
+
+
+def _range_text(doc, query: _TextQuery) -> str:
+    """scope="range" as plain text, one labelled line per paragraph."""
+    if doc is None:
+        texts = [text for location, text in iter_paragraph_texts(query.filename) if isinstance(location, int)]
+    else:
+        texts = [p.text for p in doc.element.body.iterchildren(W_P)]
+    
+    error = _check_paragraph_range(len(texts), query.start_paragraph, query.end_paragraph)
+    if error:
+        return error
+    
+    text_parts = []
+    for i, text in enumerate(texts[query.start_paragraph:query.end_paragraph + 1]):
+        actual_index = query.start_paragraph + i
+        text_parts.append(f"[Paragraph {actual_index}] {text}")
+    
+    return "\n".join(text_parts)
+
+
+def _range_text_formatted(doc, query: _TextQuery) -> str:
+    """scope="range" as JSON with formatting."""
+    p_elements = doc.element.body.p_lst
+    error = _check_paragraph_range(len(p_elements), query.start_paragraph, query.end_paragraph)
+    if error:
+        return error
+    
+    # Wrap only the requested paragraphs rather than all of doc.paragraphs
+    paragraphs = [Paragraph(p, doc._body) for p in p_elements[query.start_paragraph:query.end_paragraph + 1]]
+    result = {
+        "start_paragraph": query.start_paragraph,
+        "end_paragraph": query.end_paragraph,
+        "formatting_detail": query.formatting_detail,
+        "paragraphs": []
+    }
+    
+    for i, paragraph in enumerate(paragraphs):
+        actual_index = query.start_paragraph + i
+        para_info = {
+            "index": actual_index,
+            "text": paragraph.text,
+            "paragraph_formatting": _extract_paragraph_formatting(paragraph, query),
+            "runs": _text_run_formatting(paragraph, query)
+        }
+        
+        result["paragraphs"].append(para_info)
+    
+    return _dumps(result)
+
+
+# Failures expected from reading a damaged or unusual package: not a zip, missing
+# parts, malformed XML, or python-docx rejecting content. Live requests still
+# catch everything, since the Add-in reports its errors as plain Exception.
+_READ_ERRORS = (
+    OSError, KeyError, IndexError, ValueError, AttributeError,
+    zipfile.BadZipFile, etree.XMLSyntaxError, PackageNotFoundError,
+)
+
+# File-mode handlers that read text with iter_paragraph_texts and get doc=None
+_STREAMED_FILE_SCOPES = {("all", False), ("search", False), ("range", False)}
+
+# get_text handlers keyed by (scope, include_formatting)
+_GET_TEXT_HANDLERS = {
+    ("all", False): _all_text,
+    ("all", True): _all_text_formatted,
+    ("paragraph", False): _paragraph_text,
+    ("paragraph", True): _paragraph_text_formatted,
+    ("search", False): _search_text,
+    ("search", True): _search_text_formatted,
+    ("range", False): _range_text,
+    ("range", True): _range_text_formatted,
+}
+
+
 async def get_text(
     document_id: str = None,
     filename: str = None,
@@ -78,7 +592,8 @@ async def get_text(
     formatting_detail: str = "basic",
     max_results: int = 100,
     match_case: bool = True,
-    whole_word: bool = False
+    whole_word: bool = False,
+    fields: Optional[List[str]] = None
 ) -> str:
     """Unified text extraction function combining document, paragraph, and search functionality.
     
@@ -132,6 +647,18 @@ async def get_text(
         whole_word (bool): Match whole words only for scope="search" (default: False)
             - True: "cat" won't match "catch"
             - False: "cat" will match "catch"
+        
+        fields (list[str], optional): Exact formatting fields to report when include_formatting=True
+            - Overrides the formatting_detail preset; only the listed attributes are read
+            - Run fields: bold, italic, underline, font_name, font_size, font_color,
+              highlight_color, strike, double_strike, superscript, subscript, small_caps,
+              all_caps, font_color_theme, font_color_brightness, emboss, imprint, outline,
+              shadow, snap_to_grid, spec_vanish, web_hidden, cs_bold, cs_italic,
+              east_asia_font, complex_script_font
+            - Paragraph fields: style, alignment, left_indent, right_indent, first_line_indent,
+              space_before, space_after, line_spacing, keep_together, keep_with_next,
+              page_break_before, widow_control, line_spacing_rule, tab_stops
+            - Example: ["bold", "italic", "style"]
     
     Returns:
         str: Extracted content in format determined by scope and formatting options:
@@ -193,7 +720,6 @@ async def get_text(
     """
     from word_document_server.utils.session_utils import resolve_document_path
     from word_document_server.session_manager import get_session_manager
-    import io
     
     # Resolve document path from document_id or filename
     filename, error_msg = resolve_document_path(document_id, filename)
@@ -210,6 +736,17 @@ async def get_text(
     if formatting_detail not in valid_details:
         return f"Invalid formatting_detail: {formatting_detail}. Must be one of: {', '.join(valid_details)}"
     
+    # Validate fields parameter; without it the formatting_detail preset applies
+    if fields is not None:
+        if isinstance(fields, str):
+            fields = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [str(name) for name in fields if name not in _RUN_FIELDS and name not in _PARAGRAPH_FIELDS]
+        if unknown or not fields:
+            return f"Invalid fields: {', '.join(unknown) or 'none given'}. Must be from: {', '.join([*_RUN_FIELDS, *_PARAGRAPH_FIELDS])}"
+        run_fields, paragraph_fields = _select_fields(fields)
+    else:
+        run_fields, paragraph_fields = _FORMATTING_PRESETS[formatting_detail]
+    
     # Validate scope-specific parameters
     if scope == "paragraph" and paragraph_index is None:
         return "Invalid parameter: paragraph_index is required when scope='paragraph'"
@@ -245,11 +782,19 @@ async def get_text(
         except (ValueError, TypeError):
             return "Invalid parameter: end_paragraph must be an integer"
     
+    try:
+        max_results = int(max_results)
+        if max_results < 1:
+            return "Invalid parameter: max_results must be a positive integer"
+    except (ValueError, TypeError):
+        return "Invalid parameter: max_results must be an integer"
+    
     # Get session manager to check for live connections
     session_manager = get_session_manager()
+    live = bool(document_id) and session_manager.is_document_live(document_id)
     
     # --- LIVE EDITING LOGIC ---
-    if document_id and session_manager.is_document_live(document_id):
+    if live:
         try:
             # Get current content from live document
             ooxml_response = await session_manager.send_live_request(document_id, "get_full_content")
@@ -257,10 +802,19 @@ async def get_text(
             if not ooxml_content:
                 return "Failed to retrieve content from live document"
             
-            # Create Document object from live content
-            doc = Document(io.BytesIO(ooxml_content.encode('utf-8')))
             print(f"[get_text] Operating in LIVE mode for document '{document_id}'")
             
+            if scope == "all" and not include_formatting and ooxml_content.lstrip().startswith('<'):
+                # Plain text only needs the body XML, so skip building a Document
+                document_element = live_document_element(parse_live_ooxml(ooxml_content))
+                if document_element is None:
+                    return "Failed to get live document content: no main document part"
+                body = document_element.find(qn('w:body'))
+                return "\n".join(p.text for p in body.iterchildren(W_P))
+            
+            # Create Document object from live content
+            doc = load_live_document(ooxml_content)
+            
         except Exception as e:
             return f"Failed to get live document content: {str(e)}"
     
@@ -269,362 +823,53 @@ async def get_text(
         if not os.path.exists(filename):
             return f"Document {filename} does not exist"
         
-        # Load document from file
-        doc = Document(filename)
+        # Plain-text scopes other than "paragraph" stream the XML and never need
+        # the object model; everything else loads it (cached until the file changes)
+        if (scope, bool(include_formatting)) in _STREAMED_FILE_SCOPES:
+            doc = None
+        else:
+            try:
+                doc = load_cached_document(filename)
+            except _READ_ERRORS as e:
+                return f"Error reading document: {str(e)}"
         print(f"[get_text] Operating in FILE mode for {filename}")
     
-    def extract_run_formatting(run, detail_level="basic"):
-        """Extract formatting information from a run."""
-        formatting = {
-            "text": run.text,
-        }
-        
-        if detail_level in ["basic", "detailed", "comprehensive"]:
-            # Basic formatting
-            formatting.update({
-                "bold": run.bold,
-                "italic": run.italic,
-                "underline": run.underline,
-            })
-        
-        if detail_level in ["detailed", "comprehensive"]:
-            # Detailed formatting
-            formatting.update({
-                "font_name": run.font.name,
-                "font_size": str(run.font.size) if run.font.size else None,
-                "font_color": str(run.font.color.rgb) if run.font.color.rgb else None,
-                "highlight_color": str(run.font.highlight_color) if run.font.highlight_color else None,
-                "strike": run.font.strike,
-                "double_strike": run.font.double_strike,
-                "superscript": run.font.superscript,
-                "subscript": run.font.subscript,
-                "small_caps": run.font.small_caps,
-                "all_caps": run.font.all_caps,
-            })
-        
-        if detail_level == "comprehensive":
-            # Comprehensive formatting
-            formatting.update({
-                "font_color_theme": str(run.font.color.theme_color) if run.font.color.theme_color else None,
-                "font_color_brightness": run.font.color.brightness if hasattr(run.font.color, 'brightness') else None,
-                "emboss": run.font.emboss,
-                "imprint": run.font.imprint,
-                "outline": run.font.outline,
-                "shadow": run.font.shadow,
-                "snap_to_grid": run.font.snap_to_grid,
-                "spec_vanish": run.font.spec_vanish,
-                "web_hidden": run.font.web_hidden,
-                "cs_bold": run.font.cs_bold,
-                "cs_italic": run.font.cs_italic,
-                "east_asia_font": run.font.name_east_asia,
-                "complex_script_font": run.font.name_cs,
-            })
-        
-        # Clean up None values for cleaner output
-        return {k: v for k, v in formatting.items() if v is not None}
-    
-    def extract_paragraph_formatting(paragraph, detail_level="basic"):
-        """Extract formatting information from a paragraph."""
-        formatting = {}
-        
-        if detail_level in ["basic", "detailed", "comprehensive"]:
-            # Basic paragraph formatting
-            formatting.update({
-                "style": paragraph.style.name if paragraph.style else None,
-                "alignment": str(paragraph.alignment) if paragraph.alignment else None,
-            })
-        
-        if detail_level in ["detailed", "comprehensive"]:
-            # Detailed paragraph formatting
-            paragraph_format = paragraph.paragraph_format
-            formatting.update({
-                "left_indent": str(paragraph_format.left_indent) if paragraph_format.left_indent else None,
-                "right_indent": str(paragraph_format.right_indent) if paragraph_format.right_indent else None,
-                "first_line_indent": str(paragraph_format.first_line_indent) if paragraph_format.first_line_indent else None,
-                "space_before": str(paragraph_format.space_before) if paragraph_format.space_before else None,
-                "space_after": str(paragraph_format.space_after) if paragraph_format.space_after else None,
-                "line_spacing": str(paragraph_format.line_spacing) if paragraph_format.line_spacing else None,
-            })
-        
-        if detail_level == "comprehensive":
-            # Comprehensive paragraph formatting
-            paragraph_format = paragraph.paragraph_format
-            formatting.update({
-                "keep_together": paragraph_format.keep_together,
-                "keep_with_next": paragraph_format.keep_with_next,
-                "page_break_before": paragraph_format.page_break_before,
-                "widow_control": paragraph_format.widow_control,
-                "line_spacing_rule": str(paragraph_format.line_spacing_rule) if paragraph_format.line_spacing_rule else None,
-                "tab_stops": [{"position": str(tab.position), "alignment": str(tab.alignment), "leader": str(tab.leader)} 
-                             for tab in paragraph_format.tab_stops] if paragraph_format.tab_stops else []
-            })
-        
-        # Clean up None values for cleaner output
-        return {k: v for k, v in formatting.items() if v is not None}
+    query = _TextQuery(
+        filename=filename,
+        live=live,
+        paragraph_index=paragraph_index,
+        search_term=search_term,
+        start_paragraph=start_paragraph,
+        end_paragraph=end_paragraph,
+        formatting_detail=formatting_detail,
+        run_fields=run_fields,
+        paragraph_fields=paragraph_fields,
+        max_results=max_results,
+        match_case=match_case,
+        whole_word=whole_word
+    )
     
     try:
-        if scope == "all":
-            # Original get_document_text functionality with optional formatting
-            if not include_formatting:
-                # For live documents, we need to extract text from the already loaded doc
-                if document_id and session_manager.is_document_live(document_id):
-                    return "\n".join([p.text for p in doc.paragraphs])
-                else:
-                    return extract_document_text(filename)
-            else:
-                # doc is already loaded above (either from live or file)
-                result = {
-                    "document_text": "",
-                    "paragraphs": [],
-                    "formatting_detail": formatting_detail
-                }
-                
-                for i, paragraph in enumerate(doc.paragraphs):
-                    para_info = {
-                        "index": i,
-                        "text": paragraph.text,
-                        "paragraph_formatting": extract_paragraph_formatting(paragraph, formatting_detail),
-                        "runs": []
-                    }
-                    
-                    for run in paragraph.runs:
-                        if run.text.strip():  # Only include runs with actual text
-                            para_info["runs"].append(extract_run_formatting(run, formatting_detail))
-                    
-                    result["paragraphs"].append(para_info)
-                    result["document_text"] += paragraph.text + "\n"
-                
-                return json.dumps(result, indent=2)
-        
-        elif scope == "paragraph":
-            # Original get_paragraph_text_from_document functionality with enhanced formatting
-            # doc is already loaded above (either from live or file)
-            
-            # Validate paragraph index
-            if paragraph_index >= len(doc.paragraphs):
-                return f"Invalid paragraph index: {paragraph_index}. Document has {len(doc.paragraphs)} paragraphs (0-{len(doc.paragraphs)-1})"
-            
-            paragraph = doc.paragraphs[paragraph_index]
-            
-            if not include_formatting:
-                result = get_paragraph_text(filename, paragraph_index)
-                return json.dumps(result, indent=2)
-            else:
-                result = {
-                    "paragraph_index": paragraph_index,
-                    "text": paragraph.text,
-                    "paragraph_formatting": extract_paragraph_formatting(paragraph, formatting_detail),
-                    "runs": [],
-                    "formatting_detail": formatting_detail
-                }
-                
-                for run in paragraph.runs:
-                    if run.text.strip():  # Only include runs with actual text
-                        result["runs"].append(extract_run_formatting(run, formatting_detail))
-                
-                return json.dumps(result, indent=2)
-        
-        elif scope == "search":
-            # Original find_text_in_document functionality with enhanced formatting
-            if not include_formatting:
-                # For live documents, we can't use find_text(filename, ...) so we'll process the doc directly
-                if document_id and session_manager.is_document_live(document_id):
-                    # Simple text search for live documents when formatting is not needed
-                    occurrences = []
-                    search_lower = search_term.lower() if not match_case else search_term
-                    
-                    for para_idx, paragraph in enumerate(doc.paragraphs):
-                        para_text = paragraph.text
-                        search_text = para_text.lower() if not match_case else para_text
-                        
-                        if whole_word:
-                            import re
-                            pattern = r'' + re.escape(search_lower) + r''
-                            matches = list(re.finditer(pattern, search_text, re.IGNORECASE if not match_case else 0))
-                        else:
-                            matches = []
-                            start = 0
-                            while True:
-                                pos = search_text.find(search_lower, start)
-                                if pos == -1:
-                                    break
-                                matches.append(type('Match', (), {'start': lambda: pos, 'end': lambda: pos + len(search_term)})())
-                                start = pos + 1
-                        
-                        for match in matches:
-                            if len(occurrences) >= max_results:
-                                break
-                            
-                            pos = match.start()
-                            end_pos = match.end()
-                            context_start = max(0, pos - 50)
-                            context_end = min(len(para_text), end_pos + 50)
-                            
-                            occurrences.append({
-                                "paragraph_index": para_idx,
-                                "character_position": pos,
-                                "matched_text": para_text[pos:end_pos],
-                                "context": para_text[context_start:context_end]
-                            })
-                        
-                        if len(occurrences) >= max_results:
-                            break
-                    
-                    result = {
-                        "query": search_term,
-                        "total_count": len(occurrences),
-                        "occurrences": occurrences,
-                        "source": "live_document"
-                    }
-                else:
-                    result = find_text(filename, search_term, match_case, whole_word)
-                # Limit results if max_results is specified
-                if "occurrences" in result and len(result["occurrences"]) > max_results:
-                    result["occurrences"] = result["occurrences"][:max_results]
-                    result["total_count"] = len(result["occurrences"])
-                    result["truncated"] = True
-                return json.dumps(result, indent=2)
-            else:
-                # doc is already loaded above (either from live or file)
-                occurrences = []
-                
-                search_lower = search_term.lower() if not match_case else search_term
-                
-                for para_idx, paragraph in enumerate(doc.paragraphs):
-                    para_text = paragraph.text
-                    search_text = para_text.lower() if not match_case else para_text
-                    
-                    # Find all occurrences in this paragraph
-                    start = 0
-                    while True:
-                        if whole_word:
-                            # Simple whole word matching
-                            import re
-                            pattern = r'\b' + re.escape(search_lower) + r'\b'
-                            match = re.search(pattern, search_text[start:], re.IGNORECASE if not match_case else 0)
-                            if match:
-                                pos = start + match.start()
-                                end_pos = start + match.end()
-                            else:
-                                break
-                        else:
-                            pos = search_text.find(search_lower, start)
-                            if pos == -1:
-                                break
-                            end_pos = pos + len(search_term)
-                        
-                        # Extract context and formatting
-                        context_start = max(0, pos - 50)
-                        context_end = min(len(para_text), end_pos + 50)
-                        context = para_text[context_start:context_end]
-                        
-                        # Find which run contains this text and extract its formatting
-                        char_count = 0
-                        containing_run = None
-                        run_formatting = {}
-                        
-                        for run in paragraph.runs:
-                            if char_count <= pos < char_count + len(run.text):
-                                containing_run = run
-                                run_formatting = extract_run_formatting(run, formatting_detail)
-                                break
-                            char_count += len(run.text)
-                        
-                        occurrence = {
-                            "paragraph_index": para_idx,
-                            "character_position": pos,
-                            "matched_text": para_text[pos:end_pos],
-                            "context": context,
-                            "paragraph_formatting": extract_paragraph_formatting(paragraph, formatting_detail),
-                            "run_formatting": run_formatting
-                        }
-                        
-                        occurrences.append(occurrence)
-                        
-                        if len(occurrences) >= max_results:
-                            break
-                        
-                        start = end_pos
-                    
-                    if len(occurrences) >= max_results:
-                        break
-                
-                result = {
-                    "query": search_term,
-                    "match_case": match_case,
-                    "whole_word": whole_word,
-                    "formatting_detail": formatting_detail,
-                    "total_count": len(occurrences),
-                    "truncated": len(occurrences) >= max_results,
-                    "occurrences": occurrences
-                }
-                
-                return json.dumps(result, indent=2)
-        
-        elif scope == "range":
-            # New functionality: extract paragraph range with optional formatting
-            # doc is already loaded above (either from live or file)
-            
-            # Validate range parameters
-            if start_paragraph >= len(doc.paragraphs):
-                return f"Invalid start_paragraph: {start_paragraph}. Document has {len(doc.paragraphs)} paragraphs (0-{len(doc.paragraphs)-1})"
-            
-            if end_paragraph >= len(doc.paragraphs):
-                return f"Invalid end_paragraph: {end_paragraph}. Document has {len(doc.paragraphs)} paragraphs (0-{len(doc.paragraphs)-1})"
-            
-            if start_paragraph > end_paragraph:
-                return f"Invalid range: start_paragraph ({start_paragraph}) must be <= end_paragraph ({end_paragraph})"
-            
-            # Extract text from paragraph range
-            paragraphs = doc.paragraphs[start_paragraph:end_paragraph + 1]
-            
-            if not include_formatting:
-                text_parts = []
-                for i, paragraph in enumerate(paragraphs):
-                    actual_index = start_paragraph + i
-                    text_parts.append(f"[Paragraph {actual_index}] {paragraph.text}")
-                
-                return "\n".join(text_parts)
-            else:
-                result = {
-                    "start_paragraph": start_paragraph,
-                    "end_paragraph": end_paragraph,
-                    "formatting_detail": formatting_detail,
-                    "paragraphs": []
-                }
-                
-                for i, paragraph in enumerate(paragraphs):
-                    actual_index = start_paragraph + i
-                    para_info = {
-                        "index": actual_index,
-                        "text": paragraph.text,
-                        "paragraph_formatting": extract_paragraph_formatting(paragraph, formatting_detail),
-                        "runs": []
-                    }
-                    
-                    for run in paragraph.runs:
-                        if run.text.strip():  # Only include runs with actual text
-                            para_info["runs"].append(extract_run_formatting(run, formatting_detail))
-                    
-                    result["paragraphs"].append(para_info)
-                
-                return json.dumps(result, indent=2)
-        
-    except Exception as e:
+        return _GET_TEXT_HANDLERS[(scope, bool(include_formatting))](doc, query)
+    except _READ_ERRORS as e:
         return f"Failed to extract text: {str(e)}"
 
 
-
 async def get_document_outline(filename: str) -> str:
     """Get the structure of a Word document.
     
     Args:
         filename: Path to the Word document
     """
+    return _get_document_outline_impl(filename)
+
+
+def _get_document_outline_impl(filename: str) -> str:
+    """Synchronous body of get_document_outline."""
     filename = ensure_docx_extension(filename)
     
     structure = get_document_structure(filename)
-    return json.dumps(structure, indent=2)
+    return _dumps(structure)
 
 
 async def list_available_documents(directory: str = ".") -> str:
@@ -633,22 +878,31 @@ async def list_available_documents(directory: str = ".") -> str:
     Args:
         directory: Directory to search for Word documents
     """
+    return _list_available_documents_impl(directory)
+
+
+def _list_available_documents_impl(directory: str) -> str:
+    """Synchronous body of list_available_documents."""
     try:
         if not os.path.exists(directory):
             return f"Directory {directory} does not exist"
         
-        docx_files = [f for f in os.listdir(directory) if f.endswith('.docx')]
+        # scandir entries usually carry the stat data from the directory read
+        with os.scandir(directory) as it:
+            docx_files = [
+                (entry.name, entry.stat().st_size)
+                for entry in it
+                if entry.name.endswith('.docx') and entry.is_file()
+            ]
         
         if not docx_files:
             return f"No Word documents found in {directory}"
         
-        result = f"Found {len(docx_files)} Word documents in {directory}:\n"
-        for file in docx_files:
-            file_path = os.path.join(directory, file)
-            size = os.path.getsize(file_path) / 1024  # KB
-            result += f"- {file} ({size:.2f} KB)\n"
+        lines = [f"Found {len(docx_files)} Word documents in {directory}:"]
+        for name, size in docx_files:
+            lines.append(f"- {name} ({size / 1024:.2f} KB)")
         
-        return result
+        return "\n".join(lines) + "\n"
     except Exception as e:
         return f"Failed to list documents: {str(e)}"
 
@@ -672,6 +926,180 @@ async def copy_document(source_filename: str, destination_filename: Optional[str
         return f"Failed to copy document: {message}"
 
 
+# Copied before the first paragraph of every source after the first one
+_PAGE_BREAK_P = parse_xml(f'<w:p {nsdecls("w")}><w:r><w:br w:type="page"/></w:r></w:p>')
+_R_PREFIX = f"{{{nsmap['r']}}}"
+_STYLE_REFS = etree.XPath(".//w:pStyle | .//w:rStyle | .//w:tblStyle", namespaces={"w": nsmap["w"]})
+_HAS_REL_REFS = etree.XPath("boolean(.//@*[namespace-uri() = $ns])")
+# Comment and note anchors; their w:id values point into the comments,
+# footnotes and endnotes parts of the package they came from
+_NOTE_MARKER_PATH = (
+    ".//w:commentRangeStart | .//w:commentRangeEnd | .//w:commentReference"
+    " | .//w:footnoteReference | .//w:endnoteReference"
+)
+_NOTE_MARKERS = etree.XPath(_NOTE_MARKER_PATH, namespaces={"w": nsmap["w"]})
+_HAS_NOTE_MARKERS = etree.XPath(f"boolean({_NOTE_MARKER_PATH})", namespaces={"w": nsmap["w"]})
+_PARTNAME_NUMBER = re.compile(r'\d*(\.[^./]+)$')
+_MAIN_PART = 'word/document.xml'
+# Parts the body XML depends on; sources must agree on them for a zip-level merge
+_SHARED_PARTS = (
+    'word/styles.xml', 'word/numbering.xml',
+    'word/comments.xml', 'word/footnotes.xml', 'word/endnotes.xml',
+)
+
+
+def _style_ids_by_name(doc) -> Dict[str, str]:
+    """Map each style name defined in a document to its style id."""
+    styles = {}
+    for style in doc.styles.element.iterchildren(qn('w:style')):
+        name = style.find(qn('w:name'))
+        if name is not None:
+            styles[name.get(qn('w:val'))] = style.get(qn('w:styleId'))
+    return styles
+
+
+def _copy_foreign_part(part, package, copied: Dict[Any, Part]) -> Part:
+    """Copy a part from another package into ``package`` under a fresh partname.
+
+    The part's own relationships are copied along with it, keeping their ids so
+    the copied XML still resolves. ``copied`` maps source parts to their copies,
+    so a part related more than once is copied once.
+    """
+    new_part = copied.get(part)
+    if new_part is not None:
+        return new_part
+    
+    template = _PARTNAME_NUMBER.sub(r'%d\1', part.partname)
+    taken = {p.partname for p in package.iter_parts()}
+    taken.update(p.partname for p in copied.values())
+    n = 1
+    while template % n in taken:
+        n += 1
+    new_part = Part(PackURI(template % n), part.content_type, part.blob, package)
+    copied[part] = new_part
+    
+    for r_id, rel in part.rels.items():
+        if rel.is_external:
+            new_part.rels.add_relationship(rel.reltype, rel.target_ref, r_id, is_external=True)
+        else:
+            child = _copy_foreign_part(rel.target_part, package, copied)
+            new_part.rels.add_relationship(rel.reltype, child, r_id)
+    return new_part
+
+
+def _strip_note_markers(element) -> None:
+    """Remove comment and footnote/endnote anchors from a copied body element.
+
+    Their ids only resolve in the source package, whose comments and notes
+    parts are not merged; a run holding nothing but the marker goes with it.
+    """
+    for marker in _NOTE_MARKERS(element):
+        parent = marker.getparent()
+        if parent is None:
+            continue
+        run = parent.getparent() if parent.tag == W_R else None
+        if run is not None and all(c is marker or c.tag == W_RPR for c in parent):
+            run.remove(parent)
+        else:
+            parent.remove(marker)
+
+
+def _relink_element(element, source_part, target_part, style_map: Optional[Dict[str, Optional[str]]],
+                    copied_parts: Optional[Dict[Any, Part]] = None) -> None:
+    """Point relationship ids and style references of a copied body element at the target.
+
+    Images are re-added to the target package and external targets (hyperlinks)
+    are re-related; other parts (headers, charts, embedded objects) are copied
+    under new partnames so they cannot collide with the target's own parts.
+    Style references are translated through ``style_map`` and dropped when the
+    target has no style of the same name, so the content falls back to the
+    target's default style. A ``style_map`` of None leaves style references
+    untouched. Comment and note markers are removed.
+    """
+    if copied_parts is None:
+        copied_parts = {}
+    _strip_note_markers(element)
+    for node in element.iter():
+        for attr, value in node.attrib.items():
+            if not attr.startswith(_R_PREFIX):
+                continue
+            rel = source_part.rels.get(value)
+            if rel is None:
+                continue
+            if rel.is_external:
+                node.set(attr, target_part.relate_to(rel.target_ref, rel.reltype, is_external=True))
+            elif rel.reltype == RT.IMAGE:
+                r_id, _ = target_part.get_or_add_image(io.BytesIO(rel.target_part.blob))
+                node.set(attr, r_id)
+            else:
+                new_part = _copy_foreign_part(rel.target_part, target_part.package, copied_parts)
+                node.set(attr, target_part.relate_to(new_part, rel.reltype))
+    if style_map is None:
+        return
+    for ref in _STYLE_REFS(element):
+        style_id = style_map.get(ref.get(qn('w:val')))
+        if style_id is None:
+            ref.getparent().remove(ref)
+        else:
+            ref.set(qn('w:val'), style_id)
+
+
+def _fast_merge(target_filename: str, source_paths: List[str], add_page_breaks: bool) -> bool:
+    """Merge documents by splicing their document.xml bodies at the zip level.
+
+    Only used when no reconciliation is needed: all sources share the same
+    styles, numbering, comments and notes parts, and no source after the
+    first refers to its own relationships (images, hyperlinks, section
+    headers) or carries comment, footnote or endnote markers. The merged body
+    is written into a copy of the first source's package.
+
+    Returns:
+        False, without writing anything, if the sources need the full merge
+    """
+    if not source_paths:
+        return False
+    shared = None
+    bodies = []
+    for i, path in enumerate(source_paths):
+        with zipfile.ZipFile(path) as zf:
+            names = set(zf.namelist())
+            if _MAIN_PART not in names:
+                return False
+            parts = tuple(zf.read(name) if name in names else None for name in _SHARED_PARTS)
+            if shared is None:
+                shared = parts
+            elif parts != shared:
+                return False
+            root = etree.fromstring(zf.read(_MAIN_PART))
+        body = root.find(qn('w:body'))
+        if body is None or (i > 0 and (_HAS_REL_REFS(body, ns=nsmap['r']) or _HAS_NOTE_MARKERS(body))):
+            return False
+        bodies.append((root, body))
+    
+    root, target_body = bodies[0]
+    target_sect_pr = target_body.find(qn('w:sectPr'))
+    if target_sect_pr is None:
+        return False
+    for _, body in bodies[1:]:
+        if add_page_breaks:
+            target_sect_pr.addprevious(deepcopy(_PAGE_BREAK_P))
+        for child in list(body.iterchildren(qn('w:p'), qn('w:tbl'))):
+            target_sect_pr.addprevious(child)
+    for p in target_body.iter(W_P):
+        coalesce_runs(p)
+    document_xml = etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+    
+    # Read the package fully before writing in case the target is also a source
+    with zipfile.ZipFile(source_paths[0]) as zf:
+        entries = [(info, zf.read(info)) for info in zf.infolist()]
+    tmp_filename = f"{target_filename}.tmp"
+    with zipfile.ZipFile(tmp_filename, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for info, data in entries:
+            zf.writestr(info, document_xml if info.filename == _MAIN_PART else data)
+    os.replace(tmp_filename, target_filename)
+    return True
+
+
 async def merge_documents(target_filename: str, source_filenames: List[str], add_page_breaks: bool = True) -> str:
     """Merge multiple Word documents into a single document.
     
@@ -680,8 +1108,6 @@ async def merge_documents(target_filename: str, source_filenames: List[str], add
         source_filenames: List of paths to source documents to merge
         add_page_breaks: If True, add page breaks between documents
     """
-    from word_document_server.core.tables import copy_table
-    
     target_filename = ensure_docx_extension(target_filename)
     
     # Check if target file is writeable
@@ -690,61 +1116,69 @@ async def merge_documents(target_filename: str, source_filenames: List[str], add
         return f"Cannot create target document: {error_message}"
     
     # Validate all source documents exist
-    missing_files = []
-    for filename in source_filenames:
-        doc_filename = ensure_docx_extension(filename)
-        if not os.path.exists(doc_filename):
-            missing_files.append(doc_filename)
+    source_paths = [ensure_docx_extension(f) for f in source_filenames]
+    exists = await asyncio.gather(*(asyncio.to_thread(os.path.exists, f) for f in source_paths))
+    missing_files = [f for f, ok in zip(source_paths, exists) if not ok]
     
     if missing_files:
         return f"Cannot merge documents. The following source files do not exist: {', '.join(missing_files)}"
     
+    tmp_filename = f"{target_filename}.tmp"
     try:
+        # Sources built from the same template can be spliced without python-docx
+        if await asyncio.to_thread(_fast_merge, target_filename, source_paths, add_page_breaks):
+            return f"Successfully merged {len(source_filenames)} documents into {target_filename}"
+        
         # Create a new document for the merged result
         target_doc = Document()
+        target_body = target_doc.element.body
+        # Body content goes before the final section properties
+        target_sect_pr = target_body.find(qn('w:sectPr'))
+        # Styles are matched by name, resolved once per document
+        target_style_ids = _style_ids_by_name(target_doc)
+        target_styles_xml = etree.tostring(target_doc.styles.element)
+        
+        # Open all sources up front; the parses run in worker threads so the
+        # zip reads and XML parsing of different files can overlap
+        source_docs = await asyncio.gather(
+            *(asyncio.to_thread(Document, f) for f in source_paths)
+        )
         
         # Process each source document
-        for i, filename in enumerate(source_filenames):
-            doc_filename = ensure_docx_extension(filename)
-            source_doc = Document(doc_filename)
-            
+        for i, source_doc in enumerate(source_docs):
+            # Parts copied over from this source, so each is copied once
+            copied_parts = {}
             # Add page break between documents (except before the first one)
             if add_page_breaks and i > 0:
-                target_doc.add_page_break()
+                target_sect_pr.addprevious(deepcopy(_PAGE_BREAK_P))
             
-            # Copy all paragraphs
-            for paragraph in source_doc.paragraphs:
-                # Create a new paragraph with the same text and style
-                new_paragraph = target_doc.add_paragraph(paragraph.text)
-                new_paragraph.style = target_doc.styles['Normal']  # Default style
-                
-                # Try to match the style if possible
-                try:
-                    if paragraph.style and paragraph.style.name in target_doc.styles:
-                        new_paragraph.style = target_doc.styles[paragraph.style.name]
-                except:
-                    pass
-                
-                # Copy run formatting
-                for i, run in enumerate(paragraph.runs):
-                    if i < len(new_paragraph.runs):
-                        new_run = new_paragraph.runs[i]
-                        # Copy basic formatting
-                        new_run.bold = run.bold
-                        new_run.italic = run.italic
-                        new_run.underline = run.underline
-                        # Font size if specified
-                        if run.font.size:
-                            new_run.font.size = run.font.size
+            # A source with the target's exact styles part needs no style mapping
+            if etree.tostring(source_doc.styles.element) == target_styles_xml:
+                style_map = None
+            else:
+                style_map = {
+                    style_id: target_style_ids.get(name)
+                    for name, style_id in _style_ids_by_name(source_doc).items()
+                }
             
-            # Copy all tables
-            for table in source_doc.tables:
-                copy_table(table, target_doc)
+            # Copy paragraphs and tables in document order, formatting included
+            for child in source_doc.element.body.iterchildren(qn('w:p'), qn('w:tbl')):
+                new_child = deepcopy(child)
+                _relink_element(new_child, source_doc.part, target_doc.part, style_map, copied_parts)
+                # Hand-edited sources often split text into many identically
+                # formatted runs; join them so the merged file stays small
+                for p in new_child.iter(W_P):
+                    coalesce_runs(p)
+                target_sect_pr.addprevious(new_child)
         
-        # Save the merged document
-        target_doc.save(target_filename)
+        # Save the merged document next to the target and swap it in, so a
+        # failed save never leaves a truncated target behind
+        target_doc.save(tmp_filename)
+        os.replace(tmp_filename, target_filename)
         return f"Successfully merged {len(source_filenames)} documents into {target_filename}"
     except Exception as e:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
         return f"Failed to merge documents: {str(e)}"
 
 
@@ -784,7 +1218,6 @@ def document_utility(
         # List Word documents in specific directory
         document_utility("list_files", "", "/Users/john/Documents")
     """
-    import asyncio
     from word_document_server.utils.session_utils import resolve_document_path
     
     # Validate action parameter
@@ -798,43 +1231,18 @@ def document_utility(
         if error_msg:
             return error_msg
     
-    # Delegate to appropriate original function based on action
+    # Delegate to the synchronous bodies of the original functions; they do
+    # no async work, so there is no event loop to enter here
     try:
-        import asyncio
-        
         if action == "info":
-            # Check if we're in an event loop
-            try:
-                loop = asyncio.get_running_loop()
-                # We're in a running loop, create a task
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, get_document_info(filename))
-                    return future.result()
-            except RuntimeError:
-                # No running loop, safe to use asyncio.run
-                return asyncio.run(get_document_info(filename))
+            return _get_document_info_impl(filename)
             
         elif action == "outline":
-            try:
-                loop = asyncio.get_running_loop()
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, get_document_outline(filename))
-                    return future.result()
-            except RuntimeError:
-                return asyncio.run(get_document_outline(filename))
+            return _get_document_outline_impl(filename)
             
         elif action == "list_files":
             search_dir = directory if directory else "."
-            try:
-                loop = asyncio.get_running_loop()
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, list_available_documents(search_dir))
-                    return future.result()
-            except RuntimeError:
-                return asyncio.run(list_available_documents(search_dir))
+            return _list_available_documents_impl(search_dir)
             
     except Exception as e:
         return f"Error in document_utility: {str(e)}"
@@ -3,17 +3,33 @@ Extended document tools for Word Document Server.
 
 These tools provide enhanced document content extraction and search capabilities.
 """
+import asyncio
 import os
 import subprocess
 import platform
 import shutil
-from typing import Optional
+from typing import List, Optional
 from docx import Document
 
 from word_document_server.utils.file_utils import check_file_writeable, ensure_docx_extension
 from word_document_server.utils.session_utils import resolve_document_path
 
 
+# LibreOffice executable that last converted successfully, reused by later calls
+_SOFFICE_CMD: Optional[str] = None
+
+
+def _libreoffice_commands(system: str) -> List[str]:
+    """Return the LibreOffice executables to try, resolved on PATH without spawning them."""
+    if _SOFFICE_CMD:
+        return [_SOFFICE_CMD]
+    if system == "Darwin":  # macOS
+        candidates = ["soffice", "/Applications/LibreOffice.app/Contents/MacOS/soffice"]
+    else:  # Linux
+        candidates = ["libreoffice", "soffice"]
+    return [path for path in map(shutil.which, candidates) if path]
+
+
 async def convert_to_pdf(document_id: str = None, filename: str = None, output_filename: Optional[str] = None) -> str:
     """Convert a Word document to PDF format.
     
@@ -23,6 +39,8 @@ async def convert_to_pdf(document_id: str = None, filename: str = None, output_f
         output_filename: Optional path for the output PDF. If not provided, 
                          will use the same name with .pdf extension
     """
+    global _SOFFICE_CMD
+    
     # Resolve document path from session or filename
     filename, error_msg = resolve_document_path(document_id, filename)
     if error_msg:
@@ -40,16 +58,9 @@ async def convert_to_pdf(document_id: str = None, filename: str = None, output_f
     elif not output_filename.lower().endswith('.pdf'):
         output_filename = f"{output_filename}.pdf"
     
-    # Convert to absolute path if not already
-    if not os.path.isabs(output_filename):
-        output_filename = os.path.abspath(output_filename)
-    
-    # Ensure the output directory exists
+    # Resolve the output location once; an absolute path always has a directory
+    output_filename = os.path.abspath(output_filename)
     output_dir = os.path.dirname(output_filename)
-    if not output_dir:
-        output_dir = os.path.abspath('.')
-    
-    # Create the directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
     # Check if output file can be written
@@ -73,26 +84,19 @@ async def convert_to_pdf(document_id: str = None, filename: str = None, output_f
         elif system in ["Linux", "Darwin"]:  # Linux or macOS
             # Try using LibreOffice if available (common on Linux/macOS)
             try:
-                # Choose the appropriate command based on OS
-                if system == "Darwin":  # macOS
-                    lo_commands = ["soffice", "/Applications/LibreOffice.app/Contents/MacOS/soffice"]
-                else:  # Linux
-                    lo_commands = ["libreoffice", "soffice"]
+                lo_commands = _libreoffice_commands(system)
+                
+                # LibreOffice names the PDF after the source document
+                pdf_base_name = os.path.splitext(os.path.basename(filename))[0] + ".pdf"
+                created_pdf = os.path.join(output_dir, pdf_base_name)
                 
-                # Try each possible command
+                # Try each installed command
                 conversion_successful = False
-                errors = []
+                errors = [] if lo_commands else ["LibreOffice executable not found on PATH"]
                 
                 for cmd_name in lo_commands:
                     try:
                         # Construct LibreOffice conversion command
-                        output_dir = os.path.dirname(output_filename)
-                        # If output_dir is empty, use current directory
-                        if not output_dir:
-                            output_dir = '.'
-                        # Ensure the directory exists
-                        os.makedirs(output_dir, exist_ok=True)
-                        
                         cmd = [
                             cmd_name, 
                             '--headless', 
@@ -103,23 +107,28 @@ async def convert_to_pdf(document_id: str = None, filename: str = None, output_f
                             filename
                         ]
                         
-                        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+                        # Run without blocking the event loop while LibreOffice works
+                        proc = await asyncio.create_subprocess_exec(
+                            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                        )
+                        try:
+                            _, stderr = await asyncio.wait_for(proc.communicate(), timeout=60)
+                        except asyncio.TimeoutError:
+                            proc.kill()
+                            await proc.wait()
+                            raise subprocess.TimeoutExpired(cmd, 60)
                         
-                        if result.returncode == 0:
-                            # LibreOffice creates the PDF with the same basename
-                            base_name = os.path.basename(filename)
-                            pdf_base_name = os.path.splitext(base_name)[0] + ".pdf"
-                            created_pdf = os.path.join(os.path.dirname(output_filename) or '.', pdf_base_name)
-                            
+                        if proc.returncode == 0:
                             # If the created PDF is not at the desired location, move it
                             if created_pdf != output_filename and os.path.exists(created_pdf):
                                 shutil.move(created_pdf, output_filename)
                             
+                            _SOFFICE_CMD = cmd_name
                             conversion_successful = True
                             break  # Exit the loop if successful
                         else:
-                            errors.append(f"{cmd_name} error: {result.stderr}")
-                    except (subprocess.SubprocessError, FileNotFoundError) as e:
+                            errors.append(f"{cmd_name} error: {stderr.decode(errors='replace')}")
+                    except (subprocess.SubprocessError, OSError) as e:
                         errors.append(f"{cmd_name} error: {str(e)}")
                 
                 if conversion_successful:
@@ -5,12 +5,25 @@ These tools handle footnote and endnote functionality,
 including adding, customizing, and converting between them.
 """
 import os
-from typing import Optional
+from typing import Callable, Optional
 from docx import Document
+from docx.oxml.ns import qn
 
 from word_document_server.utils.file_utils import check_file_writeable, ensure_docx_extension
 
 
+def _has_note_heading(doc, is_heading: Callable[[str], bool]) -> bool:
+    """Check whether the document already has a notes heading paragraph.
+
+    The heading is appended after the body text, so body paragraphs are
+    scanned from the end and the scan stops at the first match.
+    """
+    for p in reversed(doc.element.body.findall(qn('w:p'))):
+        if is_heading(p.text):
+            return True
+    return False
+
+
 async def add_note(
     document_id: str = None,
     filename: str = None,
@@ -194,10 +207,11 @@ async def add_note(
         doc = Document(filename)
         
         # Validate paragraph index
-        if paragraph_index >= len(doc.paragraphs):
-            return f"Invalid paragraph index: {paragraph_index}. Document has {len(doc.paragraphs)} paragraphs (0-{len(doc.paragraphs)-1})."
+        paragraphs = doc.paragraphs
+        if paragraph_index >= len(paragraphs):
+            return f"Invalid paragraph index: {paragraph_index}. Document has {len(paragraphs)} paragraphs (0-{len(paragraphs)-1})."
         
-        paragraph = doc.paragraphs[paragraph_index]
+        paragraph = paragraphs[paragraph_index]
         
         # Determine reference symbol
         if symbol is None:
@@ -207,9 +221,10 @@ async def add_note(
                 symbol = "†"  # Unicode dagger symbol
         
         # Add note reference to paragraph
-        if position == "beginning" and paragraph.runs:
+        runs = paragraph.runs
+        if position == "beginning" and runs:
             # Insert at beginning by modifying first run
-            first_run = paragraph.runs[0]
+            first_run = runs[0]
             first_run.text = symbol + first_run.text
             first_run.font.superscript = True
         else:
@@ -220,32 +235,24 @@ async def add_note(
         # Handle note section creation/updating
         if note_type == "footnote":
             # Find or create footnotes section
-            footnote_section_found = False
-            for p in doc.paragraphs:
-                if p.text.startswith("Footnotes:"):
-                    footnote_section_found = True
-                    break
+            footnote_section_found = _has_note_heading(doc, lambda text: text.startswith("Footnotes:"))
             
             if not footnote_section_found:
-                # Add footnotes section
-                doc.add_paragraph("\\n").add_run()
+                # Add footnotes section after an empty separator paragraph
+                doc.add_paragraph()
                 footnotes_heading = doc.add_paragraph("Footnotes:")
                 footnotes_heading.bold = True
             
             # Add footnote text
             footnote_para = doc.add_paragraph(f"{symbol} {note_text}")
-            if "Footnote Text" in doc.styles:
+            try:
                 footnote_para.style = "Footnote Text"
-            else:
+            except KeyError:
                 footnote_para.style = "Normal"
         
         else:  # endnote
             # Find or create endnotes section
-            endnotes_heading_found = False
-            for para in doc.paragraphs:
-                if para.text in ["Endnotes:", "ENDNOTES"]:
-                    endnotes_heading_found = True
-                    break
+            endnotes_heading_found = _has_note_heading(doc, lambda text: text in ("Endnotes:", "ENDNOTES"))
             
             if not endnotes_heading_found:
                 # Add page break before endnotes section
@@ -254,9 +261,9 @@ async def add_note(
             
             # Add endnote text
             endnote_para = doc.add_paragraph(f"{symbol} {note_text}")
-            if "Endnote Text" in doc.styles:
+            try:
                 endnote_para.style = "Endnote Text"
-            else:
+            except KeyError:
                 endnote_para.style = "Normal"
         
         doc.save(filename)
@@ -5,13 +5,16 @@ These tools handle document protection features such as
 password protection, restricted editing, and digital signatures.
 """
 import os
-import json
 import shutil
 import hashlib
 import datetime
 import io 
+import zipfile
 from typing import List, Optional, Dict, Any
+from xml.sax.saxutils import escape
 from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
 import msoffcrypto 
 
 from word_document_server.utils.file_utils import check_file_writeable, ensure_docx_extension
@@ -22,10 +25,64 @@ from word_document_server.utils.session_utils import resolve_document_path
 from word_document_server.core.protection import (
     add_protection_info,
     verify_document_protection,
-    create_signature_info
+    create_signature_info,
+    hash_document_content,
+    hash_file_content,
+    hashes_match,
+    load_protection_metadata,
+    write_protection_metadata,
+    protection_paths,
+    CONTENT_HASH_ALGORITHM,
+    LEGACY_CONTENT_HASH_ALGORITHM
 )
 
 
+_VALID_ACTIONS = frozenset(("protect", "unprotect", "verify", "status"))
+_VALID_ACTIONS_MSG = "protect, unprotect, verify, status"
+_VALID_TYPES = frozenset(("password", "restricted", "signature"))
+_VALID_TYPES_MSG = "password, restricted, signature"
+
+
+def _backup_file(filename: str, backup_filename: str) -> None:
+    """Keep a rollback copy of filename, as a hard link when the filesystem allows it.
+
+    Rewrites replace the document with a new file via os.replace, so the linked
+    backup keeps pointing at the original contents.
+    """
+    try:
+        os.link(filename, backup_filename)
+    except OSError:
+        shutil.copy2(filename, backup_filename)
+
+
+def _restore_backup(backup_filename: str, filename: str) -> None:
+    """Put a backup made by _backup_file back in place of filename."""
+    os.replace(backup_filename, filename)
+    # rename() is a no-op when both names already link to the same file
+    if os.path.exists(backup_filename):
+        os.unlink(backup_filename)
+
+
+def _add_signature_block(doc, lines: List[str], bold_first: bool = False) -> None:
+    """Append a spacer paragraph and a paragraph showing lines separated by line breaks.
+
+    The block is built as XML and inserted before the body's section properties
+    in one step instead of through a series of add_paragraph/add_run calls.
+    """
+    runs = []
+    for i, line in enumerate(lines):
+        rpr = '<w:rPr><w:b/></w:rPr>' if bold_first and i == 0 else ''
+        br = '<w:br/>' if i else ''
+        runs.append(f'<w:r>{rpr}{br}<w:t xml:space="preserve">{escape(line)}</w:t></w:r>')
+    body = doc.element.body
+    sect_pr = body.find(qn('w:sectPr'))
+    for p in (parse_xml(f'<w:p {nsdecls("w")}/>'), parse_xml(f'<w:p {nsdecls("w")}>{"".join(runs)}</w:p>')):
+        if sect_pr is not None:
+            sect_pr.addprevious(p)
+        else:
+            body.append(p)
+
+
 async def add_digital_signature(document_id: str = None, filename: str = None, signer_name: str = None, reason: Optional[str] = None) -> str:
     """Add a digital signature to a Word document.
 
@@ -66,13 +123,12 @@ async def add_digital_signature(document_id: str = None, filename: str = None, s
 
         if success:
             # Add a visible signature block to the document
-            doc.add_paragraph("").add_run()  # Add empty paragraph for spacing
-            signature_para = doc.add_paragraph()
-            signature_para.add_run(f"Digitally signed by: {signer_name}").bold = True
+            lines = [f"Digitally signed by: {signer_name}"]
             if reason:
-                signature_para.add_run(f"\nReason: {reason}")
-            signature_para.add_run(f"\nDate: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            signature_para.add_run(f"\nSignature ID: {signature_info['content_hash'][:8]}")
+                lines.append(f"Reason: {reason}")
+            lines.append(f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            lines.append(f"Signature ID: {signature_info['content_hash'][:8]}")
+            _add_signature_block(doc, lines, bold_first=True)
 
             # Save the document with the visible signature
             doc.save(filename)
@@ -109,14 +165,11 @@ async def verify_document(document_id: str = None, filename: str = None, passwor
             return f"Document verification failed: {message}"
 
         # If document has a digital signature, verify content integrity
-        base_path, _ = os.path.splitext(filename)
-        metadata_path = f"{base_path}.protection"
+        paths = protection_paths(filename)
 
-        if os.path.exists(metadata_path):
+        if os.path.exists(paths.metadata):
             try:
-                import json
-                with open(metadata_path, 'r') as f:
-                    protection_data = json.load(f)
+                protection_data = load_protection_metadata(paths.metadata)
 
                 if protection_data.get("type") == "signature":
                     # Get the original content hash
@@ -125,18 +178,30 @@ async def verify_document(document_id: str = None, filename: str = None, passwor
 
                     if original_hash:
                         # Calculate current content hash
-                        doc = Document(filename)
-                        text_content = "\n".join([p.text for p in doc.paragraphs])
-                        current_hash = hashlib.sha256(text_content.encode()).hexdigest()
+                        algorithm = signature_info.get("algo", LEGACY_CONTENT_HASH_ALGORITHM)
+                        current_hash = hash_file_content(filename, algorithm)
 
                         # Compare hashes
-                        if current_hash != original_hash:
+                        if not hashes_match(original_hash, current_hash):
                             return f"Document has been modified since it was signed by {signature_info.get('signer')}"
                         else:
                             return f"Document signature is valid. Signed by {signature_info.get('signer')} on {signature_info.get('timestamp')}"
             except Exception as e:
                 return f"Error verifying signature: {str(e)}"
 
+        # Signatures added through manage_protection live in their own sidecar
+        if os.path.exists(paths.signature):
+            try:
+                signature_data = load_protection_metadata(paths.signature)
+                algorithm = signature_data.get("algo", LEGACY_CONTENT_HASH_ALGORITHM)
+                current_hash = hash_file_content(filename, algorithm)
+                signer = signature_data.get("signer_name", "Unknown")
+                if not hashes_match(signature_data.get("content_hash"), current_hash):
+                    return f"Document has been modified since it was signed by {signer}"
+                return f"Document signature is valid. Signed by {signer} on {signature_data.get('timestamp')}"
+            except Exception as e:
+                return f"Error verifying signature: {str(e)}"
+
         return message
     except Exception as e:
         return f"Failed to verify document: {str(e)}"
@@ -149,7 +214,8 @@ async def manage_protection(
     password: Optional[str] = None,
     editable_sections: Optional[List[str]] = None,
     signer_name: Optional[str] = None,
-    signature_reason: Optional[str] = None
+    signature_reason: Optional[str] = None,
+    visible_signature: bool = True
 ) -> str:
     """Unified document protection management function for comprehensive security control.
     
@@ -196,6 +262,11 @@ async def manage_protection(
             - Documents the purpose of signature
             - Appears in signature properties
             - Example: "Final approval", "Author verification", "Editorial review"
+        
+        visible_signature (bool, optional): Append a visible signature block
+            - Used with action="protect" and protection_type="signature"
+            - True: Add the block to the document and save it (default)
+            - False: Only write the .signature metadata; the document file is not rewritten
     
     Returns:
         str: Status message describing operation result and protection state:
@@ -331,14 +402,12 @@ async def manage_protection(
         return "Error: protection_type parameter is required"
     
     # Validate action parameter
-    valid_actions = ["protect", "unprotect", "verify", "status"]
-    if action not in valid_actions:
-        return f"Invalid action: {action}. Must be one of: {', '.join(valid_actions)}"
+    if action not in _VALID_ACTIONS:
+        return f"Invalid action: {action}. Must be one of: {_VALID_ACTIONS_MSG}"
     
     # Validate protection_type parameter
-    valid_types = ["password", "restricted", "signature"]
-    if protection_type not in valid_types:
-        return f"Invalid protection_type: {protection_type}. Must be one of: {', '.join(valid_types)}"
+    if protection_type not in _VALID_TYPES:
+        return f"Invalid protection_type: {protection_type}. Must be one of: {_VALID_TYPES_MSG}"
     
     # Validate action + type specific parameters
     if action == "protect":
@@ -361,22 +430,27 @@ async def manage_protection(
     if not os.path.exists(filename):
         return f"Document {filename} does not exist"
     
+    paths = protection_paths(filename)
+    
     try:
         if action == "status":
             # Check protection status
             if protection_type == "password":
+                # Only the container header is read: encrypted Office files are
+                # OLE compound files, unencrypted .docx files are zip archives
                 try:
-                    doc = Document(filename)
-                    return f"Document {filename} is not password protected (can be opened without password)"
+                    with open(filename, "rb") as f:
+                        encrypted = msoffcrypto.OfficeFile(f).is_encrypted()
                 except Exception:
-                    return f"Document {filename} appears to be password protected or corrupted"
+                    encrypted = True
+                if not encrypted and zipfile.is_zipfile(filename):
+                    return f"Document {filename} is not password protected (can be opened without password)"
+                return f"Document {filename} appears to be password protected or corrupted"
             
             elif protection_type == "restricted":
-                protection_file = filename + ".protection"
-                if os.path.exists(protection_file):
+                if os.path.exists(paths.protection):
                     try:
-                        with open(protection_file, 'r') as f:
-                            protection_data = json.load(f)
+                        protection_data = load_protection_metadata(paths.protection)
                         return f"Document {filename} has restricted editing protection. Editable sections: {protection_data.get('editable_sections', [])}"
                     except Exception:
                         return f"Document {filename} has protection metadata but it's corrupted"
@@ -384,11 +458,9 @@ async def manage_protection(
                     return f"Document {filename} has no restricted editing protection"
             
             elif protection_type == "signature":
-                signature_file = filename + ".signature"
-                if os.path.exists(signature_file):
+                if os.path.exists(paths.signature):
                     try:
-                        with open(signature_file, 'r') as f:
-                            signature_data = json.load(f)
+                        signature_data = load_protection_metadata(paths.signature)
                         return f"Document {filename} is digitally signed by {signature_data.get('signer_name', 'Unknown')} on {signature_data.get('timestamp', 'Unknown date')}"
                     except Exception:
                         return f"Document {filename} has signature metadata but it's corrupted"
@@ -404,11 +476,8 @@ async def manage_protection(
             if protection_type == "password":
                 # Password protection using msoffcrypto
                 try:
-                    import msoffcrypto
-                    
                     # Create backup
-                    backup_filename = filename + ".backup"
-                    shutil.copy2(filename, backup_filename)
+                    _backup_file(filename, paths.backup)
                     
                     try:
                         # Read file and encrypt it
@@ -422,12 +491,12 @@ async def manage_protection(
                     
                     except Exception as e:
                         # Restore backup on failure
-                        shutil.move(backup_filename, filename)
+                        _restore_backup(paths.backup, filename)
                         return f"Failed to add password protection: {str(e)}"
                     finally:
                         # Clean up backup if successful
-                        if os.path.exists(backup_filename):
-                            os.remove(backup_filename)
+                        if os.path.exists(paths.backup):
+                            os.remove(paths.backup)
                 
                 except ImportError:
                     return "Password protection requires msoffcrypto library. Please install it with: pip install msoffcrypto-tool"
@@ -438,40 +507,46 @@ async def manage_protection(
                     "type": "restricted_editing",
                     "password_hash": hashlib.sha256(password.encode()).hexdigest(),
                     "editable_sections": editable_sections,
-                    "created": datetime.now().isoformat()
+                    "created": datetime.datetime.now().isoformat()
                 }
                 
-                protection_file = filename + ".protection"
-                with open(protection_file, 'w') as f:
-                    json.dump(protection_data, f, indent=2)
+                write_protection_metadata(paths.protection, protection_data)
                 
                 return f"Restricted editing protection added to {filename}. Editable sections: {', '.join(editable_sections)}"
             
             elif protection_type == "signature":
                 # Digital signature protection
-                doc = Document(filename)
+                now = datetime.datetime.now()
+                reason = signature_reason or "Document approval"
                 
-                # Calculate content hash for integrity
-                content = "\\n".join([p.text for p in doc.paragraphs])
-                content_hash = hashlib.sha256(content.encode()).hexdigest()
+                if visible_signature:
+                    # Add visible signature to document; it is part of the
+                    # signed content, so hash after adding it
+                    doc = Document(filename)
+                    _add_signature_block(doc, [
+                        "--- DIGITAL SIGNATURE ---",
+                        f"Signed by: {signer_name}",
+                        f"Reason: {reason}",
+                        f"Date: {now.strftime('%Y-%m-%d %H:%M:%S')}",
+                        "--- END SIGNATURE ---",
+                    ])
+                    content_hash = hash_document_content(doc)
+                    doc.save(filename)
+                else:
+                    # Metadata only: the document file is left untouched
+                    content_hash = hash_file_content(filename)
                 
                 # Create signature data
                 signature_data = {
                     "signer_name": signer_name,
-                    "reason": signature_reason or "Document approval",
-                    "timestamp": datetime.now().isoformat(),
+                    "reason": reason,
+                    "timestamp": now.isoformat(),
+                    "algo": CONTENT_HASH_ALGORITHM,
                     "content_hash": content_hash
                 }
                 
                 # Save signature metadata
-                signature_file = filename + ".signature"
-                with open(signature_file, 'w') as f:
-                    json.dump(signature_data, f, indent=2)
-                
-                # Add visible signature to document
-                signature_text = f"\\n\\n--- DIGITAL SIGNATURE ---\\nSigned by: {signer_name}\\nReason: {signature_data['reason']}\\nDate: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\\n--- END SIGNATURE ---"
-                doc.add_paragraph(signature_text)
-                doc.save(filename)
+                write_protection_metadata(paths.signature, signature_data)
                 
                 return f"Digital signature added to {filename} by {signer_name}"
         
@@ -479,32 +554,34 @@ async def manage_protection(
             if protection_type == "password":
                 # Password unprotection using msoffcrypto
                 try:
-                    import msoffcrypto
-                    
-                    # Create backup
-                    backup_filename = filename + ".backup"
-                    shutil.copy2(filename, backup_filename)
-                    
+                    backed_up = False
                     try:
                         with open(filename, "rb") as f:
                             file = msoffcrypto.OfficeFile(f)
-                            file.load_key(password=password)
+                            # Check the password against the encryption header
+                            # before taking a backup or decrypting anything
+                            file.load_key(password=password, verify_password=True)
+                            
+                            # Create backup
+                            _backup_file(filename, paths.backup)
+                            backed_up = True
                             
                             # Decrypt and save
-                            with open(filename + ".temp", "wb") as output:
+                            with open(paths.temp, "wb") as output:
                                 file.decrypt(output)
                         
                         # Replace original with decrypted version
-                        shutil.move(filename + ".temp", filename)
-                        os.remove(backup_filename)
+                        os.replace(paths.temp, filename)
+                        os.unlink(paths.backup)
                         
                         return f"Password protection removed from {filename}"
                     
                     except Exception as e:
                         # Restore backup on failure
-                        shutil.move(backup_filename, filename)
-                        if os.path.exists(filename + ".temp"):
-                            os.remove(filename + ".temp")
+                        if backed_up:
+                            _restore_backup(paths.backup, filename)
+                        if os.path.exists(paths.temp):
+                            os.remove(paths.temp)
                         return f"Failed to remove password protection: {str(e)}. Check password is correct."
                 
                 except ImportError:
@@ -512,18 +589,16 @@ async def manage_protection(
             
             elif protection_type == "restricted":
                 # Remove restricted editing protection
-                protection_file = filename + ".protection"
-                if os.path.exists(protection_file):
-                    os.remove(protection_file)
+                if os.path.exists(paths.protection):
+                    os.remove(paths.protection)
                     return f"Restricted editing protection removed from {filename}"
                 else:
                     return f"No restricted editing protection found on {filename}"
             
             elif protection_type == "signature":
                 # Remove digital signature
-                signature_file = filename + ".signature"
-                if os.path.exists(signature_file):
-                    os.remove(signature_file)
+                if os.path.exists(paths.signature):
+                    os.remove(paths.signature)
                     return f"Digital signature removed from {filename}"
                 else:
                     return f"No digital signature found on {filename}"
@@ -531,20 +606,17 @@ async def manage_protection(
         elif action == "verify":
             if protection_type == "signature":
                 # Verify digital signature
-                signature_file = filename + ".signature"
-                if not os.path.exists(signature_file):
+                if not os.path.exists(paths.signature):
                     return f"No digital signature found on {filename}"
                 
                 try:
-                    with open(signature_file, 'r') as f:
-                        signature_data = json.load(f)
+                    signature_data = load_protection_metadata(paths.signature)
                     
                     # Verify content hash
-                    doc = Document(filename)
-                    current_content = "\\n".join([p.text for p in doc.paragraphs])
-                    current_hash = hashlib.sha256(current_content.encode()).hexdigest()
+                    algorithm = signature_data.get("algo", LEGACY_CONTENT_HASH_ALGORITHM)
+                    current_hash = hash_file_content(filename, algorithm)
                     
-                    if current_hash == signature_data.get("content_hash"):
+                    if hashes_match(signature_data.get("content_hash"), current_hash):
                         return f"Digital signature verified. Document has not been modified since signing by {signature_data.get('signer_name', 'Unknown')}"
                     else:
                         return f"Digital signature verification FAILED. Document has been modified since signing."
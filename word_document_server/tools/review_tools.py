@@ -4,16 +4,68 @@ Review tools for Word Document Server - Tier 1 Feature.
 These tools handle collaboration features including comments, track changes,
 and review management for academic research workflows.
 """
+import asyncio
+import io
 import os
-from typing import List, Optional, Dict, Any
+import re
+import uuid
+import weakref
+import zipfile
+from typing import List, Optional, Dict, Any, Tuple
 from docx import Document
+from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 from docx.shared import RGBColor
-from xml.etree import ElementTree as ET
 
-from word_document_server.utils.file_utils import check_file_writeable, ensure_docx_extension
+from word_document_server.utils.document_utils import W_T, XML_SPACE, load_cached_document
+from word_document_server.utils.file_utils import check_file_writeable
 from word_document_server.utils.session_utils import resolve_document_path
 
+# Matches [COMMENT-12345678 by Author: comment text] or [RESOLVED-12345678 by Author: comment text]
+_COMMENT_RE = re.compile(r'\[(COMMENT|RESOLVED)-([a-f0-9]{8}) by ([^:]+): ([^\]]+)\]')
+
+# Clark names used when walking revision markup
+_W_AUTHOR = qn('w:author')
+_W_BODY = qn('w:body')
+_W_DATE = qn('w:date')
+_W_DEL = qn('w:del')
+_W_DELTEXT = qn('w:delText')
+_W_ID = qn('w:id')
+_W_INS = qn('w:ins')
+
+# Comment id prefix of a marker; looser than _COMMENT_RE so that resolve/delete
+# still find markers whose author or text the full pattern would reject
+_MARKER_ID_RE = re.compile(r'\[(?:COMMENT|RESOLVED)-([a-f0-9]{8})')
+
+# Per-document comment indexes, keyed by the document's root element so an
+# index is dropped together with its document
+_COMMENT_INDEX: "weakref.WeakKeyDictionary[Any, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def _fast_save(doc, filename: str) -> None:
+    """Save a document whose changes are confined to its main document part.
+    
+    python-docx's save re-serialises every part in the package. Here only the
+    main part is serialised; every other member is copied from the file on
+    disk. The package is built in memory and then written over the existing
+    file, as doc.save would, so its mode, ownership and hard links are kept.
+    """
+    main_part = doc.part.partname.lstrip('/')
+    with zipfile.ZipFile(filename) as zf:
+        entries = [(info, zf.read(info)) for info in zf.infolist()]
+    if not any(info.filename == main_part for info, _ in entries):
+        doc.save(filename)
+        return
+    
+    document_xml = doc.part.blob
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for info, data in entries:
+            zf.writestr(info, document_xml if info.filename == main_part else data)
+    with open(filename, 'wb') as f:
+        f.write(buffer.getbuffer())
+
+
 class WordDocumentError(Exception):
     """Base exception for Word document operations."""
     pass
@@ -34,6 +86,184 @@ class InvalidPathError(WordDocumentError):
     """Raised when an invalid file path is provided."""
     pass
 
+# Parameters each comment action requires; checked before any file access
+_COMMENT_ACTION_REQS = {
+    "list": (),
+    "add": ("paragraph_index", "comment_text"),
+    "resolve": ("comment_id",),
+    "delete": ("comment_id",),
+}
+
+
+def _validate_comment_op(
+    action: str,
+    paragraph_index: Optional[int],
+    comment_text: Optional[str],
+    comment_id: Optional[str]
+) -> Optional[str]:
+    """Return an error message if the comment operation is malformed, else None."""
+    required = _COMMENT_ACTION_REQS.get(action)
+    if required is None:
+        return f"Invalid action: {action}. Must be one of: {', '.join(_COMMENT_ACTION_REQS)}"
+    
+    params = {"paragraph_index": paragraph_index, "comment_text": comment_text, "comment_id": comment_id}
+    for name in required:
+        if params[name] is None or params[name] == "":
+            return f"Parameter '{name}' is required for action '{action}'"
+    
+    return None
+
+
+def _replace_marker_text(paragraph, text: str, old: str, new: str) -> None:
+    """Replace a comment marker in a paragraph, editing a single w:t when possible.
+    
+    Rewriting ``paragraph.text`` rebuilds every run and drops their formatting, so
+    that is only used when the marker has been split across runs.
+    """
+    for t in paragraph._p.iter(W_T):
+        if t.text and old in t.text:
+            t.text = t.text.replace(old, new)
+            if t.text != t.text.strip():
+                t.set(XML_SPACE, 'preserve')
+            return
+    paragraph.text = text.replace(old, new)
+
+
+def _comment_index(doc) -> Dict[str, Any]:
+    """Map comment id -> paragraph for an open document, built on first use.
+    
+    The index lives as long as the document does and is kept current by the
+    add and delete handlers, so repeated operations on one document (as in
+    manage_comments_batch) avoid rescanning every paragraph.
+    """
+    index = _COMMENT_INDEX.get(doc.element)
+    if index is None:
+        index = {}
+        for paragraph in doc.paragraphs:
+            text = paragraph.text
+            if "[COMMENT-" not in text and "[RESOLVED-" not in text:
+                continue
+            for match in _MARKER_ID_RE.finditer(text):
+                index.setdefault(match.group(1), paragraph)
+        _COMMENT_INDEX[doc.element] = index
+    return index
+
+
+def _find_comment(doc, comment_id: str):
+    """Return (paragraph, paragraph text) for the paragraph holding the comment, or (None, None)."""
+    paragraph = _comment_index(doc).get(comment_id)
+    if paragraph is None:
+        return None, None
+    return paragraph, paragraph.text
+
+
+# Comment action handlers. Each takes the open document plus the operation's
+# parameters and returns (status message, whether the document was modified);
+# none of them saves.
+
+def _cmt_add(doc, paragraph_index, comment_text, author, comment_id) -> Tuple[str, bool]:
+    # Add new comment to specified paragraph
+    paragraphs = doc.paragraphs
+    if paragraph_index >= len(paragraphs):
+        return f"Paragraph index {paragraph_index} is out of range (document has {len(paragraphs)} paragraphs)", False
+    
+    paragraph = paragraphs[paragraph_index]
+    author_name = author or "User"
+    
+    # Add comment as a text annotation (simplified implementation)
+    comment_uuid = str(uuid.uuid4())[:8]
+    comment_marker = f" [COMMENT-{comment_uuid} by {author_name}: {comment_text}]"
+    
+    # Append the marker as its own run so existing runs keep their formatting
+    paragraph.add_run(comment_marker)
+    _comment_index(doc)[comment_uuid] = paragraph
+    
+    return f"Successfully added comment {comment_uuid} to paragraph {paragraph_index}", True
+
+
+def _cmt_resolve(doc, paragraph_index, comment_text, author, comment_id) -> Tuple[str, bool]:
+    paragraph, text = _find_comment(doc, comment_id)
+    if paragraph is None:
+        return f"Comment {comment_id} not found in document", False
+    
+    # Mark as resolved; an already resolved comment is left as is
+    comment_marker = f"[COMMENT-{comment_id}"
+    pending = comment_marker in text
+    if pending:
+        _replace_marker_text(paragraph, text, comment_marker, f"[RESOLVED-{comment_id}")
+    return f"Successfully resolved comment {comment_id}", pending
+
+
+def _cmt_delete(doc, paragraph_index, comment_text, author, comment_id) -> Tuple[str, bool]:
+    paragraph, text = _find_comment(doc, comment_id)
+    if paragraph is None:
+        return f"Comment {comment_id} not found in document", False
+    
+    # Remove comment completely
+    for start_marker in (f"[COMMENT-{comment_id}", f"[RESOLVED-{comment_id}"):
+        start_pos = text.find(start_marker)
+        if start_pos != -1:
+            end_pos = text.find("]", start_pos)
+            if end_pos != -1:
+                _replace_marker_text(paragraph, text, text[start_pos:end_pos+1], "")
+                _comment_index(doc).pop(comment_id, None)
+                return f"Successfully deleted comment {comment_id}", True
+    
+    return f"Comment {comment_id} not found in document", False
+
+
+def _cmt_list(doc, paragraph_index, comment_text, author, comment_id) -> Tuple[str, bool]:
+    # Search for text-based comment markers, formatting each one as it is found
+    parts = []
+    
+    # Search through all paragraphs for comment markers
+    for para_idx, paragraph in enumerate(doc.paragraphs):
+        text = paragraph.text
+        
+        # Most paragraphs carry no marker; a substring test is far cheaper than the regex
+        if "[COMMENT-" not in text and "[RESOLVED-" not in text:
+            continue
+        
+        # Find all comment markers in this paragraph
+        for status, found_id, author_name, comment_content in _COMMENT_RE.findall(text):
+            status_indicator = " (RESOLVED)" if status == "RESOLVED" else ""
+            parts.append(
+                f"Comment {len(parts) + 1} (ID: {found_id}){status_indicator}:\n"
+                f"  Author: {author_name}\n"
+                f"  Paragraph: {para_idx}\n"
+                f"  Text: {comment_content}\n\n"
+            )
+    
+    if not parts:
+        return "No comments found in the document.", False
+    
+    return f"Found {len(parts)} comments:\n\n" + "".join(parts), False
+
+
+_COMMENT_ACTIONS = {
+    "list": _cmt_list,
+    "add": _cmt_add,
+    "resolve": _cmt_resolve,
+    "delete": _cmt_delete,
+}
+
+
+def _apply_comment_op(
+    doc,
+    action: str,
+    paragraph_index: Optional[int] = None,
+    comment_text: Optional[str] = None,
+    author: Optional[str] = None,
+    comment_id: Optional[str] = None
+) -> Tuple[str, bool]:
+    """Apply one validated comment operation to an open document without saving it.
+    
+    Returns:
+        Tuple of (status message, whether the document was modified)
+    """
+    return _COMMENT_ACTIONS[action](doc, paragraph_index, comment_text, author, comment_id)
+
+
 def manage_comments(
     document_id: str = None,
     filename: str = None,
@@ -64,29 +294,16 @@ def manage_comments(
     Returns:
         Formatted string with comment information or operation status
     """
-    from word_document_server.utils.session_utils import resolve_document_path
+    # Reject malformed requests before resolving or touching the file
+    error = _validate_comment_op(action, paragraph_index, comment_text, comment_id)
+    if error:
+        return error
     
     # Resolve document path from document_id or filename
     filename, error_msg = resolve_document_path(document_id, filename)
     if error_msg:
         return error_msg
     
-    # Validate action parameter
-    valid_actions = ["list", "add", "resolve", "delete"]
-    if action not in valid_actions:
-        return f"Invalid action: {action}. Must be one of: {', '.join(valid_actions)}"
-    
-    # Validate required parameters for each action
-    if action == "add":
-        if paragraph_index is None:
-            return "Parameter 'paragraph_index' is required for action 'add'"
-        if not comment_text:
-            return "Parameter 'comment_text' is required for action 'add'"
-    
-    if action in ["resolve", "delete"]:
-        if not comment_id:
-            return f"Parameter 'comment_id' is required for action '{action}'"
-    
     if not os.path.exists(filename):
         return f"Document {filename} does not exist"
     
@@ -97,101 +314,82 @@ def manage_comments(
         if not is_writeable:
             return f"Cannot modify document: {error_message}"
     
+    try:
+        # Listing only reads, so it can share a cached parse of the file
+        doc = load_cached_document(filename) if action == "list" else Document(filename)
+        message, dirty = _apply_comment_op(
+            doc, action, paragraph_index, comment_text, author, comment_id
+        )
+        if dirty:
+            _fast_save(doc, filename)
+        return message
+    
+    except Exception as e:
+        return f"Failed to manage comments: {str(e)}"
+
+
+def manage_comments_batch(
+    document_id: str = None,
+    filename: str = None,
+    actions: List[Dict[str, Any]] = None
+) -> str:
+    """Apply several comment operations to a document with a single load and save.
+    
+    Each entry in ``actions`` is a dict with the same keys accepted by
+    manage_comments ("action", "paragraph_index", "comment_text", "author",
+    "comment_id"). Operations run in order against the same in-memory document,
+    which is written back once at the end if any of them changed it.
+    
+    Args:
+        document_id: Session document ID (preferred)
+        filename: Path to the Word document (legacy, for backward compatibility)
+        actions: List of comment operations to apply
+    
+    Returns:
+        One status line per operation
+    """
+    if not actions:
+        return "Parameter 'actions' must contain at least one comment operation"
+    
+    # Validate every operation before touching the file
+    for i, op in enumerate(actions, 1):
+        if not isinstance(op, dict):
+            return f"Operation {i}: expected an object, got {type(op).__name__}"
+        error = _validate_comment_op(
+            op.get("action", "list"), op.get("paragraph_index"),
+            op.get("comment_text"), op.get("comment_id")
+        )
+        if error:
+            return f"Operation {i}: {error}"
+    
+    # Resolve document path from document_id or filename
+    filename, error_msg = resolve_document_path(document_id, filename)
+    if error_msg:
+        return error_msg
+    
+    if not os.path.exists(filename):
+        return f"Document {filename} does not exist"
+    
+    if any(op.get("action", "list") != "list" for op in actions):
+        is_writeable, error_message = check_file_writeable(filename)
+        if not is_writeable:
+            return f"Cannot modify document: {error_message}"
+    
     try:
         doc = Document(filename)
+        results = []
+        changed = False
+        for i, op in enumerate(actions, 1):
+            message, dirty = _apply_comment_op(
+                doc, op.get("action", "list"), op.get("paragraph_index"),
+                op.get("comment_text"), op.get("author"), op.get("comment_id")
+            )
+            changed = changed or dirty
+            results.append(f"{i}. {message}")
         
-        # Handle comment management actions
-        if action == "add":
-            # Add new comment to specified paragraph
-            if paragraph_index >= len(doc.paragraphs):
-                return f"Paragraph index {paragraph_index} is out of range (document has {len(doc.paragraphs)} paragraphs)"
-            
-            paragraph = doc.paragraphs[paragraph_index]
-            author_name = author or "User"
-            
-            # Add comment as a text annotation (simplified implementation)
-            import uuid
-            comment_uuid = str(uuid.uuid4())[:8]
-            comment_marker = f" [COMMENT-{comment_uuid} by {author_name}: {comment_text}]"
-            
-            # Add the comment text to the end of the paragraph
-            if paragraph.text:
-                paragraph.text += comment_marker
-            else:
-                paragraph.text = comment_marker
-            
-            doc.save(filename)
-            return f"Successfully added comment {comment_uuid} to paragraph {paragraph_index}"
-        
-        elif action in ["resolve", "delete"]:
-            # Search through document for comment markers
-            comment_found = False
-            
-            for para_idx, paragraph in enumerate(doc.paragraphs):
-                if f"[COMMENT-{comment_id}" in paragraph.text or f"[RESOLVED-{comment_id}" in paragraph.text:
-                    comment_found = True
-                    
-                    if action == "resolve":
-                        # Mark as resolved
-                        paragraph.text = paragraph.text.replace(f"[COMMENT-{comment_id}", f"[RESOLVED-{comment_id}")
-                        doc.save(filename)
-                        return f"Successfully resolved comment {comment_id}"
-                    
-                    elif action == "delete":
-                        # Remove comment completely
-                        start_markers = [f"[COMMENT-{comment_id}", f"[RESOLVED-{comment_id}"]
-                        for start_marker in start_markers:
-                            if start_marker in paragraph.text:
-                                start_pos = paragraph.text.find(start_marker)
-                                if start_pos != -1:
-                                    end_pos = paragraph.text.find("]", start_pos)
-                                    if end_pos != -1:
-                                        comment_part = paragraph.text[start_pos:end_pos+1]
-                                        paragraph.text = paragraph.text.replace(comment_part, "")
-                                        doc.save(filename)
-                                        return f"Successfully deleted comment {comment_id}"
-                    break
-            
-            if not comment_found:
-                return f"Comment {comment_id} not found in document"
-        
-        # Handle list action - search for text-based comment markers
-        elif action == "list":
-            comments_info = []
-            
-            # Search through all paragraphs for comment markers
-            for para_idx, paragraph in enumerate(doc.paragraphs):
-                text = paragraph.text
-                
-                # Find all comment markers in this paragraph
-                import re
-                # Pattern matches: [COMMENT-12345678 by Author: comment text] or [RESOLVED-12345678 by Author: comment text]
-                pattern = r'\[(COMMENT|RESOLVED)-([a-f0-9]{8}) by ([^:]+): ([^\]]+)\]'
-                matches = re.findall(pattern, text)
-                
-                for match in matches:
-                    status, comment_id, author_name, comment_content = match
-                    comments_info.append({
-                        'id': comment_id,
-                        'author': author_name,
-                        'status': status.lower(),  # 'comment' or 'resolved'
-                        'text': comment_content,
-                        'paragraph_index': para_idx
-                    })
-            
-            if not comments_info:
-                return "No comments found in the document."
-            
-            # Format output
-            result = f"Found {len(comments_info)} comments:\n\n"
-            for i, comment in enumerate(comments_info, 1):
-                status_indicator = " (RESOLVED)" if comment['status'] == 'resolved' else ""
-                result += f"Comment {i} (ID: {comment['id']}){status_indicator}:\n"
-                result += f"  Author: {comment['author']}\n"
-                result += f"  Paragraph: {comment['paragraph_index']}\n"
-                result += f"  Text: {comment['text']}\n\n"
-            
-            return result
+        if changed:
+            _fast_save(doc, filename)
+        return "\n".join(results)
     
     except Exception as e:
         return f"Failed to manage comments: {str(e)}"
@@ -214,33 +412,24 @@ def extract_track_changes(document_id: str = None, filename: str = None) -> str:
     if error_msg:
         return error_msg
     
-    filename = ensure_docx_extension(filename)
-    
     if not os.path.exists(filename):
         return f"Document {filename} does not exist"
     
     try:
-        doc = Document(filename)
+        doc = load_cached_document(filename)
         changes_info = []
         
-        # Access the document's XML to extract revision information
-        document_xml = doc.element.xml
-        root = ET.fromstring(document_xml)
-        
-        # Extract track changes with namespace handling
-        ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+        # Query the already-parsed lxml tree rather than re-serialising it
+        root = doc.element
         
         # Find insertions
-        for ins in root.findall('.//w:ins', ns):
-            author = ins.get(qn('w:author'), 'Unknown')
-            date = ins.get(qn('w:date'), 'Unknown')
-            change_id = ins.get(qn('w:id'), 'Unknown')
+        for ins in root.iter(_W_INS):
+            author = ins.get(_W_AUTHOR, 'Unknown')
+            date = ins.get(_W_DATE, 'Unknown')
+            change_id = ins.get(_W_ID, 'Unknown')
             
             # Extract inserted text
-            inserted_text = ""
-            for text_elem in ins.findall('.//w:t', ns):
-                if text_elem.text:
-                    inserted_text += text_elem.text
+            inserted_text = "".join(t.text for t in ins.iter(W_T) if t.text)
             
             changes_info.append({
                 'type': 'insertion',
@@ -251,16 +440,13 @@ def extract_track_changes(document_id: str = None, filename: str = None) -> str:
             })
         
         # Find deletions
-        for del_elem in root.findall('.//w:del', ns):
-            author = del_elem.get(qn('w:author'), 'Unknown')
-            date = del_elem.get(qn('w:date'), 'Unknown')
-            change_id = del_elem.get(qn('w:id'), 'Unknown')
+        for del_elem in root.iter(_W_DEL):
+            author = del_elem.get(_W_AUTHOR, 'Unknown')
+            date = del_elem.get(_W_DATE, 'Unknown')
+            change_id = del_elem.get(_W_ID, 'Unknown')
             
             # Extract deleted text
-            deleted_text = ""
-            for text_elem in del_elem.findall('.//w:delText', ns):
-                if text_elem.text:
-                    deleted_text += text_elem.text
+            deleted_text = "".join(t.text for t in del_elem.iter(_W_DELTEXT) if t.text)
             
             changes_info.append({
                 'type': 'deletion',
@@ -274,20 +460,27 @@ def extract_track_changes(document_id: str = None, filename: str = None) -> str:
             return "No track changes found in the document."
         
         # Format output
-        result = f"Found {len(changes_info)} track changes:\n\n"
+        parts = [f"Found {len(changes_info)} track changes:\n\n"]
         for i, change in enumerate(changes_info, 1):
-            result += f"Change {i} (ID: {change['id']}):\n"
-            result += f"  Type: {change['type'].title()}\n"
-            result += f"  Author: {change['author']}\n"
-            result += f"  Date: {change['date']}\n"
-            result += f"  Text: '{change['text']}'\n\n"
+            parts.append(
+                f"Change {i} (ID: {change['id']}):\n"
+                f"  Type: {change['type'].title()}\n"
+                f"  Author: {change['author']}\n"
+                f"  Date: {change['date']}\n"
+                f"  Text: '{change['text']}'\n\n"
+            )
         
-        return result
+        return "".join(parts)
     
     except Exception as e:
         return f"Failed to extract track changes: {str(e)}"
 
 
+def _collect_review_results(filename: str) -> Tuple[str, str]:
+    """Run the comment and track change scans for a review summary, in turn."""
+    return manage_comments(filename=filename, action="list"), extract_track_changes(filename=filename)
+
+
 async def generate_review_summary(document_id: str = None, filename: str = None) -> str:
     """Generate a comprehensive review summary including comments and track changes.
     
@@ -303,17 +496,13 @@ async def generate_review_summary(document_id: str = None, filename: str = None)
     if error_msg:
         return error_msg
     
-    filename = ensure_docx_extension(filename)
-    
     if not os.path.exists(filename):
         return f"Document {filename} does not exist"
     
     try:
-        # Get comments
-        comments_result = manage_comments(filename, action="list")
-        
-        # Get track changes
-        changes_result = extract_track_changes(filename)
+        # Get comments and track changes off the event loop, one after the
+        # other, so the two scans never walk the shared cached document at once
+        comments_result, changes_result = await asyncio.to_thread(_collect_review_results, filename)
         
         # Generate summary
         summary = f"=== REVIEW SUMMARY FOR {os.path.basename(filename)} ===\n\n"
@@ -359,8 +548,8 @@ async def manage_track_changes(
         change_ids (List[str], optional): Specific change identifiers for selective operations
             - Used with action="accept_selective" or "reject_selective"
             - Each ID corresponds to a specific tracked change
-            - Can be obtained from document analysis tools
-            - Example: ["change_1", "change_5", "change_12"]
+            - Matches the revision's w:id, as reported by extract_track_changes
+            - Example: ["1", "5", "12"]
         
         author_filter (str, optional): Process changes only from specific author
             - Case-sensitive author name matching
@@ -403,7 +592,7 @@ async def manage_track_changes(
         
         # Accept specific changes by ID (advanced usage)
         result = await manage_track_changes(document_id="document", action="accept_selective",
-                                           change_ids=["change_5", "change_18", "change_23"])
+                                           change_ids=["5", "18", "23"])
         # Returns: "Successfully accepted 3 specific changes"
         
         # Process all changes from multiple authors
@@ -476,76 +665,57 @@ async def manage_track_changes(
     try:
         doc = Document(filename)
         document_xml = doc.element
-        ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
         
         changes_processed = 0
         
-        if action in ["accept_all", "accept_selective"]:
-            # Accept changes logic - preserve the original XML manipulation
-            
-            # Process deletion markup (remove but preserve context)
-            del_elements = document_xml.findall('.//w:del', ns)
-            for del_elem in del_elements:
-                # Check author filter if specified
-                if author_filter and del_elem.get(qn('w:author')) != author_filter:
-                    continue
-                    
-                del_elem.getparent().remove(del_elem)
-                changes_processed += 1
-            
-            # Process insertion markup (keep inserted text, remove markup)
-            ins_elements = document_xml.findall('.//w:ins', ns)
-            for ins_elem in ins_elements:
-                # Check author filter if specified
-                if author_filter and ins_elem.get(qn('w:author')) != author_filter:
-                    continue
-                    
-                # Move children out of ins element
-                parent = ins_elem.getparent()
-                for child in ins_elem:
-                    parent.insert(list(parent).index(ins_elem), child)
-                parent.remove(ins_elem)
-                changes_processed += 1
+        accept = action in ["accept_all", "accept_selective"]
+        # One walk collects both kinds of revision markup in document order; the
+        # list is materialised first because the loop below re-parents elements
+        change_elems = list(document_xml.iter(_W_INS, _W_DEL))
+        if not change_elems:
+            # Nothing to accept or reject, so leave the file untouched
+            return "No tracked changes found in document"
         
-        elif action in ["reject_all", "reject_selective"]:
-            # Reject changes logic - preserve the original XML manipulation
+        # w:id values are strings in the XML; accept ints from callers too
+        id_set = frozenset(str(change_id) for change_id in change_ids) if change_ids else None
+        
+        for change_elem in change_elems:
+            # Check change id and author filters if specified
+            if id_set is not None and change_elem.get(_W_ID) not in id_set:
+                continue
+            if author_filter and change_elem.get(_W_AUTHOR) != author_filter:
+                continue
             
-            # Process insertion markup (remove inserted text)
-            ins_elements = document_xml.findall('.//w:ins', ns)
-            for ins_elem in ins_elements:
-                # Check author filter if specified
-                if author_filter and ins_elem.get(qn('w:author')) != author_filter:
-                    continue
-                    
-                ins_elem.getparent().remove(ins_elem)
-                changes_processed += 1
+            # Skip markup nested inside a change that has already been removed
+            if next(change_elem.iterancestors(_W_BODY), None) is None:
+                continue
             
-            # Process deletion markup (restore deleted text)
-            del_elements = document_xml.findall('.//w:del', ns)
-            for del_elem in del_elements:
-                # Check author filter if specified
-                if author_filter and del_elem.get(qn('w:author')) != author_filter:
-                    continue
-                    
-                # Convert delText back to regular text
-                for del_text in del_elem.findall('.//w:delText', ns):
-                    # Create new text element
-                    text_elem = ET.Element(qn('w:t'))
-                    text_elem.text = del_text.text
-                    
-                    # Create new run
-                    run_elem = ET.Element(qn('w:r'))
-                    run_elem.append(text_elem)
-                    
-                    # Insert before deletion
-                    parent = del_elem.getparent()
-                    parent.insert(list(parent).index(del_elem), run_elem)
-                
-                # Remove the deletion element
-                del_elem.getparent().remove(del_elem)
-                changes_processed += 1
+            parent = change_elem.getparent()
+            if change_elem.tag == _W_INS:
+                if accept:
+                    # Keep inserted text, remove markup
+                    for child in list(change_elem):
+                        change_elem.addprevious(child)
+                # Rejecting an insertion drops the inserted text with it
+                parent.remove(change_elem)
+            else:
+                if not accept:
+                    # Convert delText back to regular text
+                    for del_text in change_elem.iter(_W_DELTEXT):
+                        # Create new run with python-docx's lxml element factory;
+                        # stdlib ElementTree nodes cannot be inserted into this tree
+                        run_elem = OxmlElement('w:r')
+                        text_elem = OxmlElement('w:t', {XML_SPACE: 'preserve'})
+                        text_elem.text = del_text.text
+                        run_elem.append(text_elem)
+                        
+                        # Insert before deletion
+                        change_elem.addprevious(run_elem)
+                # Accepting a deletion just drops the deleted content
+                parent.remove(change_elem)
+            changes_processed += 1
         
-        doc.save(filename)
+        _fast_save(doc, filename)
         
         # Build response message
         action_past_tense = {
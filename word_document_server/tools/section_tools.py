@@ -4,15 +4,146 @@ Section management tools for Word Document Server - Tier 1 Feature.
 These tools handle section organization via heading styles, perfect for
 academic research document management and thesis synthesis.
 """
+import copy
 import os
 import json
-from typing import List, Optional, Dict, Any
+import time
+import weakref
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Iterator, NamedTuple, Tuple
 from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
 from docx.shared import Inches, Pt
 
+try:
+    import orjson
+except ImportError:  # Optional faster JSON encoder; the stdlib json module is used otherwise
+    orjson = None
+
+from word_document_server.utils.document_utils import W_P, load_cached_document
 from word_document_server.utils.file_utils import check_file_writeable, ensure_docx_extension
 from word_document_server.utils.session_utils import resolve_document_path
 
+# Built-in heading style names and their outline levels
+_HEADING_LEVELS = {f"Heading {i}": i for i in range(1, 10)}
+
+
+class _Heading(NamedTuple):
+    index: int
+    level: int
+    text: str
+
+
+# Heading tables for open documents, keyed by the document's root element so a
+# table is dropped together with its document
+_HEADING_INDEX: "weakref.WeakKeyDictionary[Any, Tuple[_Heading, ...]]" = weakref.WeakKeyDictionary()
+
+
+# Resolved paths of documents known to exist, keyed by filename and kept in
+# least recently used order. Entries expire quickly so files moved or deleted
+# outside the server are noticed. Session ids are not cached: an id can be
+# reopened on another file at any time, and looking it up is cheap anyway.
+_PATH_CACHE: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_PATH_CACHE_TTL = 5.0
+_PATH_CACHE_SIZE = 256
+
+
+def _resolve_existing_document(document_id: Optional[str], filename: Optional[str]) -> Tuple[str, str]:
+    """Resolve a document to an existing .docx path, as (path, error_message).
+    
+    Successful filename lookups are cached for a few seconds so repeated tool
+    calls on the same file skip the existence check.
+    """
+    key = None if document_id else filename
+    now = time.monotonic()
+    if key is not None:
+        cached = _PATH_CACHE.get(key)
+        if cached is not None and cached[0] > now:
+            _PATH_CACHE.move_to_end(key)
+            return cached[1], ""
+    
+    path, error_msg = resolve_document_path(document_id, filename)
+    if error_msg:
+        return "", error_msg
+    
+    path = ensure_docx_extension(path)
+    if not os.path.exists(path):
+        return "", f"Document {path} does not exist"
+    
+    if key is not None:
+        _PATH_CACHE[key] = (now + _PATH_CACHE_TTL, path)
+        _PATH_CACHE.move_to_end(key)
+        if len(_PATH_CACHE) > _PATH_CACHE_SIZE:
+            _PATH_CACHE.popitem(last=False)
+    return path, ""
+
+
+def _dumps(obj, indent: Optional[int] = None) -> str:
+    """Serialize a tool result as JSON, compact unless an indent is requested."""
+    if orjson is not None and indent in (None, 2):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    if indent is None:
+        return json.dumps(obj, separators=(",", ":"))
+    return json.dumps(obj, indent=indent)
+
+
+def _iter_headings(doc, max_level: int = 9) -> Iterator[_Heading]:
+    """Yield the heading paragraphs up to max_level, in document order.
+    
+    Works on the body's w:p elements directly rather than through Paragraph
+    wrappers. Style IDs are resolved to names once, since IDs such as
+    "Heading1" (or localized ones) differ from the "Heading 1" style name.
+    Indices match doc.paragraphs.
+    """
+    levels = {
+        style.style_id: _HEADING_LEVELS.get(style.name)
+        for style in doc.styles
+        if style.type == WD_STYLE_TYPE.PARAGRAPH
+    }
+    # Paragraphs without a (known) style use the default paragraph style
+    default_style = doc.styles.default(WD_STYLE_TYPE.PARAGRAPH)
+    default_level = _HEADING_LEVELS.get(default_style.name) if default_style else None
+    body = doc.element.body
+    
+    if not default_level:
+        # Usual case: only explicitly styled paragraphs can be headings, so let
+        # one XPath pass find the pStyle elements and keep the Python loop over
+        # all paragraphs down to a dict lookup
+        heading_ps = {}
+        for p_style in body.xpath('./w:p/w:pPr/w:pStyle'):
+            level = levels.get(p_style.val)
+            if level and level <= max_level:
+                heading_ps[p_style.getparent().getparent()] = level
+        if not heading_ps:
+            return
+        for i, p in enumerate(body.iterchildren(W_P)):
+            level = heading_ps.get(p)
+            if level:
+                yield _Heading(i, level, p.text)
+        return
+    
+    for i, p in enumerate(body.iterchildren(W_P)):
+        style_id = p.style
+        level = levels.get(style_id, default_level) if style_id else default_level
+        if level and level <= max_level:
+            yield _Heading(i, level, p.text)
+
+
+def _heading_index(doc) -> Tuple[_Heading, ...]:
+    """Return every Heading 1-9 paragraph of a document, built once per document.
+    
+    get_sections loads documents through the shared read-only cache, so the
+    table is reused for as long as the file is unchanged; queries only need to
+    read the paragraphs of the sections they return.
+    """
+    headings = _HEADING_INDEX.get(doc.element)
+    if headings is None:
+        headings = tuple(_iter_headings(doc))
+        _HEADING_INDEX[doc.element] = headings
+    return headings
+
 
 async def get_sections(
     document_id: str = None,
@@ -25,7 +156,8 @@ async def get_sections(
     case_sensitive: bool = False,
     output_format: str = "text",
     include_formatting: bool = False,
-    formatting_detail: str = "basic"
+    formatting_detail: str = "basic",
+    json_indent: Optional[int] = None
 ) -> str:
     """Unified section extraction function for comprehensive document structure analysis.
     
@@ -85,6 +217,10 @@ async def get_sections(
             - "basic": Font name, size, bold/italic status
             - "detailed": Basic + color, alignment, spacing
             - "comprehensive": Detailed + advanced formatting properties
+        
+        json_indent (int, optional): Indentation for output_format="json" (default: None)
+            - None: Compact JSON, smallest and fastest to produce
+            - 2: Pretty-printed JSON for human reading
     
     Returns:
         str: Document structure or content in requested format:
@@ -192,12 +328,10 @@ async def get_sections(
         - Text output better for human review and analysis
     """
     # Resolve document path from session or filename
-    filename, error_msg = resolve_document_path(document_id, filename)
+    filename, error_msg = _resolve_existing_document(document_id, filename)
     if error_msg:
         return error_msg
     
-    filename = ensure_docx_extension(filename)
-    
     # Validate mode parameter
     valid_modes = ["overview", "content"]
     if mode not in valid_modes:
@@ -221,51 +355,47 @@ async def get_sections(
     except (ValueError, TypeError):
         return "Invalid parameter: max_level must be an integer between 1 and 9"
     
-    if not os.path.exists(filename):
-        return f"Document {filename} does not exist"
-    
     def extract_run_formatting(run, detail_level="basic"):
         """Extract formatting information from a run."""
-        formatting = {
-            "text": run.text,
-        }
-        
-        if detail_level in ["basic", "detailed", "comprehensive"]:
-            # Basic formatting
-            formatting.update({
-                "bold": run.bold,
-                "italic": run.italic,
-                "underline": run.underline,
-            })
-        
-        if detail_level in ["detailed", "comprehensive"]:
-            # Detailed formatting
-            formatting.update({
-                "font_name": run.font.name,
-                "font_size": str(run.font.size) if run.font.size else None,
-                "font_color": str(run.font.color.rgb) if run.font.color.rgb else None,
-                "highlight_color": str(run.font.highlight_color) if run.font.highlight_color else None,
-                "strike": run.font.strike,
-                "double_strike": run.font.double_strike,
-                "superscript": run.font.superscript,
-                "subscript": run.font.subscript,
-                "small_caps": run.font.small_caps,
-                "all_caps": run.font.all_caps,
-            })
-        
-        if detail_level == "comprehensive":
-            # Comprehensive formatting
-            formatting.update({
-                "font_color_theme": str(run.font.color.theme_color) if run.font.color.theme_color else None,
-                "emboss": run.font.emboss,
-                "imprint": run.font.imprint,
-                "outline": run.font.outline,
-                "shadow": run.font.shadow,
-                "snap_to_grid": run.font.snap_to_grid,
-            })
-        
-        # Clean up None values for cleaner output
-        return {k: v for k, v in formatting.items() if v is not None}
+        # Keys are only added for properties that are set, so no None-filter
+        # pass is needed at the end
+        formatting = {"text": run.text}
+        
+        # Basic formatting
+        for key, value in (("bold", run.bold), ("italic", run.italic), ("underline", run.underline)):
+            if value is not None:
+                formatting[key] = value
+        
+        if detail_level != "basic":
+            # Detailed formatting; run.font and font.color build new proxies on
+            # every access, so each is fetched once
+            font = run.font
+            color = font.color
+            font_name = font.name
+            if font_name is not None:
+                formatting["font_name"] = font_name
+            for key, value in (("font_size", font.size), ("font_color", color.rgb),
+                               ("highlight_color", font.highlight_color)):
+                if value:
+                    formatting[key] = str(value)
+            for key, value in (("strike", font.strike), ("double_strike", font.double_strike),
+                               ("superscript", font.superscript), ("subscript", font.subscript),
+                               ("small_caps", font.small_caps), ("all_caps", font.all_caps)):
+                if value is not None:
+                    formatting[key] = value
+            
+            if detail_level == "comprehensive":
+                # Comprehensive formatting
+                theme_color = color.theme_color
+                if theme_color:
+                    formatting["font_color_theme"] = str(theme_color)
+                for key, value in (("emboss", font.emboss), ("imprint", font.imprint),
+                                   ("outline", font.outline), ("shadow", font.shadow),
+                                   ("snap_to_grid", font.snap_to_grid)):
+                    if value is not None:
+                        formatting[key] = value
+        
+        return formatting
     
     def extract_paragraph_formatting(paragraph, detail_level="basic"):
         """Extract formatting information from a paragraph."""
@@ -294,80 +424,96 @@ async def get_sections(
         return {k: v for k, v in formatting.items() if v is not None}
     
     try:
-        doc = Document(filename)
+        # Read-only, so repeated queries on an unchanged file share one parse
+        doc = load_cached_document(filename)
         paragraphs = doc.paragraphs
         
         if not paragraphs:
             return "Document contains no paragraphs"
         
+        # Headings up to max_level delimit sections; deeper headings are content
+        outline = [h for h in _heading_index(doc) if h.level <= max_level]
+        
         # Extract section information
         sections = []
-        current_section = None
-        
-        for i, paragraph in enumerate(paragraphs):
-            # Check if paragraph is a heading
-            heading_level = None
-            if paragraph.style and paragraph.style.name.startswith('Heading'):
-                try:
-                    heading_level = int(paragraph.style.name.replace('Heading ', ''))
-                except ValueError:
-                    continue
+        
+        # With a section_title filter only matching top-level sections (and what
+        # nests under them) are built; other sections are skipped without
+        # reading their content or formatting
+        capturing = not section_title
+        if section_title and not case_sensitive:
+            needle = section_title.lower()
+        else:
+            needle = section_title
+        
+        # The text overview only shows the first content paragraph of each
+        # section (plus a count), so the rest are counted but not collected
+        need_all_content = (mode == "content" or full_content or include_formatting
+                            or output_format == "json")
+        
+        # Open sections from the outermost down, so each heading's parent is the
+        # innermost open section with a lower level
+        level_stack = []
+        
+        for k, (i, heading_level, text) in enumerate(outline):
+            # Level-1 headings (and the first heading) start top-level sections;
+            # without subsections every heading is top-level
+            top_level = heading_level == 1 or k == 0 or not include_subsections
+            title = text.strip()
+            
+            # Check if this matches target section (if specified)
+            if section_title and top_level:
+                capturing = needle in (title if case_sensitive else title.lower())
             
-            if heading_level and heading_level <= max_level:
-                # This is a heading - start new section or subsection
-                section_info = {
-                    "title": paragraph.text.strip(),
-                    "level": heading_level,
-                    "paragraph_index": i,
-                    "content": [],
-                    "subsections": []
+            if not capturing:
+                continue
+            
+            # This is a heading - start new section or subsection
+            section_info = {
+                "title": title,
+                "level": heading_level,
+                "paragraph_index": i,
+                "content": [],
+                "subsections": []
+            }
+            
+            # Add formatting information if requested
+            if include_formatting:
+                paragraph = paragraphs[i]
+                section_info["heading_formatting"] = {
+                    "paragraph_formatting": extract_paragraph_formatting(paragraph, formatting_detail),
+                    "runs": []
                 }
                 
-                # Add formatting information if requested
-                if include_formatting:
-                    section_info["heading_formatting"] = {
-                        "paragraph_formatting": extract_paragraph_formatting(paragraph, formatting_detail),
-                        "runs": []
-                    }
-                    
-                    for run in paragraph.runs:
-                        if run.text.strip():
-                            section_info["heading_formatting"]["runs"].append(
-                                extract_run_formatting(run, formatting_detail)
-                            )
-                
-                # Check if this matches target section (if specified)
-                title_match = False
-                if section_title:
-                    if case_sensitive:
-                        title_match = section_title in paragraph.text
-                    else:
-                        title_match = section_title.lower() in paragraph.text.lower()
-                
-                # Add to appropriate location
-                if heading_level == 1 or not sections:
-                    sections.append(section_info)
-                    current_section = section_info
-                else:
-                    # Find appropriate parent section
-                    parent_section = sections[-1]
-                    for j in range(len(sections) - 1, -1, -1):
-                        if sections[j]["level"] < heading_level:
-                            parent_section = sections[j]
-                            break
-                    
-                    if include_subsections:
-                        parent_section["subsections"].append(section_info)
-                    else:
-                        sections.append(section_info)
-                    current_section = section_info
+                for run in paragraph.runs:
+                    if run.text.strip():
+                        section_info["heading_formatting"]["runs"].append(
+                            extract_run_formatting(run, formatting_detail)
+                        )
+            
+            # Add to appropriate location
+            if top_level:
+                sections.append(section_info)
+                level_stack = [section_info]
+            else:
+                while level_stack and level_stack[-1]["level"] >= heading_level:
+                    level_stack.pop()
+                parent_section = level_stack[-1] if level_stack else sections[-1]
+                parent_section["subsections"].append(section_info)
+                level_stack.append(section_info)
             
-            elif current_section:
-                # This is content - add to current section
+            # Content runs up to the next heading in the outline
+            end = outline[k + 1].index if k + 1 < len(outline) else len(paragraphs)
+            content_count = 0
+            for j in range(i + 1, end):
+                paragraph = paragraphs[j]
                 content_text = paragraph.text.strip()
                 if content_text:
+                    content_count += 1
+                    if not need_all_content and section_info["content"]:
+                        continue
                     content_item = {
-                        "paragraph_index": i,
+                        "paragraph_index": j,
                         "text": content_text
                     }
                     
@@ -384,28 +530,17 @@ async def get_sections(
                                     extract_run_formatting(run, formatting_detail)
                                 )
                     
-                    current_section["content"].append(content_item)
+                    section_info["content"].append(content_item)
+            
+            if not need_all_content:
+                section_info["content_count"] = content_count
         
-        if not sections:
+        if not outline:
             return "No heading sections found in document. Document may not use heading styles."
         
-        # Filter by section_title if specified
-        if section_title:
-            filtered_sections = []
-            for section in sections:
-                title_match = False
-                if case_sensitive:
-                    title_match = section_title in section["title"]
-                else:
-                    title_match = section_title.lower() in section["title"].lower()
-                
-                if title_match:
-                    filtered_sections.append(section)
-            
-            if not filtered_sections:
-                return f"Section '{section_title}' not found in document"
-            
-            sections = filtered_sections
+        # The section_title filter was applied while scanning
+        if section_title and not sections:
+            return f"Section '{section_title}' not found in document"
         
         # Format output based on mode and output_format
         if output_format == "json":
@@ -415,105 +550,126 @@ async def get_sections(
                 "formatting_detail": formatting_detail if include_formatting else None,
                 "sections": sections
             }
-            return json.dumps(result, indent=2)
-        
-        # Text output formatting
-        result_lines = []
+            return _dumps(result, json_indent)
         
-        if mode == "overview":
+        # Text output formatting; each renderer yields its lines in order
+        def overview_lines():
             # Structure overview (replaces extract_sections_by_heading)
-            result_lines.append("=== DOCUMENT STRUCTURE ===\\n")
+            yield "=== DOCUMENT STRUCTURE ===\n"
             
-            def format_section(section, indent_level=0):
+            # Walk the section tree depth-first with an explicit stack; children are
+            # pushed in reverse so they come off in document order
+            stack = [(section, 0) for section in reversed(sections)]
+            while stack:
+                section, indent_level = stack.pop()
                 indent = "  " * indent_level
                 level_marker = "#" * section["level"]
                 
-                content_count = len(section["content"])
+                content_count = section.get("content_count", len(section["content"]))
                 content_preview = ""
                 
                 if section["content"]:
                     if full_content:
-                        content_preview = "\\n".join([c["text"] for c in section["content"]])
+                        content_preview = "\n".join(c["text"] for c in section["content"])
                     else:
                         first_content = section["content"][0]["text"]
                         content_preview = first_content[:100] + "..." if len(first_content) > 100 else first_content
                 
-                result_lines.append(f"{indent}{level_marker} {section['title']} [Para {section['paragraph_index']}]")
+                yield f"{indent}{level_marker} {section['title']} [Para {section['paragraph_index']}]"
                 
                 # Add formatting information if requested
                 if include_formatting and "heading_formatting" in section:
                     heading_fmt = section["heading_formatting"]
                     if heading_fmt["paragraph_formatting"]:
-                        fmt_info = ", ".join([f"{k}: {v}" for k, v in heading_fmt["paragraph_formatting"].items()])
-                        result_lines.append(f"{indent}   Heading Format: {fmt_info}")
+                        fmt_info = ", ".join(f"{k}: {v}" for k, v in heading_fmt["paragraph_formatting"].items())
+                        yield f"{indent}   Heading Format: {fmt_info}"
                     
                     if heading_fmt["runs"]:
                         for run in heading_fmt["runs"]:
-                            run_info = ", ".join([f"{k}: {v}" for k, v in run.items() if k != "text"])
+                            run_info = ", ".join(f"{k}: {v}" for k, v in run.items() if k != "text")
                             if run_info:
-                                result_lines.append(f"{indent}   Run Format: {run_info}")
+                                yield f"{indent}   Run Format: {run_info}"
                 
                 if content_preview:
-                    result_lines.append(f"{indent}   Content ({content_count} paragraphs): {content_preview}")
+                    yield f"{indent}   Content ({content_count} paragraphs): {content_preview}"
                 
                 # Process subsections
-                for subsection in section["subsections"]:
-                    format_section(subsection, indent_level + 1)
-            
-            for section in sections:
-                format_section(section)
-        
-        else:  # mode == "content"
-            # Content extraction (replaces extract_section_content)
-            for section in sections:
-                def extract_section_content(section):
-                    result_lines.append(f"=== {section['title']} ===\\n")
+                stack.extend((subsection, indent_level + 1) for subsection in reversed(section["subsections"]))
+        
+        def content_lines():
+            # Content extraction (replaces extract_section_content), depth-first
+            # with an explicit stack like the overview above
+            stack = list(reversed(sections))
+            while stack:
+                section = stack.pop()
+                yield f"=== {section['title']} ===\n"
+                
+                # Add heading formatting if requested
+                if include_formatting and "heading_formatting" in section:
+                    heading_fmt = section["heading_formatting"]
+                    yield "HEADING FORMATTING:"
+                    if heading_fmt["paragraph_formatting"]:
+                        for k, v in heading_fmt["paragraph_formatting"].items():
+                            yield f"  {k}: {v}"
                     
-                    # Add heading formatting if requested
-                    if include_formatting and "heading_formatting" in section:
-                        heading_fmt = section["heading_formatting"]
-                        result_lines.append("HEADING FORMATTING:")
-                        if heading_fmt["paragraph_formatting"]:
-                            for k, v in heading_fmt["paragraph_formatting"].items():
-                                result_lines.append(f"  {k}: {v}")
-                        
-                        for i, run in enumerate(heading_fmt["runs"]):
-                            result_lines.append(f"  Run {i+1}:")
-                            for k, v in run.items():
-                                result_lines.append(f"    {k}: {v}")
-                        result_lines.append("")
+                    for i, run in enumerate(heading_fmt["runs"]):
+                        yield f"  Run {i+1}:"
+                        for k, v in run.items():
+                            yield f"    {k}: {v}"
+                    yield ""
+                
+                # Add content
+                for content_item in section["content"]:
+                    yield content_item["text"]
                     
-                    # Add content
-                    for content_item in section["content"]:
-                        result_lines.append(content_item["text"])
+                    # Add content formatting if requested
+                    if include_formatting and "formatting" in content_item:
+                        content_fmt = content_item["formatting"]
+                        yield "  FORMATTING:"
+                        if content_fmt["paragraph_formatting"]:
+                            for k, v in content_fmt["paragraph_formatting"].items():
+                                yield f"    {k}: {v}"
                         
-                        # Add content formatting if requested
-                        if include_formatting and "formatting" in content_item:
-                            content_fmt = content_item["formatting"]
-                            result_lines.append("  FORMATTING:")
-                            if content_fmt["paragraph_formatting"]:
-                                for k, v in content_fmt["paragraph_formatting"].items():
-                                    result_lines.append(f"    {k}: {v}")
-                            
-                            for i, run in enumerate(content_fmt["runs"]):
-                                result_lines.append(f"    Run {i+1}:")
-                                for k, v in run.items():
-                                    result_lines.append(f"      {k}: {v}")
-                            result_lines.append("")
-                    
-                    # Add subsections if enabled
-                    if include_subsections:
-                        for subsection in section["subsections"]:
-                            extract_section_content(subsection)
+                        for i, run in enumerate(content_fmt["runs"]):
+                            yield f"    Run {i+1}:"
+                            for k, v in run.items():
+                                yield f"      {k}: {v}"
+                        yield ""
                 
-                extract_section_content(section)
+                # Add subsections if enabled
+                if include_subsections:
+                    stack.extend(reversed(section["subsections"]))
         
-        return "\\n".join(result_lines)
+        return "\n".join(overview_lines() if mode == "overview" else content_lines())
     
     except Exception as e:
         return f"Failed to extract sections: {str(e)}"
 
 
+def _insert_toc_entries(anchor, headings: List[Dict[str, Any]]) -> None:
+    """Insert one plain paragraph per heading directly after anchor, in document order.
+    
+    Entries are copied from a single w:p/w:r/w:t template while detached, then
+    spliced into the body in one slice assignment.
+    """
+    text_elem = OxmlElement('w:t', {qn('xml:space'): 'preserve'})
+    run_elem = OxmlElement('w:r')
+    run_elem.append(text_elem)
+    template = OxmlElement('w:p')
+    template.append(run_elem)
+    
+    entries = []
+    for heading in headings:
+        indent = "    " * (heading['level'] - 1)
+        entry = copy.deepcopy(template)
+        entry[0][0].text = f"{indent}{heading['text']}"
+        entries.append(entry)
+    
+    parent = anchor.getparent()
+    position = parent.index(anchor) + 1
+    parent[position:position] = entries
+
+
 async def generate_table_of_contents(document_id: str = None, filename: str = None, max_level: int = 3, update_existing: bool = True) -> str:
     """Generate a table of contents based on document headings.
     
@@ -527,15 +683,10 @@ async def generate_table_of_contents(document_id: str = None, filename: str = No
         Success message with ToC information
     """
     # Resolve document path from session or filename
-    filename, error_msg = resolve_document_path(document_id, filename)
+    filename, error_msg = _resolve_existing_document(document_id, filename)
     if error_msg:
         return error_msg
     
-    filename = ensure_docx_extension(filename)
-    
-    if not os.path.exists(filename):
-        return f"Document {filename} does not exist"
-    
     # Check if file is writeable
     is_writeable, error_message = check_file_writeable(filename)
     if not is_writeable:
@@ -543,21 +694,13 @@ async def generate_table_of_contents(document_id: str = None, filename: str = No
     
     try:
         doc = Document(filename)
+        all_paras = list(doc.paragraphs)
         
         # Collect all headings
-        headings = []
-        for i, paragraph in enumerate(doc.paragraphs):
-            if paragraph.style and paragraph.style.name.startswith('Heading '):
-                try:
-                    level = int(paragraph.style.name.split(' ')[1])
-                    if level <= max_level:
-                        headings.append({
-                            'level': level,
-                            'text': paragraph.text.strip(),
-                            'index': i
-                        })
-                except (ValueError, IndexError):
-                    pass
+        headings = [
+            {'level': level, 'text': text.strip(), 'index': i}
+            for i, level, text in _iter_headings(doc, max_level)
+        ]
         
         if not headings:
             return f"No headings found in {filename}. Cannot generate table of contents."
@@ -566,21 +709,24 @@ async def generate_table_of_contents(document_id: str = None, filename: str = No
         toc_inserted = False
         
         # Look for existing "Table of Contents" or "Contents" heading
-        for i, paragraph in enumerate(doc.paragraphs):
+        for i, paragraph in enumerate(all_paras):
             if (paragraph.text.lower().strip() in ['table of contents', 'contents', 'toc'] or
                 'table of contents' in paragraph.text.lower()):
                 
                 if update_existing:
                     # Remove existing ToC content (next few paragraphs that aren't headings)
+                    heading_texts = {h['text'] for h in headings}
+                    heading_indices = {h['index'] for h in headings}
                     j = i + 1
                     to_remove = []
-                    while j < len(doc.paragraphs):
-                        next_para = doc.paragraphs[j]
+                    while j < len(all_paras):
+                        next_para = all_paras[j]
                         if (next_para.style and 
                             (next_para.style.name.startswith('Heading ') or
                              next_para.style.name == 'Normal')):
-                            # Check if it looks like ToC content
-                            if any(h['text'] in next_para.text for h in headings):
+                            # Check if it looks like ToC content: an entry is an indented
+                            # copy of a heading's text, but not one of the headings itself
+                            if j not in heading_indices and next_para.text.strip() in heading_texts:
                                 to_remove.append(j)
                                 j += 1
                             else:
@@ -590,24 +736,11 @@ async def generate_table_of_contents(document_id: str = None, filename: str = No
                     
                     # Remove old ToC entries
                     for idx in reversed(to_remove):
-                        p = doc.paragraphs[idx]._p
+                        p = all_paras[idx]._p
                         p.getparent().remove(p)
                 
                 # Insert new ToC after the ToC heading
-                toc_para = doc.paragraphs[i]
-                for heading in headings:
-                    # Create ToC entry
-                    indent = "    " * (heading['level'] - 1)
-                    toc_text = f"{indent}{heading['text']}"
-                    
-                    # Insert paragraph after ToC heading
-                    new_para = doc.add_paragraph(toc_text)
-                    # Move the paragraph to correct position
-                    new_para._p.getparent().remove(new_para._p)
-                    toc_para._p.getparent().insert(
-                        list(toc_para._p.getparent()).index(toc_para._p) + 1,
-                        new_para._p
-                    )
+                _insert_toc_entries(paragraph._p, headings)
                 
                 toc_inserted = True
                 break
@@ -615,22 +748,12 @@ async def generate_table_of_contents(document_id: str = None, filename: str = No
         # If no existing ToC found, create one at the beginning
         if not toc_inserted:
             # Insert ToC at the beginning (after any title)
-            toc_heading = doc.paragraphs[0] if doc.paragraphs else doc.add_paragraph()
+            toc_heading = all_paras[0] if all_paras else doc.add_paragraph()
             toc_heading.text = "Table of Contents"
             toc_heading.style = doc.styles['Heading 1']
             
             # Add ToC entries
-            for heading in headings:
-                indent = "    " * (heading['level'] - 1)
-                toc_text = f"{indent}{heading['text']}"
-                toc_para = doc.add_paragraph(toc_text)
-                
-                # Move to correct position (after ToC heading)
-                toc_para._p.getparent().remove(toc_para._p)
-                toc_heading._p.getparent().insert(
-                    list(toc_heading._p.getparent()).index(toc_heading._p) + 1,
-                    toc_para._p
-                )
+            _insert_toc_entries(toc_heading._p, headings)
             
             # Add page break after ToC
             doc.add_page_break()
@@ -4,8 +4,13 @@ Session management tools for Word Document Server.
 Provides MCP tools for managing document sessions with simple IDs,
 eliminating the need to pass full file paths for every operation.
 """
+from typing import Dict, Optional
+
 from word_document_server.session_manager import get_session_manager
 
+# The process-wide manager instance; it is created once at import and never replaced
+_SESSION_MANAGER = get_session_manager()
+
 
 def open_document(document_id: str, file_path: str) -> str:
     """
@@ -51,8 +56,36 @@ def open_document(document_id: str, file_path: str) -> str:
         - Invalid document format: Returns error with details
         - Empty parameters: Returns parameter validation error
     """
-    session_manager = get_session_manager()
-    return session_manager.open_document(document_id, file_path)
+    return _SESSION_MANAGER.open_document(document_id, file_path)
+
+
+def open_documents_batch(documents: Dict[str, str]) -> str:
+    """
+    Open several Word documents in one call, each with its own simple ID.
+    
+    Equivalent to calling open_document for every entry, but all IDs and paths
+    are validated up front and the files are parsed in parallel. The batch is
+    all-or-nothing: if any document cannot be opened, none are.
+    
+    Args:
+        documents (dict): Mapping of document ID to file path
+            - Example: {"intro": "./ch1.docx", "methods": "./ch2.docx"}
+            - IDs must not already be open
+            - .docx extension will be added automatically if missing
+    
+    Returns:
+        str: Success message listing the opened documents, or error message
+    
+    Examples:
+        # Open all thesis chapters at once
+        open_documents_batch({"intro": "ch1.docx", "methods": "ch2.docx", "results": "ch3.docx"})
+    
+    Error Handling:
+        - Empty mapping or empty ID/path: Returns parameter validation error
+        - Document ID already in use: Returns error, nothing is opened
+        - File not found or unreadable: Returns error, nothing is opened
+    """
+    return _SESSION_MANAGER.open_documents(documents)
 
 
 def close_document(document_id: str) -> str:
@@ -95,8 +128,7 @@ def close_document(document_id: str) -> str:
         - Document ID not found: Returns error with available IDs
         - No documents open: Returns appropriate error message
     """
-    session_manager = get_session_manager()
-    return session_manager.close_document(document_id)
+    return _SESSION_MANAGER.close_document(document_id)
 
 
 def list_open_documents() -> str:
@@ -151,10 +183,9 @@ def list_open_documents() -> str:
     Special Cases:
         - No open documents: Returns "No documents currently open"
         - Active document marked with "(ACTIVE)" indicator
-        - Metadata calculated when document was opened
+        - Paragraph and section counts are calculated on first listing
     """
-    session_manager = get_session_manager()
-    return session_manager.list_open_documents()
+    return _SESSION_MANAGER.list_open_documents()
 
 
 def set_active_document(document_id: str) -> str:
@@ -201,8 +232,7 @@ def set_active_document(document_id: str) -> str:
         Currently this is primarily for organizational purposes.
         Future versions may allow tools to operate on active document by default.
     """
-    session_manager = get_session_manager()
-    return session_manager.set_active_document(document_id)
+    return _SESSION_MANAGER.set_active_document(document_id)
 
 
 def close_all_documents() -> str:
@@ -240,14 +270,58 @@ def close_all_documents() -> str:
         - No open documents: Returns "Closed 0 documents"
         - Cannot be undone: Must reopen documents individually
     """
-    session_manager = get_session_manager()
-    return session_manager.close_all_documents()
+    return _SESSION_MANAGER.close_all_documents()
+
+
+def _session_open(document_id: str, file_path: str, documents: Optional[Dict[str, str]]) -> str:
+    if not document_id or not file_path:
+        return "Error: Both 'document_id' and 'file_path' are required for action 'open'"
+    return open_document(document_id, file_path)
+
+
+def _session_open_batch(document_id: str, file_path: str, documents: Optional[Dict[str, str]]) -> str:
+    if not documents:
+        return "Error: 'documents' is required for action 'open_batch'"
+    return open_documents_batch(documents)
+
+
+def _session_close(document_id: str, file_path: str, documents: Optional[Dict[str, str]]) -> str:
+    if not document_id:
+        return "Error: 'document_id' is required for action 'close'"
+    return close_document(document_id)
+
+
+def _session_list(document_id: str, file_path: str, documents: Optional[Dict[str, str]]) -> str:
+    return list_open_documents()
+
+
+def _session_set_active(document_id: str, file_path: str, documents: Optional[Dict[str, str]]) -> str:
+    if not document_id:
+        return "Error: 'document_id' is required for action 'set_active'"
+    return set_active_document(document_id)
+
+
+def _session_close_all(document_id: str, file_path: str, documents: Optional[Dict[str, str]]) -> str:
+    return close_all_documents()
+
+
+# session_manager actions and their handlers, each called as
+# (document_id, file_path, documents)
+_SESSION_ACTIONS = {
+    "open": _session_open,
+    "open_batch": _session_open_batch,
+    "close": _session_close,
+    "list": _session_list,
+    "set_active": _session_set_active,
+    "close_all": _session_close_all,
+}
 
 
 def session_manager(
     action: str,
     document_id: str = None,
-    file_path: str = None
+    file_path: str = None,
+    documents: Optional[Dict[str, str]] = None
 ) -> str:
     """Unified session management function for all document session operations.
     
@@ -257,12 +331,14 @@ def session_manager(
     Args:
         action (str): Session operation to perform:
             - "open": Open document with session ID (requires document_id and file_path)
+            - "open_batch": Open several documents at once (requires documents)
             - "close": Close document session (requires document_id)  
             - "list": List all open document sessions
             - "set_active": Set active document (requires document_id)
             - "close_all": Close all document sessions
         document_id (str, optional): Session document identifier for targeted operations
         file_path (str, optional): File path for opening documents
+        documents (dict, optional): Mapping of document_id to file path for "open_batch"
         
     Returns:
         str: Operation result message or session information
@@ -271,6 +347,9 @@ def session_manager(
         # Open document with session ID
         session_manager("open", document_id="main", file_path="report.docx")
         
+        # Open several documents in one call
+        session_manager("open_batch", documents={"intro": "ch1.docx", "methods": "ch2.docx"})
+        
         # List all open documents
         session_manager("list")
         
@@ -283,38 +362,16 @@ def session_manager(
         # Close all documents
         session_manager("close_all")
     """
-    # Validate action parameter
-    valid_actions = ["open", "close", "list", "set_active", "close_all"]
-    if action not in valid_actions:
-        return f"Invalid action: {action}. Must be one of: {', '.join(valid_actions)}"
-    
-    # Delegate to appropriate original function based on action
-    if action == "open":
-        if not document_id or not file_path:
-            return "Error: Both 'document_id' and 'file_path' are required for action 'open'"
-        return open_document(document_id, file_path)
-        
-    elif action == "close":
-        if not document_id:
-            return "Error: 'document_id' is required for action 'close'"
-        return close_document(document_id)
-        
-    elif action == "list":
-        return list_open_documents()
-        
-    elif action == "set_active":
-        if not document_id:
-            return "Error: 'document_id' is required for action 'set_active'"
-        return set_active_document(document_id)
-        
-    elif action == "close_all":
-        return close_all_documents()
+    handler = _SESSION_ACTIONS.get(action)
+    if handler is None:
+        return f"Invalid action: {action}. Must be one of: {', '.join(_SESSION_ACTIONS)}"
+    return handler(document_id, file_path, documents)
 
 
 # Export consolidated tool list for reference
 CONSOLIDATED_TOOLS = [
     'session_manager',  # Consolidated (replaces 5 tools)
-    'open_document', 'close_document', 'list_open_documents', 'set_active_document', 'close_all_documents'  # Original tools (for backward compatibility)
+    'open_document', 'open_documents_batch', 'close_document', 'list_open_documents', 'set_active_document', 'close_all_documents'  # Original tools (for backward compatibility)
 ]
 
 __all__ = CONSOLIDATED_TOOLS + ['DocumentSessionManager', 'get_session_manager']
\ No newline at end of file
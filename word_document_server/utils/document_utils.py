@@ -1,9 +1,59 @@
 """
 Document utility functions for Word Document Server.
 """
+import io
 import json
-from typing import Dict, List, Any
+import os
+import zipfile
+from functools import lru_cache
+from typing import Dict, List, Any, Optional
 from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from lxml import etree
+
+
+_PKG_NS = 'http://schemas.microsoft.com/office/2006/xmlPackage'
+_PKG_PACKAGE = f'{{{_PKG_NS}}}package'
+_PKG_PART = f'{{{_PKG_NS}}}part'
+_PKG_NAME = f'{{{_PKG_NS}}}name'
+_PKG_CONTENT_TYPE = f'{{{_PKG_NS}}}contentType'
+_PKG_XML_DATA = f'{{{_PKG_NS}}}xmlData'
+_PKG_BINARY_DATA = f'{{{_PKG_NS}}}binaryData'
+_CT_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+_MAIN_DOCUMENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml'
+
+# Clark names of WordprocessingML elements and attributes, shared by the
+# modules that walk document XML directly
+W_P = qn('w:p')
+W_R = qn('w:r')
+W_RPR = qn('w:rPr')
+W_T = qn('w:t')
+XML_SPACE = qn('xml:space')
+
+
+@lru_cache(maxsize=32)
+def _load_document_cached(path: str, mtime_ns: int, size: int) -> Document:
+    """Parse a document; the stat values only key the cache."""
+    return Document(path)
+
+
+def load_cached_document(doc_path: str) -> Document:
+    """
+    Return a shared, read-only Document for a file.
+    
+    Parsed documents are cached on the file's modification time and size, so
+    saving the file naturally retires the old entry. Callers that modify the
+    document must open their own copy with Document() instead.
+    
+    Args:
+        doc_path: Path to the Word document
+        
+    Returns:
+        The cached Document
+    """
+    st = os.stat(doc_path)
+    return _load_document_cached(os.path.abspath(doc_path), st.st_mtime_ns, st.st_size)
 
 
 def get_document_properties(doc_path: str) -> Dict[str, Any]:
@@ -165,3 +215,121 @@ def find_and_replace_text(doc, old_text, new_text):
                                 count += 1
     
     return count
+
+
+def coalesce_runs(p) -> None:
+    """Merge adjacent text-only runs of a <w:p> element that share run properties.
+    
+    Runs are compared on their serialized <w:rPr>, so only runs with exactly the
+    same direct formatting are merged. Runs holding anything besides a single
+    <w:t> (tabs, breaks, drawings, field characters) are left alone.
+    """
+    prev_t = prev_key = None
+    for child in list(p):
+        if child.tag != W_R:
+            prev_t = None
+            continue
+        key = t = None
+        if len(child) == 1 and child[0].tag == W_T:
+            key, t = b'', child[0]
+        elif len(child) == 2 and child[0].tag == W_RPR and child[1].tag == W_T:
+            key, t = etree.tostring(child[0]), child[1]
+        
+        if t is not None and prev_t is not None and key == prev_key:
+            prev_t.text = (prev_t.text or '') + (t.text or '')
+            prev_t.set(XML_SPACE, 'preserve')
+            p.remove(child)
+        else:
+            prev_t, prev_key = t, key
+
+
+def parse_live_ooxml(content: str):
+    """
+    Parse OOXML text returned by the live Word Add-in.
+    
+    The Add-in sends body.getOoxml(), a Flat OPC (pkg:package) XML string. A bare
+    document.xml is accepted as well. Parsing goes through python-docx's oxml
+    parser, so WordprocessingML elements come back as its element classes
+    (a <w:p> exposes CT_P.text, as it does in a loaded Document).
+    
+    Args:
+        content: OOXML string from the "get_full_content" live command
+        
+    Returns:
+        Root lxml element
+    """
+    try:
+        return parse_xml(content)
+    except ValueError:
+        # lxml refuses str input that carries an encoding declaration
+        return parse_xml(content.encode('utf-8'))
+
+
+def live_document_element(root) -> Optional[Any]:
+    """
+    Find the <w:document> element in parsed live OOXML.
+    
+    Args:
+        root: Element returned by parse_live_ooxml
+        
+    Returns:
+        The <w:document> element, or None if the package has no main document part
+    """
+    if root.tag == qn('w:document'):
+        return root
+    for part in root.iter(_PKG_PART):
+        if part.get(_PKG_CONTENT_TYPE) == _MAIN_DOCUMENT_TYPE:
+            xml_data = part.find(_PKG_XML_DATA)
+            if xml_data is not None and len(xml_data):
+                return xml_data[0]
+    return None
+
+
+def _flat_opc_to_docx(package) -> bytes:
+    """Repackage a Flat OPC <pkg:package> element as .docx (zip) bytes."""
+    import base64
+    
+    content_types = etree.Element(f'{{{_CT_NS}}}Types', nsmap={None: _CT_NS})
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as docx_zip:
+        for part in package.iter(_PKG_PART):
+            name = part.get(_PKG_NAME)
+            xml_data = part.find(_PKG_XML_DATA)
+            if xml_data is not None and len(xml_data):
+                data = etree.tostring(xml_data[0], xml_declaration=True, encoding='UTF-8', standalone=True)
+            else:
+                data = base64.b64decode(part.findtext(_PKG_BINARY_DATA) or '')
+            docx_zip.writestr(name.lstrip('/'), data)
+            etree.SubElement(content_types, f'{{{_CT_NS}}}Override',
+                             PartName=name, ContentType=part.get(_PKG_CONTENT_TYPE))
+        docx_zip.writestr('[Content_Types].xml',
+                          etree.tostring(content_types, xml_declaration=True, encoding='UTF-8', standalone=True))
+    return buffer.getvalue()
+
+
+def load_live_document(content: str) -> Document:
+    """
+    Build a Document from the content returned by the live Word Add-in.
+    
+    Args:
+        content: Flat OPC or document.xml string, or a .docx zip passed through as text
+        
+    Returns:
+        python-docx Document
+    """
+    if not content.lstrip().startswith('<'):
+        # Zip payload passed through as text
+        return Document(io.BytesIO(content.encode('utf-8')))
+    
+    root = parse_live_ooxml(content)
+    if root.tag == _PKG_PACKAGE:
+        return Document(io.BytesIO(_flat_opc_to_docx(root)))
+    
+    # Bare document.xml: graft its body onto the default template
+    document_element = live_document_element(root)
+    if document_element is None:
+        raise ValueError("Live content has no main document part")
+    doc = Document()
+    body = parse_xml(etree.tostring(document_element.find(qn('w:body'))))
+    doc.element.replace(doc.element.body, body)
+    return doc
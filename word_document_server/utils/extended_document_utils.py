@@ -1,8 +1,22 @@
 """
 Extended document utilities for Word Document Server.
 """
+import zipfile
 from typing import Dict, List, Any, Tuple
 from docx import Document
+from docx.oxml.parser import element_class_lookup
+from lxml import etree
+
+from word_document_server.utils.document_utils import W_P
+
+
+_W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_W_BODY = f'{{{_W_NS}}}body'
+_W_TBL = f'{{{_W_NS}}}tbl'
+_W_TR = f'{{{_W_NS}}}tr'
+_W_TC = f'{{{_W_NS}}}tc'
+_W_GRID_SPAN = f'{{{_W_NS}}}gridSpan'
+_W_VAL = f'{{{_W_NS}}}val'
 
 
 def get_paragraph_text(doc_path: str, paragraph_index: int) -> Dict[str, Any]:
@@ -39,6 +53,91 @@ def get_paragraph_text(doc_path: str, paragraph_index: int) -> Dict[str, Any]:
         return {"error": f"Failed to get paragraph text: {str(e)}"}
 
 
+def iter_paragraph_texts(doc_path: str):
+    """
+    Stream paragraph text from a Word document without building the object model.
+    
+    Parses word/document.xml with iterparse and frees each element once it has been
+    read, so memory stays flat on large documents.
+    
+    Args:
+        doc_path: Path to the Word document
+    
+    Yields:
+        (location, text) tuples in document order. location is the body paragraph
+        index (int) for top-level paragraphs, or (table, row, column) for paragraphs
+        in the cells of top-level tables.
+    """
+    para_idx = 0
+    table_idx = -1
+    row_idx = col_idx = cell_col = 0
+    # One entry per open table: True only for tables directly in the body
+    tables = []
+    
+    with zipfile.ZipFile(doc_path) as package:
+        with package.open('word/document.xml') as src:
+            events = etree.iterparse(src, events=('start', 'end'),
+                                     tag=(W_P, _W_TBL, _W_TR, _W_TC))
+            # Parse into python-docx's element classes so <w:p> exposes CT_P.text
+            events.set_element_class_lookup(element_class_lookup)
+            for event, elem in events:
+                tag = elem.tag
+                if event == 'start':
+                    if tag == _W_TBL:
+                        top_level = not tables and elem.getparent().tag == _W_BODY
+                        tables.append(top_level)
+                        if top_level:
+                            table_idx += 1
+                            row_idx = -1
+                    elif tables and tables[-1]:
+                        if tag == _W_TR:
+                            row_idx += 1
+                            col_idx = 0
+                        elif tag == _W_TC:
+                            span = elem.find(f'{{{_W_NS}}}tcPr/{_W_GRID_SPAN}')
+                            cell_col = col_idx
+                            col_idx += int(span.get(_W_VAL, 1)) if span is not None else 1
+                    continue
+                
+                if tag == _W_TBL:
+                    top_level = tables.pop()
+                    if top_level:
+                        elem.clear()
+                        while elem.getprevious() is not None:
+                            del elem.getparent()[0]
+                elif tag == W_P:
+                    parent = elem.getparent()
+                    if parent.tag == _W_BODY:
+                        yield para_idx, elem.text
+                        para_idx += 1
+                        elem.clear()
+                        while elem.getprevious() is not None:
+                            del parent[0]
+                    elif parent.tag == _W_TC and tables and tables[-1]:
+                        yield (table_idx, row_idx, cell_col), elem.text
+                        elem.clear()
+
+
+def _match_positions(para_text: str, text_to_find: str, match_case: bool, whole_word: bool):
+    """Yield find_text positions: word indexes for whole_word, else character offsets."""
+    search_text = text_to_find
+    if not match_case:
+        para_text = para_text.lower()
+        search_text = search_text.lower()
+    
+    if whole_word:
+        # For whole word search, compare against whitespace-separated words
+        for word_idx, word in enumerate(para_text.split()):
+            if word == search_text:
+                yield word_idx
+    else:
+        # For substring search
+        pos = para_text.find(search_text)
+        while pos != -1:
+            yield pos
+            pos = para_text.find(search_text, pos + len(search_text))
+
+
 def find_text(doc_path: str, text_to_find: str, match_case: bool = True, whole_word: bool = False) -> Dict[str, Any]:
     """
     Find all occurrences of specific text in a Word document.
@@ -60,7 +159,6 @@ def find_text(doc_path: str, text_to_find: str, match_case: bool = True, whole_w
         return {"error": "Search text cannot be empty"}
     
     try:
-        doc = Document(doc_path)
         results = {
             "query": text_to_find,
             "match_case": match_case,
@@ -68,98 +166,27 @@ def find_text(doc_path: str, text_to_find: str, match_case: bool = True, whole_w
             "occurrences": [],
             "total_count": 0
         }
+        # Table hits are reported after all body paragraphs
+        table_occurrences = []
         
-        # Search in paragraphs
-        for i, para in enumerate(doc.paragraphs):
-            # Prepare text for comparison
-            para_text = para.text
-            search_text = text_to_find
-            
-            if not match_case:
-                para_text = para_text.lower()
-                search_text = search_text.lower()
-            
-            # Find all occurrences (simple implementation)
-            start_pos = 0
-            while True:
-                if whole_word:
-                    # For whole word search, we need to check word boundaries
-                    words = para_text.split()
-                    found = False
-                    for word_idx, word in enumerate(words):
-                        if (word == search_text or 
-                            (not match_case and word.lower() == search_text.lower())):
-                            results["occurrences"].append({
-                                "paragraph_index": i,
-                                "position": word_idx,
-                                "context": para.text[:100] + ("..." if len(para.text) > 100 else "")
-                            })
-                            results["total_count"] += 1
-                            found = True
-                    
-                    # Break after checking all words
-                    break
-                else:
-                    # For substring search
-                    pos = para_text.find(search_text, start_pos)
-                    if pos == -1:
-                        break
-                    
+        for location, para_text in iter_paragraph_texts(doc_path):
+            context = para_text[:100] + ("..." if len(para_text) > 100 else "")
+            for position in _match_positions(para_text, text_to_find, match_case, whole_word):
+                if isinstance(location, int):
                     results["occurrences"].append({
-                        "paragraph_index": i,
-                        "position": pos,
-                        "context": para.text[:100] + ("..." if len(para.text) > 100 else "")
+                        "paragraph_index": location,
+                        "position": position,
+                        "context": context
+                    })
+                else:
+                    table_occurrences.append({
+                        "location": "Table {}, Row {}, Column {}".format(*location),
+                        "position": position,
+                        "context": context
                     })
-                    results["total_count"] += 1
-                    start_pos = pos + len(search_text)
-        
-        # Search in tables
-        for table_idx, table in enumerate(doc.tables):
-            for row_idx, row in enumerate(table.rows):
-                for col_idx, cell in enumerate(row.cells):
-                    for para_idx, para in enumerate(cell.paragraphs):
-                        # Prepare text for comparison
-                        para_text = para.text
-                        search_text = text_to_find
-                        
-                        if not match_case:
-                            para_text = para_text.lower()
-                            search_text = search_text.lower()
-                        
-                        # Find all occurrences (simple implementation)
-                        start_pos = 0
-                        while True:
-                            if whole_word:
-                                # For whole word search, check word boundaries
-                                words = para_text.split()
-                                found = False
-                                for word_idx, word in enumerate(words):
-                                    if (word == search_text or 
-                                        (not match_case and word.lower() == search_text.lower())):
-                                        results["occurrences"].append({
-                                            "location": f"Table {table_idx}, Row {row_idx}, Column {col_idx}",
-                                            "position": word_idx,
-                                            "context": para.text[:100] + ("..." if len(para.text) > 100 else "")
-                                        })
-                                        results["total_count"] += 1
-                                        found = True
-                                
-                                # Break after checking all words
-                                break
-                            else:
-                                # For substring search
-                                pos = para_text.find(search_text, start_pos)
-                                if pos == -1:
-                                    break
-                                
-                                results["occurrences"].append({
-                                    "location": f"Table {table_idx}, Row {row_idx}, Column {col_idx}",
-                                    "position": pos,
-                                    "context": para.text[:100] + ("..." if len(para.text) > 100 else "")
-                                })
-                                results["total_count"] += 1
-                                start_pos = pos + len(search_text)
         
+        results["occurrences"].extend(table_occurrences)
+        results["total_count"] = len(results["occurrences"])
         return results
     except Exception as e:
         return {"error": f"Failed to search for text: {str(e)}"}
@@ -2,42 +2,101 @@
 File utility functions for Word Document Server.
 """
 import os
-from typing import Tuple, Optional, List
+import platform
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Tuple, Optional, List
 import shutil
 
 
+# Characters that are never valid in a document path
+_DANGEROUS_CHARS_RE = re.compile(r'[<>|*?"]')
+
+# Files open in a document session, mapped to the mtime_ns at which
+# check_file_writeable last verified them (None until the first check)
+_SESSION_WRITEABLE: Dict[str, Optional[int]] = {}
+# Number of session handles open on each of those files
+_SESSION_OPEN_COUNTS: Dict[str, int] = {}
+
+
+# Lock probe for check_file_writeable, chosen once for the platform. Each takes
+# and releases a non-blocking exclusive lock, raising OSError if the file is locked.
+if platform.system() == "Windows":
+    import msvcrt
+    
+    def _probe_lock(f) -> None:
+        # On Windows, try to open with exclusive access
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+    
+    def _probe_lock(f) -> None:
+        # On Unix-like systems, try to get an exclusive lock
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def track_writeable(filepath: str) -> None:
+    """Let check_file_writeable skip repeat probes of a file open in a session."""
+    key = os.path.abspath(filepath)
+    _SESSION_WRITEABLE.setdefault(key, None)
+    _SESSION_OPEN_COUNTS[key] = _SESSION_OPEN_COUNTS.get(key, 0) + 1
+
+
+def untrack_writeable(filepath: str) -> None:
+    """Forget a file's writeability once the last session handle on it is closed."""
+    key = os.path.abspath(filepath)
+    count = _SESSION_OPEN_COUNTS.get(key, 0) - 1
+    if count > 0:
+        _SESSION_OPEN_COUNTS[key] = count
+    else:
+        _SESSION_OPEN_COUNTS.pop(key, None)
+        _SESSION_WRITEABLE.pop(key, None)
+
+
 def check_file_writeable(filepath: str) -> Tuple[bool, str]:
     """
     Check if a file can be written to, with special handling for Word documents.
     
+    For files registered with track_writeable(), a successful check is
+    remembered until the file's modification time changes.
+    
     Args:
         filepath: Path to the file
         
     Returns:
         Tuple of (is_writeable, error_message)
     """
-    import platform
-    import tempfile
+    directory = os.path.dirname(filepath)
     
     # If file doesn't exist, check if directory is writeable
-    if not os.path.exists(filepath):
-        directory = os.path.dirname(filepath)
+    try:
+        st = os.stat(filepath)
+    except OSError:
         # If no directory is specified (empty string), use current directory
         if directory == '':
             directory = '.'
-        if not os.path.exists(directory):
+        try:
+            os.stat(directory)
+        except OSError:
             return False, f"Directory {directory} does not exist"
         if not os.access(directory, os.W_OK):
             return False, f"Directory {directory} is not writeable"
         return True, ""
     
+    # A session file already verified at this mtime needs no new probe
+    session_key = os.path.abspath(filepath) if _SESSION_WRITEABLE else None
+    if session_key is not None and _SESSION_WRITEABLE.get(session_key) == st.st_mtime_ns:
+        return True, ""
+    
     # Check basic file permissions
     if not os.access(filepath, os.W_OK):
         return False, f"File {filepath} is not writeable (permission denied)"
     
     # Check for Word-specific lock files
     if filepath.lower().endswith(('.docx', '.doc')):
-        directory = os.path.dirname(filepath)
         filename = os.path.basename(filepath)
         
         # Check for temporary Word lock files
@@ -47,59 +106,36 @@ def check_file_writeable(filepath: str) -> Tuple[bool, str]:
             f"~WRL{filename[-4:]}.tmp"  # Another Word temp pattern
         ]
         
+        # One directory listing instead of a stat per pattern
+        try:
+            with os.scandir(directory or '.') as entries:
+                present = {entry.name for entry in entries if entry.name in word_lock_patterns}
+        except OSError:
+            present = set()
+        
         for lock_pattern in word_lock_patterns:
-            lock_file = os.path.join(directory, lock_pattern)
-            if os.path.exists(lock_file):
+            if lock_pattern in present:
                 return False, f"Document appears to be open in Word (lock file: {lock_pattern})"
     
-    # Try to open the file for writing with exclusive access
+    # Check read access; the lock probe below opens the file r+b, which
+    # covers reading as well
+    if not os.access(filepath, os.R_OK):
+        return False, f"Cannot read file {filepath} (permission denied)"
+    
+    # Try to open original file for writing (tests write access and locks)
     try:
-        # Create a temporary backup to test exclusive access
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            temp_path = temp_file.name
-        
-        # Try to copy the file to temp location (tests read access)
-        try:
-            import shutil
-            shutil.copy2(filepath, temp_path)
-        except Exception as e:
-            os.unlink(temp_path) if os.path.exists(temp_path) else None
-            return False, f"Cannot read file {filepath}: {str(e)}"
-        
-        # Try to open original file for writing (tests write access and locks)
         try:
-            # Use different approach based on platform
-            if platform.system() == "Windows":
-                # On Windows, try to open with exclusive access
-                import msvcrt
-                try:
-                    with open(filepath, 'r+b') as f:
-                        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
-                        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
-                except (OSError, IOError):
-                    os.unlink(temp_path) if os.path.exists(temp_path) else None
-                    return False, f"File {filepath} is locked (likely open in Word)"
-            else:
-                # On Unix-like systems, try to get an exclusive lock
-                import fcntl
-                try:
-                    with open(filepath, 'r+b') as f:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-                except (OSError, IOError):
-                    os.unlink(temp_path) if os.path.exists(temp_path) else None
-                    return False, f"File {filepath} is locked (likely open in Word)"
-        
-        except Exception as e:
-            os.unlink(temp_path) if os.path.exists(temp_path) else None
-            return False, f"File {filepath} is not writeable: {str(e)}"
-        
-        # Clean up temp file
-        os.unlink(temp_path) if os.path.exists(temp_path) else None
-        return True, ""
-        
+            with open(filepath, 'r+b') as f:
+                _probe_lock(f)
+        except (OSError, IOError):
+            return False, f"File {filepath} is locked (likely open in Word)"
+    
     except Exception as e:
-        return False, f"Error checking file permissions: {str(e)}"
+        return False, f"File {filepath} is not writeable: {str(e)}"
+    
+    if session_key in _SESSION_WRITEABLE:
+        _SESSION_WRITEABLE[session_key] = st.st_mtime_ns
+    return True, ""
 
 
 
@@ -123,13 +159,19 @@ def create_document_copy(source_path: str, dest_path: Optional[str] = None) -> T
         dest_path = f"{base}_copy{ext}"
     
     try:
-        # Simple file copy
-        shutil.copy2(source_path, dest_path)
+        # copyfile uses the kernel copy fast paths (sendfile/copy_file_range,
+        # fcopyfile on macOS); the permission bits and timestamps are then
+        # carried over as copy2 would, without its extended attribute copying
+        st = os.stat(source_path)
+        shutil.copyfile(source_path, dest_path)
+        shutil.copymode(source_path, dest_path)
+        os.utime(dest_path, ns=(st.st_atime_ns, st.st_mtime_ns))
         return True, f"Document copied to {dest_path}", dest_path
     except Exception as e:
         return False, f"Failed to copy document: {str(e)}", None
 
 
+@lru_cache(maxsize=512)
 def ensure_docx_extension(filename: str) -> str:
     """
     Ensure filename has .docx extension.
@@ -155,41 +197,54 @@ def sanitize_file_path(filepath: str, allowed_extensions: List[str] = None) -> T
     Returns:
         Tuple of (is_valid, sanitized_path, error_message)
     """
-    import os.path
-    from pathlib import Path
-    
+    return _sanitize_with_suffix(filepath, allowed_extensions)[:3]
+
+
+def _sanitize_with_suffix(filepath: str, allowed_extensions: Optional[List[str]]) -> Tuple[bool, str, str, str]:
+    """Memoized sanitize_file_path, also returning the path's suffix as written."""
     if not filepath or not isinstance(filepath, str):
-        return False, "", "Invalid file path provided"
+        return False, "", "Invalid file path provided", ""
     
+    return _sanitize_file_path(filepath, tuple(allowed_extensions or ()))
+
+
+# Results depend only on the path string and the allowed extensions, so
+# entries never go stale
+@lru_cache(maxsize=256)
+def _sanitize_file_path(filepath: str, allowed_extensions: Tuple[str, ...]) -> Tuple[bool, str, str, str]:
+    """Cached body of _sanitize_with_suffix; allowed_extensions is a tuple so it can key the cache."""
     try:
         # Convert to Path object for better handling
         path = Path(filepath)
         
-        # Check for path traversal attempts
-        if '..' in str(path) or str(path).startswith('/') or ':' in str(path):
-            # Allow absolute paths but check for traversal
-            resolved_path = path.resolve()
-            if '..' in str(resolved_path):
-                return False, "", "Path traversal detected in file path"
+        # Check for path traversal attempts; resolving stats every ancestor
+        # directory, so only do it when the path has a '..' component
+        if '..' in path.parts:
+            resolved_path = path.resolve(strict=False)
+            if '..' in resolved_path.parts:
+                return False, "", "Path traversal detected in file path", ""
+        
+        path_str = str(path)
         
         # Check for dangerous characters
-        dangerous_chars = ['<', '>', '|', '*', '?', '"']
-        if any(char in str(path) for char in dangerous_chars):
-            return False, "", "Invalid characters in file path"
+        if _DANGEROUS_CHARS_RE.search(path_str):
+            return False, "", "Invalid characters in file path", ""
         
         # Validate extension if specified
+        suffix = path.suffix
         if allowed_extensions:
-            file_ext = path.suffix.lower()
+            file_ext = suffix.lower()
             if file_ext not in [ext.lower() for ext in allowed_extensions]:
-                return False, "", f"Invalid file extension. Allowed: {', '.join(allowed_extensions)}"
+                return False, "", f"Invalid file extension. Allowed: {', '.join(allowed_extensions)}", ""
         
-        # Convert back to string and normalize
-        sanitized_path = str(path).replace('\\', '/')
+        # Normalize separators; Path.as_posix() would leave backslashes alone
+        # on POSIX, where they are ordinary filename characters
+        sanitized_path = path_str.replace('\\', '/')
         
-        return True, sanitized_path, ""
+        return True, sanitized_path, "", suffix
         
     except Exception as e:
-        return False, "", f"Error sanitizing path: {str(e)}"
+        return False, "", f"Error sanitizing path: {str(e)}", ""
 
 
 def validate_docx_path(filepath: str) -> Tuple[bool, str, str]:
@@ -203,12 +258,13 @@ def validate_docx_path(filepath: str) -> Tuple[bool, str, str]:
         Tuple of (is_valid, sanitized_path, error_message)
     """
     # First sanitize the general path
-    is_valid, sanitized_path, error = sanitize_file_path(filepath, ['.docx', '.doc'])
+    is_valid, sanitized_path, error, suffix = _sanitize_with_suffix(filepath, ['.docx', '.doc'])
     
     if not is_valid:
         return False, "", error
     
-    # Ensure .docx extension
-    sanitized_path = ensure_docx_extension(sanitized_path)
+    # Ensure .docx extension; the suffix is already known from sanitizing
+    if suffix != '.docx':
+        sanitized_path = ensure_docx_extension(sanitized_path)
     
     return True, sanitized_path, ""
\ No newline at end of file
@@ -99,6 +99,11 @@ def update_session_document(document_id: str, updated_document) -> bool:
     
     if handle:
         handle.document = updated_document
+        # Counts are recomputed from the new document when next listed
+        handle.metadata.pop("paragraph_count", None)
+        handle.metadata.pop("section_count", None)
+        # The cached parse no longer matches what the session holds
+        session_manager.invalidate_cached_document(handle.file_path)
         return True
     
     return False
\ No newline at end of file